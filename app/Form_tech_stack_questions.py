@@ -1,43 +1,21 @@
 import streamlit as st
-from langchain.text_splitter import CharacterTextSplitter
-from langchain.embeddings import HuggingFaceInstructEmbeddings
-from langchain.vectorstores import FAISS
-from langchain.memory import ConversationBufferMemory
-from langchain.chains import ConversationalRetrievalChain, LLMChain
-from langchain.llms import HuggingFaceHub
-from langchain.prompts import PromptTemplate
-import json
 import os
-from datetime import datetime
 from dotenv import load_dotenv
 from htmlTemplates import css, bot_template, user_template
+from config import LLM_BACKEND
+from resources import get_chain
+from retrieval_context import make_interview_context
+from metrics import span, start_exporter
+from tech_catalog import split_tech_stack
 
 load_dotenv()
 
 hf_token = os.getenv("HUGGINGFACEHUB_API_TOKEN")
 
-if not hf_token:
+if LLM_BACKEND == "hub" and not hf_token:
     st.error("Hugging Face API token is missing. Please add it to the .env file.")
     st.stop()
 
-# Define PromptTemplate for generating questions
-question_prompt = PromptTemplate(
-    input_variables=["tech_stack", "previous_answer", "context"],
-    template=(
-        "You are a professional interview question generator. The user is proficient in "
-        "{tech_stack}. Based on the user's past responses: {previous_answer} and context: {context}, "
-        "generate a specific, relevant, and challenging interview question related to {tech_stack}."
-    )
-)
-
-# Set up LangChain components
-llm = HuggingFaceHub(
-    repo_id="google/flan-t5-large",
-    model_kwargs={"temperature": 0.2, "max_length": 512},
-    huggingfacehub_api_token=hf_token,
-)
-memory = ConversationBufferMemory(input_key="tech_stack", memory_key="context", return_messages=True)
-
 # Helper functions
 def create_candidate_profile(full_name, email, phone, experience, position, location, tech_stack):
     return {
@@ -50,25 +28,21 @@ def create_candidate_profile(full_name, email, phone, experience, position, loca
         "Tech Stack": tech_stack,
     }
 
-def get_vectorstore(candidate_profile):
-    profile_text = "\n".join([f"{key}: {value}" for key, value in candidate_profile.items()])
-    text_splitter = CharacterTextSplitter(separator="\n", chunk_size=500, chunk_overlap=100)
-    text_chunks = text_splitter.split_text(profile_text)
-
-    embeddings = HuggingFaceInstructEmbeddings(model_name="hkunlp/instructor-xl")
-    return FAISS.from_texts(texts=text_chunks, embedding=embeddings)
-
 def save_conversation(candidate_name, candidate_profile, conversation_data):
-    folder_name = "candidate_conversations"
-    os.makedirs(folder_name, exist_ok=True)
-    file_name = f"{candidate_name.replace(' ', '_').lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    combined_data = {
-        "candidate_profile": candidate_profile,
-        "conversation_data": conversation_data,
-    }
-    with open(os.path.join(folder_name, file_name), "w") as f:
-        json.dump(combined_data, f, indent=4)
-    st.success(f"Conversation saved successfully as {file_name}!")
+    from conversation_store import get_conversation_store
+    from candidate_index import get_candidate_index
+
+    # Appended once per session; the store writes it on a background thread
+    # and the candidate search index picks it up on commit
+    if "saved_record_id" not in st.session_state:
+        with span("save_conversation", page="form"):
+            get_candidate_index()
+            st.session_state.saved_record_id = get_conversation_store().append({
+                "candidate_name": candidate_name,
+                "candidate_profile": candidate_profile,
+                "conversation_data": conversation_data,
+            })
+    st.success(f"Conversation saved successfully as {st.session_state.saved_record_id}!")
 
 def main():
     st.set_page_config(page_title="TalentScout Hiring Assistant", page_icon=":briefcase:")
@@ -85,6 +59,8 @@ def main():
         st.session_state.current_index = 0
     if "tech_stacks" not in st.session_state:
         st.session_state.tech_stacks = []
+    if "interview_context" not in st.session_state:
+        st.session_state.interview_context = make_interview_context()
 
     # Candidate information form
     with st.form("candidate_form"):
@@ -102,8 +78,7 @@ def main():
     if submitted:
         candidate_profile = create_candidate_profile(full_name, email, phone, experience, position, location, tech_stack)
         st.session_state.candidate_profile = candidate_profile
-        st.session_state.vectorstore = get_vectorstore(candidate_profile)
-        st.session_state.tech_stacks = [tech.strip() for tech in tech_stack.split(",") if tech.strip()]
+        st.session_state.tech_stacks = split_tech_stack(tech_stack)
         st.session_state.full_name = full_name
         st.success("Candidate profile created successfully!")
         st.markdown("<div style='text-align: center; margin: 5px; border:1px white'>To Submit your application, Please answer the below questions</div>", unsafe_allow_html=True)
@@ -118,17 +93,20 @@ def main():
             if st.session_state.conversation_history:
                 previous_answer = st.session_state.conversation_history[-1]["answer"]
 
-            context = "\n".join(
-                f"Q: {item['question']} A: {item['answer']}" for item in st.session_state.conversation_history
+            context = st.session_state.interview_context.render(
+                st.session_state.conversation_history,
+                query=current_tech_stack,
+                profile=st.session_state.candidate_profile,
             )
 
             if not st.session_state.conversation_history or st.session_state.conversation_history[-1]["answer"]:
-                question_chain = LLMChain(llm=llm, prompt=question_prompt, memory=memory)
-                question = question_chain.run(
-                    tech_stack=current_tech_stack,
-                    previous_answer=previous_answer,
-                    context=context,
-                )
+                question_chain = get_chain("form_question_prompt")
+                with span("llm_chain", chain="form_question"):
+                    question = question_chain.run(
+                        tech_stack=current_tech_stack,
+                        previous_answer=previous_answer,
+                        context=context,
+                    )
                 st.session_state.conversation_history.append({"question": question, "answer": ""})
 
         # Display conversation history
@@ -152,4 +130,6 @@ def main():
             save_conversation(st.session_state.full_name, st.session_state.candidate_profile, st.session_state.conversation_history)
 
 if __name__ == "__main__":
-    main()
+    start_exporter()
+    with span("streamlit_rerun", page="form"):
+        main()
@@ -0,0 +1,152 @@
+import queue
+import threading
+import time
+from typing import Any, List, Mapping, Optional
+
+from langchain.llms.base import LLM
+from langchain.llms.utils import enforce_stop_tokens
+from langchain.schema import Generation, LLMResult
+
+from hf_transport import TransportError
+from metrics import annotate
+
+
+class _PendingPrompt:
+    __slots__ = ("prompt", "enqueued_at", "wait", "done", "result", "error")
+
+    def __init__(self, prompt):
+        self.prompt = prompt
+        self.enqueued_at = time.perf_counter()
+        self.wait = 0.0
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """Collects prompts from every session and runs them as one batch.
+
+    A single worker thread takes the first waiting prompt, keeps collecting
+    for up to ``max_wait_ms`` or until ``max_batch_size`` prompts are queued,
+    then hands the whole batch to ``generate_batch`` (one forward pass or one
+    API request) and wakes each waiting caller with its own result.
+    """
+
+    def __init__(self, generate_batch, max_batch_size=16, max_wait_ms=15):
+        self.generate_batch = generate_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {"batches": 0, "prompts": 0, "max_batch_size": 0, "total_wait": 0.0, "max_wait": 0.0, "errors": 0}
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, prompt):
+        return self.submit_many([prompt])[0]
+
+    def submit_many(self, prompts):
+        pending = [_PendingPrompt(prompt) for prompt in prompts]
+        for item in pending:
+            self._queue.put(item)
+        results = []
+        for item in pending:
+            item.done.wait()
+            if item.error is not None:
+                raise item.error
+            results.append(item.result)
+        annotate(queue_wait_seconds=max(item.wait for item in pending), batched_prompts=len(pending))
+        return results
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["avg_batch_size"] = stats["prompts"] / stats["batches"] if stats["batches"] else 0.0
+        stats["avg_wait"] = stats["total_wait"] / stats["prompts"] if stats["prompts"] else 0.0
+        return stats
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = batch[0].enqueued_at + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._execute(batch)
+
+    def _execute(self, batch):
+        started = time.perf_counter()
+        waits = [started - item.enqueued_at for item in batch]
+        for item, wait in zip(batch, waits):
+            item.wait = wait
+        try:
+            results = self.generate_batch([item.prompt for item in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batch of {len(batch)} prompts returned {len(results)} results")
+        except Exception as error:
+            for item in batch:
+                item.error = error
+            results = [None] * len(batch)
+            with self._lock:
+                self._stats["errors"] += 1
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["prompts"] += len(batch)
+            self._stats["max_batch_size"] = max(self._stats["max_batch_size"], len(batch))
+            self._stats["total_wait"] += sum(waits)
+            self._stats["max_wait"] = max(self._stats["max_wait"], max(waits))
+        for item, result in zip(batch, results):
+            item.result = result
+            item.done.set()
+
+
+def batch_generate_fn(llm):
+    # Pick the cheapest way this backend can answer several prompts at once
+    llm_type = llm._llm_type
+    if llm_type == "huggingface_pipeline":
+        def generate(prompts):
+            outputs = llm.pipeline(prompts, batch_size=len(prompts))
+            return [(output[0] if isinstance(output, list) else output)["generated_text"] for output in outputs]
+        return generate
+    if llm_type == "huggingface_hub":
+        def generate(prompts):
+            response = llm.client(inputs=prompts, params=llm.model_kwargs or {})
+            if isinstance(response, dict) and "error" in response:
+                raise TransportError(f"Error raised by inference API: {response['error']}")
+            return [(output[0] if isinstance(output, list) else output)["generated_text"] for output in response]
+        return generate
+    return lambda prompts: [llm(prompt) for prompt in prompts]
+
+
+class BatchedLLM(LLM):
+    """LLM wrapper that routes calls through a shared MicroBatcher.
+
+    It reports the wrapped model's type and parameters, so cache keys are
+    the same as for the unbatched model.
+    """
+
+    llm: Any
+    batcher: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return self.llm._llm_type
+
+    @property
+    def _identifying_params(self) -> Mapping[str, Any]:
+        return self.llm._identifying_params
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None) -> str:
+        text = self.batcher.submit(prompt)
+        return enforce_stop_tokens(text, stop) if stop else text
+
+    def _generate(self, prompts: List[str], stop: Optional[List[str]] = None, run_manager=None) -> LLMResult:
+        # chain.apply hands over several prompts at once; queue them together so they share a batch
+        texts = self.batcher.submit_many(prompts)
+        if stop:
+            texts = [enforce_stop_tokens(text, stop) for text in texts]
+        return LLMResult(generations=[[Generation(text=text)] for text in texts])
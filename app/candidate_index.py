@@ -0,0 +1,178 @@
+import argparse
+import bisect
+import json
+import os
+import threading
+import time
+
+from candidate_records import normalize_location, parse_experience, profile_fields, split_tech_stack
+from config import CANDIDATE_INDEX_PATH, CONVERSATION_STORE_DIR, CANDIDATE_INDEX_SAVE_INTERVAL
+from conversation_store import scan_records
+from question_bank import normalize_tech
+from resources import cached_resource
+
+# Bump when the indexed fields change (2: canonical technology ids); older snapshots are rebuilt from the store
+INDEX_FORMAT = 2
+
+
+class CandidateIndex:
+    """Query index over saved interviews.
+
+    - tech: inverted index from normalized technology to candidate ids
+    - experience: (years, id) pairs kept sorted, range queries via bisect
+    - location: (normalized location, id) pairs kept sorted, prefix queries via bisect
+
+    Documents are indexed one at a time as the store commits them.
+    ``position`` is the store offset of the last indexed record, so a saved
+    snapshot only has to replay what was written after it.
+    """
+
+    def __init__(self):
+        self.docs = {}
+        self.tech = {}
+        self.experience = []
+        self.location = []
+        self.position = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, record, position=None):
+        fields = profile_fields(record)
+        doc = {
+            "id": record["id"],
+            "name": fields.get("full_name") or record.get("candidate_name", ""),
+            "position": fields.get("position", ""),
+            "location": fields.get("location", ""),
+            "experience": parse_experience(fields.get("experience")),
+            "tech_stack": split_tech_stack(fields.get("tech_stack")),
+            "saved_at": record.get("saved_at"),
+        }
+        with self._lock:
+            self._add_doc(doc)
+            if position is not None:
+                self.position = position
+
+    def _add_doc(self, doc):
+        if doc["id"] in self.docs:
+            return
+        self.docs[doc["id"]] = doc
+        for tech in doc["tech_stack"]:
+            self.tech.setdefault(tech, set()).add(doc["id"])
+        if doc["experience"] is not None:
+            bisect.insort(self.experience, (doc["experience"], doc["id"]))
+        if doc["location"]:
+            bisect.insort(self.location, (normalize_location(doc["location"]), doc["id"]))
+
+    def query(self, tech=(), min_experience=None, max_experience=None, location=None, limit=50):
+        with self._lock:
+            candidate_sets = []
+            for name in tech:
+                candidate_sets.append(self.tech.get(normalize_tech(name), set()))
+            if min_experience is not None or max_experience is not None:
+                low = bisect.bisect_left(self.experience, (min_experience if min_experience is not None else float("-inf"), ""))
+                high = bisect.bisect_right(self.experience, (max_experience if max_experience is not None else float("inf"), "\uffff"))
+                candidate_sets.append({doc_id for _, doc_id in self.experience[low:high]})
+            if location:
+                prefix = normalize_location(location)
+                low = bisect.bisect_left(self.location, (prefix, ""))
+                high = bisect.bisect_left(self.location, (prefix + "\uffff", ""))
+                candidate_sets.append({doc_id for _, doc_id in self.location[low:high]})
+
+            if not candidate_sets:
+                ids = list(self.docs)
+            else:
+                candidate_sets.sort(key=len)
+                ids = set(candidate_sets[0])
+                for other in candidate_sets[1:]:
+                    ids &= other
+                    if not ids:
+                        break
+            docs = [self.docs[doc_id] for doc_id in ids]
+        docs.sort(key=lambda doc: doc["saved_at"] or "", reverse=True)
+        return docs[:limit] if limit else docs
+
+    def catch_up(self, directory=CONVERSATION_STORE_DIR):
+        added = 0
+        for position, record in scan_records(directory, after=self.position):
+            if "id" in record:
+                self.add(record, position)
+                added += 1
+        return added
+
+    def save(self, path=CANDIDATE_INDEX_PATH):
+        with self._lock:
+            snapshot = {"format": INDEX_FORMAT, "position": self.position, "docs": list(self.docs.values())}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=CANDIDATE_INDEX_PATH):
+        index = cls()
+        if os.path.exists(path):
+            with open(path) as f:
+                snapshot = json.load(f)
+            if snapshot.get("format") != INDEX_FORMAT:
+                return index
+            for doc in snapshot["docs"]:
+                index._add_doc(doc)
+            index.position = tuple(snapshot["position"]) if snapshot["position"] else None
+        return index
+
+
+def open_index(path=CANDIDATE_INDEX_PATH, directory=CONVERSATION_STORE_DIR):
+    index = CandidateIndex.load(path)
+    if index.catch_up(directory):
+        index.save(path)
+    return index
+
+
+@cached_resource
+def get_candidate_index():
+    # Listen before catching up so nothing committed in between is missed; add() ignores repeats
+    from conversation_store import get_conversation_store
+
+    index = CandidateIndex.load()
+    last_saved = [time.time()]
+
+    def on_commit(records, position):
+        for record in records[:-1]:
+            index.add(record)
+        index.add(records[-1], position)
+        if time.time() - last_saved[0] >= CANDIDATE_INDEX_SAVE_INTERVAL:
+            index.save()
+            last_saved[0] = time.time()
+
+    store = get_conversation_store()
+    store.add_commit_listener(on_commit)
+    index.catch_up(store.directory)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search saved candidates by tech stack, experience and location.")
+    parser.add_argument("--index", default=CANDIDATE_INDEX_PATH)
+    parser.add_argument("--store", default=CONVERSATION_STORE_DIR)
+    parser.add_argument("--tech", action="append", default=[], help="required technology (repeatable)")
+    parser.add_argument("--min-experience", type=float)
+    parser.add_argument("--max-experience", type=float)
+    parser.add_argument("--location", help="location prefix, e.g. 'pune'")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    index = open_index(args.index, args.store)
+    started = time.perf_counter()
+    results = index.query(args.tech, args.min_experience, args.max_experience, args.location, args.limit)
+    elapsed = time.perf_counter() - started
+    for doc in results:
+        print(json.dumps(doc, ensure_ascii=False))
+    print(f"{len(results)} of {len(index)} candidates in {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
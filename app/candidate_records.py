@@ -0,0 +1,32 @@
+import re
+
+from profile_questions import PROFILE_STEPS
+from tech_catalog import split_tech_stack  # noqa: F401  (canonical ids; re-exported for the index and exporter)
+
+# Saved interviews come in two shapes: main.py stores the profile as the
+# ordered list of profile Q/A pairs and the technical Q/A under
+# "technical_questions_conersation"; Form_tech_stack_questions.py stores a
+# {label: value} dict and "conversation_data". These helpers read both.
+
+_LABEL_TO_KEY = {step["label"]: step["key"] for step in PROFILE_STEPS}
+_LABEL_TO_KEY["Tech Stack"] = "tech_stack"
+
+
+def profile_fields(record):
+    profile = record.get("candidate_profile") or {}
+    if isinstance(profile, dict):
+        return {_LABEL_TO_KEY[label]: str(value) for label, value in profile.items() if label in _LABEL_TO_KEY}
+    return {step["key"]: qa.get("answer", "") for step, qa in zip(PROFILE_STEPS, profile)}
+
+
+def tech_answers(record):
+    return record.get("technical_questions_conersation") or record.get("conversation_data") or []
+
+
+def parse_experience(text):
+    match = re.search(r"\d+(?:\.\d+)?", str(text or ""))
+    return float(match.group()) if match else None
+
+
+def normalize_location(text):
+    return " ".join(str(text or "").lower().split())
@@ -0,0 +1,82 @@
+import html
+
+from htmlTemplates import css, bot_template, user_template
+from config import CHAT_PAGE_TURNS
+
+# Chat bubbles for the transcripts main.py draws on every rerun.
+#
+# Streamlit re-runs the whole script on every interaction and sends every element
+# it draws again, but an element whose bytes the browser already holds goes out as
+# a short hash reference instead (the forward message cache, for elements of at
+# least global.minCachedMessageSize bytes; see .streamlit/config.toml). So instead
+# of one element per bubble, the transcript is drawn as:
+#
+#   pages  finished turns in groups of CHAT_PAGE_TURNS, one element each. A full
+#          page never changes again, so after its first rerun it costs a reference.
+#   tail   the turns after the last full page, as one element.
+#
+# Each turn is rendered once (compact template, escaped text) and kept until its
+# question or answer changes, so a rerun only formats the bubbles that are new.
+
+
+def _compact(template):
+    return "".join(line.strip() for line in template.strip().splitlines())
+
+
+CSS = _compact(css)
+BOT_TEMPLATE = _compact(bot_template)
+USER_TEMPLATE = _compact(user_template)
+
+
+def render_bubble(template, text):
+    return template.replace("{{MSG}}", html.escape(str(text), quote=False).replace("\n", "<br>"))
+
+
+class ChatTranscript:
+    """Rendered pages of one question/answer history, kept in st.session_state across reruns."""
+
+    def __init__(self, question_format="{question}", page_turns=CHAT_PAGE_TURNS):
+        self.question_format = question_format
+        self.page_turns = max(1, page_turns)
+        self._turns = []
+        self._pages = []
+        self._previous = set()
+        self.stats = {"bytes": 0, "new_bytes": 0, "elements": 0, "rendered_turns": 0}
+
+    def _render_turn(self, number, question, answer):
+        text = render_bubble(BOT_TEMPLATE, self.question_format.format(number=number, question=question))
+        if answer:
+            text += render_bubble(USER_TEMPLATE, answer)
+        self.stats["rendered_turns"] += 1
+        return text
+
+    def blocks(self, history):
+        # HTML strings to draw in order, one st.markdown each
+        turns, pages, size = self._turns, self._pages, self.page_turns
+        del turns[len(history):]
+        for i, qa in enumerate(history):
+            key = (qa["question"], qa["answer"])
+            if i < len(turns) and turns[i][0] == key:
+                continue
+            rendered = (key, self._render_turn(i + 1, *key))
+            if i < len(turns):
+                turns[i] = rendered
+                del pages[i // size:]
+            else:
+                turns.append(rendered)
+
+        full = len(turns) // size
+        del pages[full:]
+        while len(pages) < full:
+            start = len(pages) * size
+            pages.append("".join(text for _, text in turns[start:start + size]))
+        tail = "".join(text for _, text in turns[full * size:])
+        blocks = pages + [tail] if tail else list(pages)
+
+        # Bytes drawn this rerun, and how many of them the browser did not already have
+        current = set(blocks)
+        self.stats["bytes"] = sum(len(block.encode("utf-8")) for block in blocks)
+        self.stats["new_bytes"] = sum(len(block.encode("utf-8")) for block in current - self._previous)
+        self.stats["elements"] = len(blocks)
+        self._previous = current
+        return blocks
@@ -0,0 +1,140 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_flag(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+hf_token = os.getenv("HUGGINGFACEHUB_API_TOKEN")
+
+# Where questions are generated: "hub" (HuggingFace Inference API) or "local" (in-process CPU model)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "hub").strip().lower()
+LLM_MODEL_ID = os.getenv("LLM_MODEL_ID", "google/flan-t5-large")
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.2"))
+LLM_MAX_LENGTH = int(os.getenv("LLM_MAX_LENGTH", "512"))
+LOCAL_LLM_THREADS = int(os.getenv("LOCAL_LLM_THREADS", "0"))  # 0 lets torch decide
+LOCAL_LLM_QUANTIZE = _env_flag("LOCAL_LLM_QUANTIZE", default=True)
+
+# Merge concurrent generation requests from all sessions into micro-batches
+LLM_BATCHING = _env_flag("LLM_BATCHING")
+LLM_BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "16"))
+LLM_BATCH_WAIT_MS = float(os.getenv("LLM_BATCH_WAIT_MS", "15"))
+
+# Profile questions are served from the template table in profile_questions.py.
+# Set PROFILE_REPHRASE=true to let the LLM reword them in the background.
+PROFILE_REPHRASE = _env_flag("PROFILE_REPHRASE")
+
+# Shared LLM response cache (see llm_cache.py)
+LLM_CACHE_ENABLED = _env_flag("LLM_CACHE_ENABLED", default=True)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "1024"))
+LLM_CACHE_DISK_ENTRIES = int(os.getenv("LLM_CACHE_DISK_ENTRIES", "50000"))
+
+# Pregenerated technical questions, built offline with `python app/question_bank.py build ...`
+QUESTION_BANK_PATH = os.getenv("QUESTION_BANK_PATH", os.path.join("data", "question_bank.jsonl"))
+
+# Speculatively generate the next technical question while the candidate types
+PREFETCH_ENABLED = _env_flag("PREFETCH_ENABLED", default=True)
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "4"))
+
+# Stream generated questions token by token: "none", "hf" (HF Inference API) or "local"
+# (a text-generation-inference compatible server such as stub_model_server.py)
+STREAMING_BACKEND = os.getenv("STREAMING_BACKEND", "none").strip().lower()
+STREAMING_URL = os.getenv("STREAMING_URL")
+
+# Prompt context budget for technical questions (flan-t5-large reads at most 512 tokens)
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "200"))
+CONTEXT_WINDOW_TURNS = int(os.getenv("CONTEXT_WINDOW_TURNS", "3"))
+ANSWER_TOKEN_BUDGET = int(os.getenv("ANSWER_TOKEN_BUDGET", "60"))
+
+# Show the import-time / cold-start breakdown from resources.py in the sidebar
+STARTUP_REPORT = _env_flag("STARTUP_REPORT")
+
+# Shared embedding model (see embeddings.py)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "hkunlp/instructor-xl")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "20000"))
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+
+# Append-only conversation store (see conversation_store.py)
+CONVERSATION_STORE_DIR = os.getenv("CONVERSATION_STORE_DIR", os.path.join("candidate_conversations", "segments"))
+SEGMENT_MAX_BYTES = int(os.getenv("SEGMENT_MAX_BYTES", str(64 * 1024 * 1024)))
+GROUP_COMMIT_MS = float(os.getenv("GROUP_COMMIT_MS", "20"))
+STORE_FSYNC = _env_flag("STORE_FSYNC", default=True)
+
+# Candidate search index snapshot (see candidate_index.py)
+CANDIDATE_INDEX_PATH = os.getenv("CANDIDATE_INDEX_PATH", os.path.join("data", "candidate_index.json"))
+CANDIDATE_INDEX_SAVE_INTERVAL = float(os.getenv("CANDIDATE_INDEX_SAVE_INTERVAL", "60"))
+
+# Semantic dedup of generated technical questions (see question_dedup.py)
+DEDUP_ENABLED = _env_flag("DEDUP_ENABLED", default=True)
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.7"))
+DEDUP_EMBEDDING_DIM = int(os.getenv("DEDUP_EMBEDDING_DIM", "512"))
+DEDUP_MAX_RETRIES = int(os.getenv("DEDUP_MAX_RETRIES", "1"))
+
+# Hot-path spans and histograms (see metrics.py)
+METRICS_ENABLED = _env_flag("METRICS_ENABLED", default=True)
+METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", "1.0"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_FILE = os.getenv("METRICS_FILE", "")
+METRICS_FILE_INTERVAL = float(os.getenv("METRICS_FILE_INTERVAL", "15"))
+
+# Conversation-end detection (see end_intent.py)
+END_INTENT_PHRASES_PATH = os.getenv("END_INTENT_PHRASES_PATH", "")
+END_COMMAND_MAX_WORDS = int(os.getenv("END_COMMAND_MAX_WORDS", "3"))
+END_FAREWELL_WINDOW = int(os.getenv("END_FAREWELL_WINDOW", "4"))
+
+# Tech-stack canonicalization (see tech_catalog.py)
+TECH_CATALOG_PATH = os.getenv("TECH_CATALOG_PATH", "")
+TECH_STACK_LIMIT = int(os.getenv("TECH_STACK_LIMIT", "10"))
+TECH_FUZZY_MAX_DISTANCE = int(os.getenv("TECH_FUZZY_MAX_DISTANCE", "2"))
+
+# Interview session checkpoints shared by app workers (see session_store.py)
+SESSION_STORE_BACKEND = os.getenv("SESSION_STORE_BACKEND", "memory").strip().lower()
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", os.path.join(".cache", "sessions.sqlite"))
+SESSION_TTL = float(os.getenv("SESSION_TTL", str(7 * 24 * 3600)))
+
+# Incremental chat rendering (see chat_render.py)
+CHAT_PAGE_TURNS = int(os.getenv("CHAT_PAGE_TURNS", "4"))
+
+# Offline answer scoring (see scoring.py)
+SCORING_METHOD = os.getenv("SCORING_METHOD", "similarity").strip().lower()
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "2"))
+SCORING_BATCH_RECORDS = int(os.getenv("SCORING_BATCH_RECORDS", "32"))
+SCORING_POLL_INTERVAL = float(os.getenv("SCORING_POLL_INTERVAL", "5"))
+SCORES_DIR = os.getenv("SCORES_DIR", os.path.join("candidate_conversations", "scores"))
+REFERENCE_ANSWERS_PATH = os.getenv("REFERENCE_ANSWERS_PATH", os.path.join("data", "reference_answers.json"))
+
+# Shared HTTP transport for Hugging Face Inference API calls (see hf_transport.py)
+HF_API_URL = os.getenv("HF_API_URL", f"https://api-inference.huggingface.co/models/{LLM_MODEL_ID}")
+HF_POOL_SIZE = int(os.getenv("HF_POOL_SIZE", "16"))
+HF_TIMEOUT = float(os.getenv("HF_TIMEOUT", "60"))
+HF_RATE_LIMIT = float(os.getenv("HF_RATE_LIMIT", "10"))  # requests per second per process, 0 = unlimited
+HF_RATE_BURST = int(os.getenv("HF_RATE_BURST", "20"))
+HF_MAX_RETRIES = int(os.getenv("HF_MAX_RETRIES", "4"))
+HF_RETRY_BASE = float(os.getenv("HF_RETRY_BASE", "0.5"))
+HF_RETRY_MAX = float(os.getenv("HF_RETRY_MAX", "20"))
+HF_HEDGE_AFTER_MS = float(os.getenv("HF_HEDGE_AFTER_MS", "3000"))  # 0 disables hedged requests
+HF_BREAKER_FAILURES = int(os.getenv("HF_BREAKER_FAILURES", "5"))
+HF_BREAKER_RESET = float(os.getenv("HF_BREAKER_RESET", "30"))
+
+# Technical question context: "retrieval" (top-k relevant profile lines and answers, see
+# retrieval_context.py) or "window" (recent turns plus summaries, see interview_context.py)
+CONTEXT_MODE = os.getenv("CONTEXT_MODE", "retrieval").strip().lower()
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "4"))
+RETRIEVAL_EMBEDDER = os.getenv("RETRIEVAL_EMBEDDER", "hashing").strip().lower()  # hashing | instructor
+
+# Technical interview planning: questions, follow-ups and time budget (see interview_scheduler.py)
+SCHEDULE_MAX_QUESTIONS = int(os.getenv("SCHEDULE_MAX_QUESTIONS", "8"))
+SCHEDULE_MIN_QUESTIONS = int(os.getenv("SCHEDULE_MIN_QUESTIONS", "4"))
+SCHEDULE_FOLLOW_UPS = int(os.getenv("SCHEDULE_FOLLOW_UPS", "2"))
+SCHEDULE_TIME_BUDGET = float(os.getenv("SCHEDULE_TIME_BUDGET", "1200"))  # seconds for the technical part, 0 = no limit
+SCHEDULE_QUESTION_SECONDS = float(os.getenv("SCHEDULE_QUESTION_SECONDS", "120"))  # expected generation + answer time
+SCHEDULE_WEAK_ANSWER_WORDS = int(os.getenv("SCHEDULE_WEAK_ANSWER_WORDS", "8"))
+SCHEDULE_PIPELINE_DEPTH = int(os.getenv("SCHEDULE_PIPELINE_DEPTH", "2"))
@@ -0,0 +1,318 @@
+import argparse
+import atexit
+import glob
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime
+
+from config import CONVERSATION_STORE_DIR, SEGMENT_MAX_BYTES, GROUP_COMMIT_MS, STORE_FSYNC
+from metrics import annotate, registry, span
+from resources import cached_resource
+
+# Each record is a 4-byte big-endian payload length, a 4-byte CRC32 of the
+# payload and the payload itself: one compact JSON object. A torn write at the
+# end of a segment (crash mid-append) fails the length or CRC check and is cut
+# off on the next open.
+HEADER = struct.Struct(">II")
+SEGMENT_PATTERN = "segment-{:06d}.log"
+
+
+def encode_record(record):
+    payload = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _segment_paths(directory):
+    return sorted(glob.glob(os.path.join(directory, "segment-*.log")))
+
+
+def _scan_segment(path):
+    # Yields (offset, end, record) for every intact record; stops at the first damaged one
+    with open(path, "rb") as f:
+        offset = 0
+        while True:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                return
+            length, checksum = HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                return
+            end = offset + HEADER.size + length
+            yield offset, end, json.loads(payload)
+            offset = end
+
+
+def _segment_number(path):
+    return int(os.path.basename(path)[len("segment-"):-len(".log")])
+
+
+def iter_records(directory=CONVERSATION_STORE_DIR):
+    for path in _segment_paths(directory):
+        for _, _, record in _scan_segment(path):
+            yield record
+
+
+def scan_records(directory=CONVERSATION_STORE_DIR, after=None):
+    # Yields (position, record) with position = (segment number, end offset).
+    # Passing a previously seen position resumes right after it.
+    for path in _segment_paths(directory):
+        number = _segment_number(path)
+        if after is not None and number < after[0]:
+            continue
+        for _, end, record in _scan_segment(path):
+            if after is not None and (number, end) <= tuple(after):
+                continue
+            yield (number, end), record
+
+
+class _PendingWrite:
+    __slots__ = ("data", "record", "done", "error")
+
+    def __init__(self, record):
+        self.record = record
+        self.data = encode_record(record)
+        self.done = threading.Event()
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+
+
+class ConversationStore:
+    """Append-only store for finished interviews.
+
+    append() hands the record to a background writer thread and returns at
+    once. The writer drains everything queued within ``group_commit_ms``,
+    writes it with one write call and one fsync (group commit), then runs the
+    commit listeners. Segments roll over at ``segment_max_bytes``, so no file
+    grows without bound and readers can stream them in order. A failed commit
+    is rolled back to where the batch started and its error is raised to
+    every waiter in the batch (append(wait=True), flush()); the writer keeps
+    going with the next batch.
+    """
+
+    def __init__(self, directory=CONVERSATION_STORE_DIR, segment_max_bytes=SEGMENT_MAX_BYTES,
+                 group_commit_ms=GROUP_COMMIT_MS, fsync=STORE_FSYNC):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.group_commit = group_commit_ms / 1000.0
+        self.fsync = fsync
+        self._listeners = []
+        self._queue = queue.Queue()
+        self._closed = False
+        self.stats = {
+            "records": 0, "commits": 0, "bytes": 0, "segments_rotated": 0,
+            "failed_commits": 0, "failed_records": 0, "failed_listeners": 0,
+        }
+        self.last_error = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._open_tail()
+        self._writer = threading.Thread(target=self._run, name="conversation-store-writer", daemon=True)
+        self._writer.start()
+
+    def add_commit_listener(self, listener):
+        # listener(records, position) runs on the writer thread after each durable
+        # commit; position is the (segment number, end offset) of the last record
+        # and can be passed to scan_records() to resume after it
+        self._listeners.append(listener)
+
+    def append(self, record, wait=False):
+        record = dict(record)
+        record.setdefault("id", uuid.uuid4().hex)
+        record.setdefault("saved_at", datetime.now().isoformat(timespec="seconds"))
+        pending = _PendingWrite(record)
+        self._queue.put(pending)
+        if wait:
+            pending.wait()
+        return record["id"]
+
+    def flush(self):
+        marker = _PendingWrite({})
+        marker.data = b""
+        self._queue.put(marker)
+        marker.wait()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+
+    def _open_tail(self):
+        paths = _segment_paths(self.directory)
+        if not paths:
+            self._segment_number = 1
+            self._file = open(os.path.join(self.directory, SEGMENT_PATTERN.format(1)), "ab")
+            return
+        path = paths[-1]
+        self._segment_number = _segment_number(path)
+        valid_end = 0
+        for _, end, _ in _scan_segment(path):
+            valid_end = end
+        self._file = open(path, "ab")
+        if self._file.tell() != valid_end:
+            self._file.truncate(valid_end)
+
+    def _rotate(self):
+        self._file.close()
+        self._segment_number += 1
+        self._file = open(os.path.join(self.directory, SEGMENT_PATTERN.format(self._segment_number)), "ab")
+        self.stats["segments_rotated"] += 1
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.perf_counter() + self.group_commit
+            stop = False
+            while True:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            with span("store_commit"):
+                start = None
+                try:
+                    start = (self._segment_number, self._file.tell())
+                    self._commit(batch)
+                except Exception as error:
+                    annotate(outcome="failed")
+                    self._fail(batch, start, error)
+            if stop:
+                return
+
+    def _commit(self, batch):
+        records = [item.record for item in batch if item.data]
+        annotate(records=len(records))
+        for item in batch:
+            if not item.data:
+                continue
+            if self._file.tell() and self._file.tell() + len(item.data) > self.segment_max_bytes:
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+                self._rotate()
+            self._file.write(item.data)
+            self.stats["bytes"] += len(item.data)
+        self._file.flush()
+        if self.fsync and records:
+            os.fsync(self._file.fileno())
+        self.stats["records"] += len(records)
+        self.stats["commits"] += 1
+        position = (self._segment_number, self._file.tell())
+        for listener in self._listeners if records else ():
+            try:
+                listener(records, position)
+            except Exception as error:
+                # The records are durable either way; a listener that fails (e.g. the candidate
+                # index) has fallen behind the log, which shows up here and in the metrics
+                self.last_error = error
+                self.stats["failed_listeners"] += 1
+        for item in batch:
+            item.done.set()
+
+    def _fail(self, batch, start, error):
+        self.last_error = error
+        self.stats["failed_commits"] += 1
+        self.stats["failed_records"] += sum(1 for item in batch if item.data)
+        try:
+            if start is not None:
+                self._rollback(*start)
+            else:
+                self._open_tail()
+        except Exception:
+            pass  # retried through _open_tail() by the next batch that fails the same way
+        for item in batch:
+            item.error = error
+            item.done.set()
+
+    def _rollback(self, segment_number, offset):
+        # Drop whatever part of the failed batch reached the disk, so a caller that retries
+        # after seeing the error does not store the record twice
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        for path in _segment_paths(self.directory):
+            if _segment_number(path) > segment_number:
+                os.remove(path)
+        self._segment_number = segment_number
+        self._file = open(os.path.join(self.directory, SEGMENT_PATTERN.format(segment_number)), "ab")
+        self._file.truncate(offset)
+
+
+@cached_resource
+def get_conversation_store():
+    store = ConversationStore()
+    atexit.register(store.close)
+    registry.add_collector(lambda: {f"conversation_store_{name}": value for name, value in store.stats.items()})
+    return store
+
+
+def legacy_file_metadata(path):
+    # Older versions named files <candidate_name>_<YYYYmmdd>_<HHMMSS>.json
+    stem = os.path.splitext(os.path.basename(path))[0]
+    candidate, _, stamp = stem.rpartition("_")
+    candidate, _, date = candidate.rpartition("_")
+    try:
+        saved_at = datetime.strptime(f"{date}_{stamp}", "%Y%m%d_%H%M%S").isoformat()
+    except ValueError:
+        candidate, saved_at = stem, datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec="seconds")
+    return {"candidate_name": candidate.replace("_", " "), "saved_at": saved_at, "source": os.path.basename(path)}
+
+
+def migrate_json_files(store, source_dir):
+    # Idempotent: files already ingested (by source file name) are skipped
+    already = {record.get("source") for record in iter_records(store.directory)}
+    migrated = 0
+    for path in sorted(glob.glob(os.path.join(source_dir, "*.json"))):
+        if os.path.basename(path) in already:
+            continue
+        with open(path) as f:
+            data = json.load(f)
+        store.append(dict(data, **legacy_file_metadata(path)))
+        migrated += 1
+    store.flush()
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and migrate the candidate conversation store.")
+    parser.add_argument("--dir", default=CONVERSATION_STORE_DIR, help="store directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate = subparsers.add_parser("migrate", help="ingest per-candidate JSON files written by older versions")
+    migrate.add_argument("--source", default="candidate_conversations")
+    subparsers.add_parser("dump", help="print every stored record as one JSON line")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        store = ConversationStore(args.dir)
+        migrated = migrate_json_files(store, args.source)
+        store.close()
+        print(f"Migrated {migrated} conversations into {args.dir}")
+    elif args.command == "dump":
+        for record in iter_records(args.dir):
+            print(json.dumps(record, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from langchain.embeddings.base import Embeddings
+
+from config import EMBEDDING_MODEL, EMBEDDING_CACHE_SIZE, EMBEDDING_BATCH_SIZE
+from resources import cached_resource, lazy_import
+
+
+def _text_key(kind, text):
+    # Instructor embeds documents and queries with different instructions, so the kind is part of the key
+    return hashlib.sha256(f"{kind}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingService(Embeddings):
+    """Shared embedding model for every session in the process.
+
+    The instructor model is loaded on first use and kept for the process.
+    Vectors are cached by text hash, so repeated profile lines ("Years of
+    Experience: 2") are embedded once, and cache misses go to the model in
+    batches. Vectors are not stored anywhere else: each interview keeps its
+    own snippets in retrieval_context.RetrievalContext, so no candidate's
+    profile ends up in an index shared with other candidates.
+    """
+
+    def __init__(self, model_name=EMBEDDING_MODEL, cache_size=EMBEDDING_CACHE_SIZE, batch_size=EMBEDDING_BATCH_SIZE):
+        self.model_name = model_name
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self._model = None
+        self._cache = OrderedDict()
+        self._lock = threading.RLock()
+        self.stats = {"cache_hits": 0, "cache_misses": 0, "model_batches": 0}
+
+    @property
+    def model(self):
+        with self._lock:
+            if self._model is None:
+                HuggingFaceInstructEmbeddings = lazy_import("langchain.embeddings").HuggingFaceInstructEmbeddings
+                self._model = HuggingFaceInstructEmbeddings(model_name=self.model_name)
+            return self._model
+
+    def embed_documents(self, texts):
+        return self._embed("document", texts)
+
+    def embed_query(self, text):
+        return self._embed("query", [text])[0]
+
+    def _embed(self, kind, texts):
+        keys = [_text_key(kind, text) for text in texts]
+        with self._lock:
+            missing = {}
+            for key, text in zip(keys, texts):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    self.stats["cache_hits"] += 1
+                elif key not in missing:
+                    missing[key] = text
+            self.stats["cache_misses"] += len(missing)
+
+            pending = list(missing.items())
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start:start + self.batch_size]
+                batch_texts = [text for _, text in batch]
+                if kind == "query":
+                    vectors = [self.model.embed_query(text) for text in batch_texts]
+                else:
+                    vectors = self.model.embed_documents(batch_texts)
+                self.stats["model_batches"] += 1
+                for (key, _), vector in zip(batch, vectors):
+                    self._cache[key] = vector
+            # Read the results before trimming, or a large batch could evict its own vectors
+            vectors = [self._cache[key] for key in keys]
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return vectors
+
+
+@cached_resource
+def get_embedding_service():
+    return EmbeddingService()
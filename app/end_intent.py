@@ -0,0 +1,273 @@
+import json
+import re
+from collections import deque
+
+from config import END_INTENT_PHRASES_PATH, END_COMMAND_MAX_WORDS, END_FAREWELL_WINDOW
+
+# Decides whether a candidate's message means "stop the interview".
+#
+# All phrases live in one Aho-Corasick automaton built at import, so a message
+# is scanned once, left to right, at constant cost per character regardless of
+# how many phrases or languages are configured. Each phrase has a kind, and
+# the kinds combine into whole-message rules:
+#
+#   explicit  "end the interview", "stop the interview": ends it anywhere in the message
+#   closing   "i'm done", "no more questions": only as the last clause of the message, after its start
+#             or a punctuation mark, with nothing after it but punctuation and "thanks" / "bye"
+#   farewell  "bye", "see you later": only at the end of the message, within its last
+#             END_FAREWELL_WINDOW words and with nothing after it but punctuation and "thanks"
+#   command   "end", "stop", "quit": only when the whole message is at most END_COMMAND_MAX_WORDS words
+#   block     "back end", "end to end", "stop words": technical phrases that cancel any match they overlap
+#   negation  "don't", "not": cancels a match starting within two words after it in the same clause
+#
+# Matches only count on word boundaries, so "endpoint" or "backend" never match "end", and never
+# inside an identifier ("exit(1)", "sys.exit", "end_time").
+
+DEFAULT_PHRASES = {
+    "explicit": [
+        # English
+        "end the interview", "end this interview", "end the conversation", "end this conversation",
+        "stop the interview", "stop this interview", "stop the conversation", "terminate the interview",
+        "terminate the conversation", "close the interview", "close the conversation", "finish the interview",
+        "quit the interview", "done with the interview", "done with this interview", "done with the conversation",
+        "let's end here", "let's stop here",
+        # Spanish
+        "terminar la entrevista", "finalizar la entrevista",
+        # French
+        "terminer l'entretien", "arrêter l'entretien",
+        # German
+        "interview beenden", "das interview beenden",
+        # Portuguese
+        "encerrar a entrevista", "terminar a entrevista",
+        # Italian
+        "terminare il colloquio",
+        # Hindi (romanized)
+        "interview khatam", "band karo",
+    ],
+    # First-person phrases that also open ordinary answers ("I am done with the migration and ...")
+    "closing": [
+        "i'm done", "i am done", "i want to stop", "i want to quit", "i would like to stop", "i'd like to stop",
+        "i want to end", "that's all from me", "that is all from me", "that's all", "no more questions",
+        "quiero terminar", "eso es todo", "je veux arrêter", "c'est tout", "ich möchte aufhören", "das war's",
+        "quero parar", "voglio smettere",
+    ],
+    "farewell": [
+        "bye", "goodbye", "good bye", "bye bye", "see you", "see you later", "see you soon", "farewell",
+        "adiós", "adios", "hasta luego", "au revoir", "tschüss", "tschuss", "auf wiedersehen",
+        "tchau", "adeus", "arrivederci", "alvida",
+    ],
+    "command": [
+        "end", "stop", "quit", "exit", "close", "terminate", "finish", "done",
+        "fin", "terminar", "parar", "arrêter", "beenden", "stopp", "basta",
+    ],
+    "block": [
+        "back end", "front end", "end to end", "end-to-end", "end user", "end users", "dead end", "high end",
+        "low end", "end point", "stop words", "stop word", "exit code", "exit status", "close connection",
+        "bus stop", "non stop", "non-stop", "end of file", "end of line",
+    ],
+    "negation": [
+        "not", "don't", "dont", "do not", "never", "no need to", "won't", "wouldn't", "nicht", "pas", "nunca",
+    ],
+}
+
+_KINDS = ("explicit", "closing", "farewell", "command", "block", "negation")
+
+# What may follow a closing phrase: punctuation and a few courtesy words
+_CLOSING_TAIL = re.compile(
+    r"[\W_]*(?:(?:thanks|thank you|thx|bye|goodbye|now|here|for now|for today|gracias|merci|danke|obrigad[oa]|grazie)\b[\W_]*)*"
+)
+
+
+# Characters that join a word into an identifier or call, as in "exit(1)", "sys.exit" or "end_time"
+_IDENTIFIER_CALL = "_("
+_IDENTIFIER_DOTS = ".:"
+_CLAUSE_BREAKS = re.compile(r"[,.;:!?]")
+
+
+def _is_word_char(ch):
+    return ch.isalnum()
+
+
+def _normalize(text):
+    return text.lower().replace("’", "'").replace("‘", "'")
+
+
+def _word_count(phrase):
+    count = 0
+    previous = False
+    for ch in phrase:
+        current = _is_word_char(ch)
+        if current and not previous:
+            count += 1
+        previous = current
+    return count
+
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton over lowercase phrases, each tagged with a kind."""
+
+    def __init__(self, phrases):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for kind, items in phrases.items():
+            for phrase in items:
+                phrase = _normalize(phrase).strip()
+                if phrase:
+                    self._add(phrase, (kind, len(phrase), _word_count(phrase)))
+        self._build_failure_links()
+
+    def _add(self, phrase, payload):
+        state = 0
+        for ch in phrase:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(payload)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(ch, 0) if state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def scan(self, text):
+        # One pass: returns (matches, word_count); a match is (kind, start, end, first_word, last_word)
+        goto, fail, out = self._goto, self._fail, self._out
+        matches = []
+        state = 0
+        words = 0
+        previous_is_word = False
+        length = len(text)
+        for i, ch in enumerate(text):
+            is_word = _is_word_char(ch)
+            if is_word and not previous_is_word:
+                words += 1
+            previous_is_word = is_word
+
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            after_ok = i + 1 >= length or not (is_word and _is_word_char(text[i + 1]))
+            if not after_ok:
+                continue
+            for kind, size, word_span in out[state]:
+                start = i - size + 1
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                last_word = words - 1
+                matches.append((kind, start, i + 1, last_word - max(word_span, 1) + 1, last_word))
+        return matches, words
+
+
+def load_phrases(path=END_INTENT_PHRASES_PATH):
+    # A JSON file with any of the kinds as keys replaces the default list for those kinds
+    phrases = {kind: list(items) for kind, items in DEFAULT_PHRASES.items()}
+    if path:
+        with open(path, "r", encoding="utf-8") as file:
+            custom = json.load(file)
+        for kind in _KINDS:
+            if kind in custom:
+                phrases[kind] = list(custom[kind])
+    return phrases
+
+
+class EndIntentDetector:
+    def __init__(self, phrases=None, command_max_words=END_COMMAND_MAX_WORDS, farewell_window=END_FAREWELL_WINDOW):
+        self.automaton = PhraseAutomaton(phrases or load_phrases())
+        self.command_max_words = command_max_words
+        self.farewell_window = farewell_window
+
+    def __call__(self, message):
+        text = _normalize(message or "")
+        matches, words = self.automaton.scan(text)
+        if not matches:
+            return False
+
+        # Rule checks stay linear in the message: blocked characters go into a prefix
+        # sum and negated word positions into a set, so each match is checked in O(1).
+        blocked = None
+        if any(match[0] == "block" for match in matches):
+            depth = [0] * (len(text) + 1)
+            for kind, start, end, _, _ in matches:
+                if kind == "block":
+                    depth[start] += 1
+                    depth[end] -= 1
+            blocked = [0] * (len(text) + 1)
+            open_blocks = 0
+            for i in range(len(text)):
+                open_blocks += depth[i]
+                blocked[i + 1] = blocked[i] + (open_blocks > 0)
+        # Word position -> end offsets of the negations that reach it
+        negated = {}
+        for kind, _, end, _, last in matches:
+            if kind == "negation":
+                for offset in (1, 2):
+                    negated.setdefault(last + offset, []).append(end)
+
+        closing = None
+        farewell = None
+        for kind, start, end, first_word, last_word in matches:
+            if kind in ("block", "negation"):
+                continue
+            if blocked is not None and blocked[end] - blocked[start]:
+                continue
+            if _in_identifier(text, start, end):
+                continue
+            if kind != "farewell" and _is_negated(text, start, negated.get(first_word)):
+                continue
+            if kind == "explicit":
+                return True
+            if kind == "closing":
+                closing = (start, end)
+            if kind == "farewell" and last_word >= words - self.farewell_window:
+                farewell = end
+            if kind == "command" and words <= self.command_max_words:
+                return True
+        # Only the last closing phrase or farewell can end the message, so one check each keeps this linear
+        if farewell is not None and _ends_message(text, farewell):
+            return True
+        return closing is not None and _closes_message(text, *closing)
+
+
+def _in_identifier(text, start, end):
+    before = text[start - 1] if start > 0 else ""
+    after = text[end] if end < len(text) else ""
+    if before == "_" or (after and after in _IDENTIFIER_CALL):
+        return True
+    # "sys.exit" and "exit.code", but not the full stop in "stop. thanks"
+    if before and before in _IDENTIFIER_DOTS and start > 1 and _is_word_char(text[start - 2]):
+        return True
+    return bool(after) and after in _IDENTIFIER_DOTS and end + 1 < len(text) and _is_word_char(text[end + 1])
+
+
+def _is_negated(text, start, negation_ends):
+    # A negation only reaches into its own clause: "not sure, stop" is still a command
+    return any(not _CLAUSE_BREAKS.search(text, negation_end, start) for negation_end in negation_ends or ())
+
+
+def _ends_message(text, end):
+    return _CLOSING_TAIL.fullmatch(text, end) is not None
+
+
+def _closes_message(text, start, end):
+    before = text[:start].rstrip()
+    if before and before[-1].isalnum():
+        return False
+    return _ends_message(text, end)
+
+
+detect_end_intent = EndIntentDetector()
@@ -0,0 +1,165 @@
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from candidate_records import parse_experience, profile_fields, split_tech_stack, tech_answers
+from config import CONVERSATION_STORE_DIR
+from conversation_store import _scan_segment, legacy_file_metadata
+
+# Streams saved interviews into a columnar file: sources -> records -> flat
+# rows -> fixed-size Arrow record batches -> writer. Only one batch is held in
+# memory at a time, whatever the size of the backlog.
+
+BATCH_SIZE = 1024
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("record_id", pa.string()),
+        ("source", pa.string()),
+        ("schema", pa.string()),
+        ("saved_at", pa.string()),
+        ("candidate_name", pa.string()),
+        ("full_name", pa.string()),
+        ("email", pa.string()),
+        ("phone", pa.string()),
+        ("experience_years", pa.float64()),
+        ("position", pa.string()),
+        ("location", pa.string()),
+        ("tech_stack", pa.list_(pa.string())),
+        ("num_tech_questions", pa.int32()),
+        ("tech_questions", pa.list_(pa.string())),
+        ("tech_answers", pa.list_(pa.string())),
+    ])
+
+
+def read_source(path, skip_sources=frozenset()):
+    # A source is either one legacy per-candidate JSON file or one store segment.
+    # Segment records migrated from a JSON file that is also being exported are
+    # skipped, so nothing appears twice.
+    if path.endswith(".json"):
+        with open(path) as f:
+            record = json.load(f)
+        for key, value in legacy_file_metadata(path).items():
+            record.setdefault(key, value)
+        record.setdefault("id", os.path.splitext(os.path.basename(path))[0])
+        yield record
+    else:
+        for _, _, record in _scan_segment(path):
+            if record.get("source") not in skip_sources:
+                yield record
+
+
+def flatten(record):
+    fields = profile_fields(record)
+    answers = tech_answers(record)
+    return {
+        "record_id": record.get("id"),
+        "source": record.get("source"),
+        "schema": "form" if "conversation_data" in record else "interview",
+        "saved_at": record.get("saved_at"),
+        "candidate_name": record.get("candidate_name"),
+        "full_name": fields.get("full_name"),
+        "email": fields.get("email"),
+        "phone": fields.get("phone"),
+        "experience_years": parse_experience(fields.get("experience")),
+        "position": fields.get("position"),
+        "location": fields.get("location"),
+        "tech_stack": split_tech_stack(fields.get("tech_stack")),
+        "num_tech_questions": len(answers),
+        "tech_questions": [qa.get("question", "") for qa in answers],
+        "tech_answers": [qa.get("answer", "") for qa in answers],
+    }
+
+
+def iter_rows(paths, skip_sources=frozenset()):
+    for path in paths:
+        for record in read_source(path, skip_sources):
+            yield flatten(record)
+
+
+def iter_batches(rows, batch_size=BATCH_SIZE):
+    import pyarrow as pa
+
+    schema = _schema()
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            return
+        yield pa.RecordBatch.from_pylist(chunk, schema=schema)
+
+
+def write_batches(batches, out_path, fmt="parquet"):
+    import pyarrow as pa
+
+    schema = _schema()
+    rows = 0
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        with pq.ParquetWriter(out_path, schema, compression="zstd") as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    elif fmt == "arrow":
+        with pa.OSFile(out_path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    else:
+        raise ValueError(f"Unknown export format {fmt!r}, expected 'parquet' or 'arrow'")
+    return rows
+
+
+def export_shard(paths, out_path, fmt="parquet", batch_size=BATCH_SIZE, skip_sources=frozenset()):
+    return write_batches(iter_batches(iter_rows(paths, skip_sources), batch_size), out_path, fmt)
+
+
+def discover_sources(json_dir, store_dir):
+    paths = sorted(glob.glob(os.path.join(json_dir, "*.json"))) if json_dir else []
+    if store_dir:
+        paths.extend(sorted(glob.glob(os.path.join(store_dir, "segment-*.log"))))
+    return paths
+
+
+def export(paths, out, fmt="parquet", workers=1, batch_size=BATCH_SIZE):
+    # One worker writes a single file at `out`. With several workers the
+    # sources are dealt round-robin into shards and each process writes
+    # `out/part-NNNNN.<ext>`, which Arrow and Parquet readers treat as one dataset.
+    skip_sources = frozenset(os.path.basename(path) for path in paths if path.endswith(".json"))
+    if workers <= 1:
+        return {out: export_shard(paths, out, fmt, batch_size, skip_sources)}
+    os.makedirs(out, exist_ok=True)
+    extension = "parquet" if fmt == "parquet" else "arrow"
+    shards = [paths[i::workers] for i in range(workers)]
+    shards = [shard for shard in shards if shard]
+    outputs = [os.path.join(out, f"part-{i:05d}.{extension}") for i in range(len(shards))]
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        n = len(shards)
+        counts = pool.map(export_shard, shards, outputs, [fmt] * n, [batch_size] * n, [skip_sources] * n)
+        return dict(zip(outputs, counts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export saved interviews to Parquet or Arrow IPC.")
+    parser.add_argument("out", help="output file (or directory when --workers > 1)")
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--json-dir", default="candidate_conversations", help="legacy per-candidate JSON files")
+    parser.add_argument("--store", default=CONVERSATION_STORE_DIR, help="conversation store segments")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    paths = discover_sources(args.json_dir, args.store)
+    for path, rows in export(paths, args.out, args.format, args.workers, args.batch_size).items():
+        print(f"{path}\t{rows} rows")
+
+
+if __name__ == "__main__":
+    main()
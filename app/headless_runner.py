@@ -0,0 +1,176 @@
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import PROFILE_REPHRASE, SCHEDULE_MAX_QUESTIONS
+from interview_flow import DONE, PROFILE, TECH, checkpoint, new_session, save_interview
+from interview_scheduler import FOLLOW_UP
+from profile_questions import PROFILE_STEPS
+
+# Drives interview_flow.InterviewSession from scripted answers, without a browser.
+# Each line of the input is one candidate:
+#
+#     {"id": "c1", "profile": {"full_name": "Ada", ..., "tech_stack": "python, sql"},
+#      "tech_answers": ["...", "..."]}
+#
+# "profile" may also be a list of answers in PROFILE_STEPS order. Sessions run
+# concurrently against the configured LLM backend and are saved through the
+# same path as the app.
+
+END_ANSWER = "That is all from me, bye."
+
+# Synthetic candidates mix detailed answers with weak ones, so follow-ups get exercised
+DETAILED_ANSWERS = [
+    "I would profile it first, cache the hot path, add an index for the slow query and cover the change with tests before rolling it out.",
+    "In production we used {tech} behind a queue, with retries and idempotent handlers, and we monitored latency percentiles per endpoint.",
+    "I split the work into small modules with clear interfaces, wrote integration tests around them and documented the trade-offs for the team.",
+]
+WEAK_ANSWERS = ["Not sure, I have only read about it.", "I don't know.", "Maybe use {tech}?"]
+
+
+def load_scripts(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def synthetic_scripts(count, technologies, seed=0):
+    rng = random.Random(seed)
+    scripts = []
+    for i in range(count):
+        techs = rng.sample(technologies, min(len(technologies), rng.randint(2, 4)))
+        scripts.append({
+            "id": f"synthetic-{i}",
+            "profile": {
+                "full_name": f"Candidate {i}",
+                "email": f"candidate{i}@example.com",
+                "phone": f"555-{i:04d}",
+                "experience": str(rng.randint(0, 15)),
+                "position": rng.choice(["Backend Developer", "Data Engineer", "Frontend Developer"]),
+                "location": rng.choice(["Berlin", "Pune", "Toronto", "Austin"]),
+                "tech_stack": ", ".join(techs),
+            },
+            "tech_answers": [
+                rng.choice(WEAK_ANSWERS if rng.random() < 0.3 else DETAILED_ANSWERS).format(tech=rng.choice(techs))
+                for _ in range(SCHEDULE_MAX_QUESTIONS)
+            ],
+        })
+    return scripts
+
+
+def profile_answers(script):
+    profile = script.get("profile") or []
+    if isinstance(profile, dict):
+        return [str(profile.get(step["key"], "")) for step in PROFILE_STEPS]
+    return [str(answer) for answer in profile]
+
+
+def run_script(script, profile_engine, question_chain, save=True, checkpoints=False):
+    # With checkpoints, the session is written to the session store after every answer, as main.py does
+    session_id = f"headless-{script.get('id') or uuid.uuid4().hex}"
+    session = new_session(profile_engine, question_chain)
+    answers = {PROFILE: iter(profile_answers(script)), TECH: iter(script.get("tech_answers") or [])}
+    latencies = []
+    started = time.perf_counter()
+    while session.phase != DONE:
+        phase = session.phase
+        asked = time.perf_counter()
+        question = session.pending_question()
+        latencies.append(time.perf_counter() - asked)
+        if question is None:
+            if session.phase == DONE:
+                break  # the remaining planned questions would all have repeated earlier ones
+            raise RuntimeError(f"session stalled in {phase} phase")
+        session.submit(next(answers[phase], END_ANSWER if phase != PROFILE else ""))
+        if checkpoints:
+            checkpoint(session_id, session)
+    record_id = save_interview(session) if save else None
+    return {
+        "id": script.get("id"),
+        "record_id": record_id,
+        "questions": len(session.conversation_history) + len(session.conversation_history2),
+        "tech_questions": len(session.conversation_history2),
+        "follow_ups": sum(1 for slot in session.plan[:len(session.conversation_history2)] if slot["kind"] == FOLLOW_UP),
+        "elapsed": time.perf_counter() - started,
+        "max_question_latency": max(latencies, default=0.0),
+        "question_latencies": latencies,
+    }
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run_scripts(scripts, workers=8, backend=None, save=True, checkpoints=False):
+    from resources import get_chain, get_profile_engine_resource
+
+    profile_engine = get_profile_engine_resource(PROFILE_REPHRASE)
+    question_chain = get_chain("question_prompt", backend)
+    results, failures = [], []
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="interview") as executor:
+        futures = {executor.submit(run_script, script, profile_engine, question_chain, save, checkpoints): script for script in scripts}
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as exc:
+                failures.append({"id": futures[future].get("id"), "error": repr(exc)})
+    wall = time.perf_counter() - started
+
+    latencies = [latency for result in results for latency in result.pop("question_latencies")]
+    return {
+        "sessions": len(results),
+        "failures": failures,
+        "workers": workers,
+        "wall_time": wall,
+        "sessions_per_second": len(results) / wall if wall else 0.0,
+        "questions": sum(result["questions"] for result in results),
+        "follow_ups": sum(result["follow_ups"] for result in results),
+        "question_latency_p50": _percentile(latencies, 0.5),
+        "question_latency_p95": _percentile(latencies, 0.95),
+        "question_latency_max": max(latencies, default=0.0),
+        "results": sorted(results, key=lambda result: str(result["id"])),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scripted interviews without the Streamlit UI.")
+    parser.add_argument("scripts", nargs="?", help="JSONL file with one candidate script per line")
+    parser.add_argument("--synthetic", type=int, default=0, help="generate this many candidate scripts instead")
+    parser.add_argument("--techs", default="python,sql,javascript,docker,react,css", help="technologies for --synthetic")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--backend", help="LLM backend (hub, local, stub); defaults to LLM_BACKEND")
+    parser.add_argument("--no-save", action="store_true", help="do not write results to the conversation store")
+    parser.add_argument("--checkpoints", action="store_true", help="checkpoint every answer to the session store")
+    parser.add_argument("--report", help="write the JSON report here instead of stdout")
+    parser.add_argument("--summary", action="store_true", help="leave per-session results out of the report")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        scripts = synthetic_scripts(args.synthetic, [tech.strip() for tech in args.techs.split(",") if tech.strip()])
+    elif args.scripts:
+        scripts = load_scripts(args.scripts)
+    else:
+        parser.error("give a scripts file or --synthetic N")
+
+    report = run_scripts(scripts, workers=args.workers, backend=args.backend, save=not args.no_save, checkpoints=args.checkpoints)
+    if args.summary:
+        report.pop("results")
+    output = json.dumps(report, indent=4)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    if report["failures"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
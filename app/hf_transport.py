@@ -0,0 +1,261 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (hf_token, HF_API_URL, HF_POOL_SIZE, HF_TIMEOUT, HF_RATE_LIMIT, HF_RATE_BURST, HF_MAX_RETRIES,
+                    HF_RETRY_BASE, HF_RETRY_MAX, HF_HEDGE_AFTER_MS, HF_BREAKER_FAILURES, HF_BREAKER_RESET)
+from metrics import annotate, registry, span
+from resources import cached_resource
+
+# One HTTP client per endpoint for every session in the process:
+#
+#   - a keep-alive requests.Session with HF_POOL_SIZE pooled connections
+#   - a token bucket (HF_RATE_LIMIT requests/s, bursts of HF_RATE_BURST) in front of every attempt
+#   - retries on 429, 5xx and connection errors with jittered exponential backoff, honouring
+#     Retry-After and the "estimated_time" the Inference API sends while a model loads
+#   - a hedged second request when the first has not answered after HF_HEDGE_AFTER_MS,
+#     sent only if the bucket has a token to spare, so hedging never adds to a rate limit
+#   - a circuit breaker that opens after HF_BREAKER_FAILURES consecutive failed attempts and
+#     fails calls at once for HF_BREAKER_RESET seconds, then lets one trial request through
+#
+# Failures surface as TransportError; callers fall back to cached or question bank
+# output (see tech_questions.py). stub_model_server.py can inject 429s, 503s and
+# slow responses to exercise all of this locally.
+
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class TransportError(RuntimeError):
+    pass
+
+
+class CircuitOpenError(TransportError):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self):
+        # Blocks until a token is available; returns the seconds spent waiting
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """closed -> open after ``failures`` consecutive failures -> half-open after ``reset_timeout``."""
+
+    def __init__(self, failures, reset_timeout):
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._trial_running = False
+            if self.state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._consecutive = 0
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive += 1
+            if self.state == "half_open" or (self.failures and self._consecutive >= self.failures):
+                if self.state != "open":
+                    self._opened_at = time.monotonic()
+                self.state = "open"
+                self._trial_running = False
+
+
+class HFTransport:
+    """Pooled, rate-limited, retrying HTTP client for one inference endpoint.
+
+    Calling it like langchain's InferenceApi client, ``transport(inputs=..., params=...)``,
+    returns the decoded JSON response, so it can stand in for HuggingFaceHub.client.
+    """
+
+    def __init__(self, url=HF_API_URL, token=hf_token, pool_size=HF_POOL_SIZE, timeout=HF_TIMEOUT,
+                 rate=HF_RATE_LIMIT, burst=HF_RATE_BURST, max_retries=HF_MAX_RETRIES, retry_base=HF_RETRY_BASE,
+                 retry_max=HF_RETRY_MAX, hedge_after_ms=HF_HEDGE_AFTER_MS, breaker_failures=HF_BREAKER_FAILURES,
+                 breaker_reset=HF_BREAKER_RESET):
+        self.url = url
+        self.timeout = (min(5.0, timeout), timeout)
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.hedge_after = hedge_after_ms / 1000.0
+        self.limiter = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(breaker_failures, breaker_reset)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="hf-transport") if self.hedge_after else None
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "attempts": 0, "retries": 0, "failures": 0, "short_circuited": 0,
+                      "hedged": 0, "hedge_wins": 0, "rate_limited_seconds": 0.0}
+
+    def __call__(self, inputs, params=None, options=None):
+        payload = {"inputs": inputs, "parameters": params or {}}
+        if options:
+            payload["options"] = options
+        return self.request(payload).json()
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def request(self, payload, stream=False):
+        # Streaming responses are retried until the response starts, never hedged; the caller closes them
+        self._count("requests")
+        failure = None
+        with span("hf_request", stream=str(stream).lower()):
+            for attempt in range(self.max_retries + 1):
+                if not self.breaker.allow():
+                    self._count("short_circuited")
+                    annotate(outcome="short_circuited")
+                    raise CircuitOpenError(f"Circuit open for {self.url} after repeated failures") from failure
+                waited = self.limiter.acquire()
+                if waited:
+                    self._count("rate_limited_seconds", waited)
+                self._count("attempts")
+                try:
+                    response = self._post(payload, stream=True) if stream else self._send(payload)
+                except requests.RequestException as error:
+                    failure, delay = error, self._backoff(attempt)
+                else:
+                    if response.status_code < 400:
+                        self.breaker.record_success()
+                        annotate(attempts=attempt + 1, outcome="ok")
+                        return response
+                    if response.status_code not in RETRY_STATUSES:
+                        # The service is up; the request itself is wrong
+                        self.breaker.record_success()
+                        annotate(attempts=attempt + 1, outcome=f"http_{response.status_code}")
+                        raise TransportError(f"HTTP {response.status_code} from {self.url}: {response.text[:200]}")
+                    failure = TransportError(f"HTTP {response.status_code} from {self.url}: {response.text[:200]}")
+                    delay = self._retry_delay(response, attempt)
+                    response.close()
+                self.breaker.record_failure()
+                if attempt < self.max_retries:
+                    self._count("retries")
+                    time.sleep(delay)
+            self._count("failures")
+            annotate(attempts=self.max_retries + 1, outcome="failed")
+            raise TransportError(f"{self.url} failed after {self.max_retries + 1} attempts: {failure}") from failure
+
+    def _post(self, payload, stream=False):
+        return self.session.post(self.url, json=payload, timeout=self.timeout, stream=stream)
+
+    def _send(self, payload):
+        if self._executor is None:
+            return self._post(payload)
+        primary = self._executor.submit(self._post, payload)
+        try:
+            return primary.result(timeout=self.hedge_after)
+        except FutureTimeout:
+            pass
+        if not self.limiter.try_acquire():
+            return primary.result()
+        self._count("hedged")
+        annotate(hedged=True)
+        hedge = self._executor.submit(self._post, payload)
+        done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        first = done.pop()
+        other = hedge if first is primary else primary
+        try:
+            response = first.result()
+        except requests.RequestException:
+            return other.result()
+        if first is hedge:
+            self._count("hedge_wins")
+        return response
+
+    def _backoff(self, attempt):
+        # Full jitter: anywhere between 0 and the exponential cap
+        return random.uniform(0, min(self.retry_max, self.retry_base * 2 ** attempt))
+
+    def _retry_delay(self, response, attempt):
+        delay = self._backoff(attempt)
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        elif response.status_code == 503:
+            try:
+                delay = max(delay, float(response.json().get("estimated_time", 0)))
+            except (ValueError, AttributeError):
+                pass
+        return min(delay, self.retry_max)
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats["breaker_open"] = int(self.breaker.state != "closed")
+        return stats
+
+
+_transport_names = {}
+
+
+@cached_resource
+def get_transport(url=HF_API_URL, authenticated=True):
+    # Shared by the hub LLM, the streaming backend and every session talking to the same endpoint.
+    # The token is read here rather than passed in, so it never becomes part of the resource key
+    # that resources.startup_report() prints.
+    transport = HFTransport(url, hf_token if authenticated else None)
+    name = _transport_names.setdefault(url, f"hf_transport_{len(_transport_names)}")
+    registry.add_collector(lambda: {f"{name}_{key}": value for key, value in transport.metrics().items()})
+    return transport
@@ -0,0 +1,98 @@
+import re
+
+from config import CONTEXT_TOKEN_BUDGET, CONTEXT_WINDOW_TURNS, ANSWER_TOKEN_BUDGET
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text):
+    # Cheap stand-in for the flan-t5 sentencepiece tokenizer: words and
+    # punctuation marks, which tracks it closely enough for budgeting.
+    return len(_TOKEN_RE.findall(text))
+
+
+def truncate_tokens(text, max_tokens):
+    tokens = list(_TOKEN_RE.finditer(text))
+    if len(tokens) <= max_tokens:
+        return text
+    return text[: tokens[max_tokens - 1].end()] + " ..."
+
+
+def format_turn(turn, answer_budget=ANSWER_TOKEN_BUDGET):
+    return f"Q: {turn['question']} A: {truncate_tokens(turn['answer'], answer_budget)}"
+
+
+def shorten_turn(turn, max_tokens=12):
+    # Not a model summary: the opening tokens of the question and the answer, which is
+    # usually enough to say what was covered
+    return f"Q: {truncate_tokens(turn['question'], max_tokens)} A: {truncate_tokens(turn['answer'], max_tokens)}"
+
+
+class InterviewContext:
+    """Bounded prompt context for one interview.
+
+    The last ``window_turns`` answered turns are kept, each answer cut to
+    ANSWER_TOKEN_BUDGET tokens; older turns are shortened once, when they
+    leave the window, to a one-line summary, and the joined summary
+    is cached until it changes. render() never returns more than
+    ``token_budget`` tokens, so the prompt stays under flan-t5's 512-token
+    input no matter how long the interview runs. One instance lives in each
+    session's st.session_state, so no history is shared between candidates.
+    """
+
+    def __init__(self, token_budget=CONTEXT_TOKEN_BUDGET, window_turns=CONTEXT_WINDOW_TURNS, summarizer=shorten_turn):
+        self.token_budget = token_budget
+        self.window_turns = window_turns
+        self.summarizer = summarizer
+        self.window = []
+        self.summary = []
+        self.summary_text = ""
+        self.summary_tokens = 0
+        self.omitted = 0
+        self.absorbed = 0
+
+    def update(self, history):
+        # history only ever grows, so turns before self.absorbed are never looked at again
+        while self.absorbed < len(history) and history[self.absorbed]["answer"]:
+            turn = history[self.absorbed]
+            line = format_turn(turn)
+            self.window.append((turn, line, count_tokens(line)))
+            self.absorbed += 1
+            if len(self.window) > self.window_turns:
+                self._roll_oldest()
+
+    def render(self, history, query=None, profile=None):
+        # query and profile are for retrieval_context.RetrievalContext; the window ignores them
+        self.update(history)
+        pending = [f"Q: {turn['question']} A:" for turn in history[self.absorbed:]]
+        pending_tokens = sum(count_tokens(line) for line in pending)
+
+        # Older verbatim turns give way to summaries, and old summaries are dropped, until everything fits
+        while self.window and self._window_tokens() + self.summary_tokens + pending_tokens > self.token_budget:
+            self._roll_oldest()
+        while self.summary and self.summary_tokens + self._window_tokens() + pending_tokens > self.token_budget:
+            self.summary.pop(0)
+            self.omitted += 1
+            self._refresh_summary()
+
+        lines = []
+        if self.summary_text:
+            lines.append(self.summary_text)
+        lines.extend(line for _, line, _ in self.window)
+        lines.extend(pending)
+        return truncate_tokens("\n".join(lines), self.token_budget)
+
+    def _window_tokens(self):
+        return sum(tokens for _, _, tokens in self.window)
+
+    def _roll_oldest(self):
+        turn, _, _ = self.window.pop(0)
+        self.summary.append(self.summarizer(turn))
+        self._refresh_summary()
+
+    def _refresh_summary(self):
+        lines = list(self.summary)
+        if self.omitted:
+            lines.insert(0, f"({self.omitted} earlier turns omitted)")
+        self.summary_text = "Earlier: " + " | ".join(lines) if lines else ""
+        self.summary_tokens = count_tokens(self.summary_text)
@@ -0,0 +1,264 @@
+import time
+
+from config import PREFETCH_ENABLED, ANSWER_TOKEN_BUDGET, DEDUP_ENABLED
+from end_intent import detect_end_intent
+from interview_context import truncate_tokens
+from interview_scheduler import FOLLOW_UP, MAIN, InterviewScheduler
+from prefetch import get_prefetcher
+from question_dedup import SessionQuestions, get_question_deduplicator
+from retrieval_context import make_interview_context
+from conversation_store import get_conversation_store
+from candidate_index import get_candidate_index
+from session_store import load_session, save_session
+from tech_catalog import split_tech_stack
+from tech_questions import generate_follow_up, generate_tech_question, is_repeat
+
+# The interview as a plain state machine, with no Streamlit in it. main.py keeps
+# one InterviewSession per browser session and only draws it; headless_runner.py
+# drives the same object from scripted answers.
+
+PROFILE = "profile"
+TECH = "tech"
+DONE = "done"
+
+
+def detect_conversation_end(response):
+    # Whole-message intent, not any occurrence of "end": see end_intent.py
+    return detect_end_intent(response)
+
+
+def parse_tech_stack(answer):
+    # Canonical technology ids, deduplicated and capped at TECH_STACK_LIMIT
+    return split_tech_stack(answer)
+
+
+class InterviewSession:
+    """Profile questions, then the technical questions planned by interview_scheduler.
+
+    pending_question() asks (generating if needed) and submit() records the
+    answer and advances, so a caller alternates the two until phase is DONE.
+    current_index points into plan, which the scheduler revises after every
+    technical answer.
+    """
+
+    def __init__(self, profile_engine, question_chain=None, prefetcher=None, scheduler=None):
+        self.profile_engine = profile_engine
+        self.question_chain = question_chain
+        self.prefetcher = prefetcher
+        self.name = None
+        self.conversation_history = []
+        self.question_index = 0
+        self.tech_stacks = None
+        self.conversation_history2 = []
+        self.current_index = 0
+        self.scheduler = scheduler or InterviewScheduler()
+        self.plan = []
+        self.tech_started_at = None
+        self.interview_context = make_interview_context()
+        self.question_timings = []
+        self.prefetched = {}
+        self.asked = SessionQuestions()
+        self.saved_record_id = None
+
+    # Compact, JSON-safe snapshot for session_store. The prompt context is rebuilt
+    # from the history on the next render and pending prefetches are dropped.
+    # Version 1 checkpoints (one question per technology, no plan) still load.
+    STATE_VERSION = 2
+
+    def to_state(self):
+        return {
+            "v": self.STATE_VERSION,
+            "n": self.name,
+            "p": [[qa["question"], qa["answer"]] for qa in self.conversation_history],
+            "qi": self.question_index,
+            "ts": self.tech_stacks,
+            "t": [[qa["question"], qa["answer"]] for qa in self.conversation_history2],
+            "ci": self.current_index,
+            "pl": [[slot["tech"], slot["kind"], slot["id"]] for slot in self.plan],
+            "st": self.tech_started_at,
+            "r": self.saved_record_id,
+        }
+
+    @classmethod
+    def from_state(cls, state, profile_engine, question_chain=None, prefetcher=None):
+        if state.get("v") not in (1, cls.STATE_VERSION):
+            raise ValueError(f"unsupported session state version {state.get('v')!r}")
+        session = cls(profile_engine, question_chain, prefetcher)
+        session.name = state["n"]
+        session.conversation_history = [{"question": q, "answer": a} for q, a in state["p"]]
+        session.question_index = state["qi"]
+        session.tech_stacks = state["ts"]
+        session.conversation_history2 = [{"question": q, "answer": a} for q, a in state["t"]]
+        session.current_index = state["ci"]
+        if state["v"] == 1:
+            session.plan = [{"tech": tech, "kind": MAIN, "id": i} for i, tech in enumerate(state["ts"] or [])]
+        else:
+            session.plan = [{"tech": tech, "kind": kind, "id": slot_id} for tech, kind, slot_id in state["pl"]]
+            session.tech_started_at = state["st"]
+        session.saved_record_id = state["r"]
+        return session
+
+    @property
+    def phase(self):
+        if self.question_index < len(self.profile_engine):
+            return PROFILE
+        if self.plan and self.current_index < len(self.plan):
+            return TECH
+        return DONE
+
+    @property
+    def profile_complete(self):
+        return self.question_index >= len(self.profile_engine)
+
+    def pending_question(self, on_token=None):
+        # Returns the unanswered question, asking the next one first if the last was answered
+        if self.phase == PROFILE:
+            if not self.conversation_history or self.conversation_history[-1]["answer"]:
+                question = self.profile_engine.get_question(self.question_index + 1)
+                self.conversation_history.append({"question": question, "answer": ""})
+        elif self.phase == TECH:
+            while self.phase == TECH and (not self.conversation_history2 or self.conversation_history2[-1]["answer"]):
+                question = self._next_tech_question(on_token)
+                if question is None:
+                    # Every candidate question for this slot repeats an earlier one; skip the slot
+                    self.current_index += 1
+                    continue
+                self.conversation_history2.append({"question": question, "answer": ""})
+            if self.phase == TECH:
+                self._prefetch_ahead()
+        history = self.conversation_history if self.phase == PROFILE else self.conversation_history2
+        if history and history[-1]["answer"] == "":
+            return history[-1]["question"]
+        return None
+
+    def _previous_answer(self):
+        if not self.conversation_history2:
+            return ""
+        return truncate_tokens(self.conversation_history2[-1]["answer"], ANSWER_TOKEN_BUDGET)
+
+    def _asked(self):
+        # The technical history only grows, so only questions added since the last call are embedded
+        for item in self.conversation_history2[len(self.asked):]:
+            self.asked.append(item["question"])
+        return self.asked
+
+    def _profile_answer(self, key):
+        for step, qa in zip(self.profile_engine.steps, self.conversation_history):
+            if step["key"] == key:
+                return qa["answer"]
+        return ""
+
+    def _context(self, tech):
+        # Prompt context for the question about tech; with CONTEXT_MODE=retrieval, the profile
+        # lines and earlier answers most relevant to it
+        profile = {step["label"]: qa["answer"] for step, qa in zip(self.profile_engine.steps, self.conversation_history)}
+        return self.interview_context.render(self.conversation_history2, query=tech, profile=profile)
+
+    def _next_tech_question(self, on_token=None):
+        slot = self.plan[self.current_index]
+        previous_answer = self._previous_answer()
+        if slot["kind"] == FOLLOW_UP:
+            last = self.conversation_history2[-1]
+            return generate_follow_up(
+                self.question_chain,
+                slot["tech"],
+                last["question"],
+                previous_answer,
+                self._context(slot["tech"]),
+                asked=self._asked(),
+                on_token=on_token,
+                timings=self.question_timings,
+            )
+        # Use the question prefetched while the candidate was typing, unless their answer changed the context
+        question = None
+        if self.prefetcher is not None:
+            question = self.prefetcher.reconcile(self.prefetched.pop(slot["id"], None), slot["id"], previous_answer)
+            # Generated before the questions asked since, so it may repeat one of them
+            if question is not None and is_repeat(question, self._asked(), get_question_deduplicator() if DEDUP_ENABLED else None):
+                question = None
+        if question is None:
+            question = generate_tech_question(
+                self.question_chain,
+                slot["tech"],
+                previous_answer,
+                self._context(slot["tech"]),
+                asked=self._asked(),
+                on_token=on_token,
+                timings=self.question_timings,
+            )
+        return question
+
+    def _prefetch_ahead(self):
+        # Start on the next planned questions as soon as this one is on screen. Prefetches are
+        # keyed by slot id, so they survive the scheduler inserting or dropping slots around them.
+        if self.prefetcher is None:
+            return
+        for slot in self.scheduler.ahead(self.plan, self.current_index):
+            if slot["id"] in self.prefetched:
+                continue
+            self.prefetched[slot["id"]] = self.prefetcher.prefetch(
+                self.question_chain,
+                slot["id"],
+                slot["tech"],
+                self._context(slot["tech"]),
+                asked=self._asked(),
+            )
+
+    def submit(self, answer):
+        phase = self.phase
+        if phase == PROFILE:
+            self.conversation_history[-1]["answer"] = answer.strip()
+            if answer and self.question_index == 0:
+                self.name = answer
+            self.question_index += 1
+            if self.profile_complete and self.tech_stacks is None:
+                self.tech_stacks = parse_tech_stack(self.conversation_history[-1]["answer"])
+                self.plan = self.scheduler.plan(self.tech_stacks, self._profile_answer("position"))
+                self.tech_started_at = time.time()
+        elif phase == TECH:
+            self.conversation_history2[-1]["answer"] = answer
+            if detect_conversation_end(answer):
+                self.current_index = 1000
+            else:
+                # Wall-clock time, so the budget holds across workers and resumed sessions
+                elapsed = time.time() - self.tech_started_at if self.tech_started_at else 0.0
+                self.plan = self.scheduler.revise(self.plan, self.current_index, answer, elapsed)
+                self.current_index += 1
+                planned = {slot["id"] for slot in self.plan}
+                for slot_id in [slot_id for slot_id in self.prefetched if slot_id not in planned]:
+                    self.prefetched.pop(slot_id)["future"].cancel()
+        return self.phase
+
+    def record(self):
+        return {
+            "candidate_name": self.name,
+            "candidate_profile": self.conversation_history,
+            "technical_questions_conersation": self.conversation_history2,
+        }
+
+
+def new_session(profile_engine, question_chain=None):
+    return InterviewSession(profile_engine, question_chain, get_prefetcher() if PREFETCH_ENABLED else None)
+
+
+def resume_session(session_id, profile_engine, question_chain=None):
+    # None if the store has no (or an unreadable) checkpoint for session_id
+    prefetcher = get_prefetcher() if PREFETCH_ENABLED else None
+    return load_session(
+        session_id,
+        lambda state: InterviewSession.from_state(state, profile_engine, question_chain, prefetcher),
+    )
+
+
+def checkpoint(session_id, session):
+    save_session(session_id, session)
+
+
+def save_interview(session, wait=False):
+    # Appended once per session (a resumed session remembers it was saved). Attaches the
+    # candidate search index, which indexes each record as it is committed. The store
+    # writes the record on a background thread unless wait is set.
+    if session.saved_record_id is None:
+        get_candidate_index()
+        session.saved_record_id = get_conversation_store().append(session.record(), wait=wait)
+    return session.saved_record_id
@@ -0,0 +1,157 @@
+import re
+
+from config import (DEDUP_MAX_RETRIES, SCHEDULE_MAX_QUESTIONS, SCHEDULE_MIN_QUESTIONS, SCHEDULE_FOLLOW_UPS,
+                    SCHEDULE_TIME_BUDGET, SCHEDULE_QUESTION_SECONDS, SCHEDULE_WEAK_ANSWER_WORDS, SCHEDULE_PIPELINE_DEPTH)
+from tech_catalog import normalize_name, tech_display_name
+
+# Plans the technical part of an interview as a list of slots, one per question:
+#
+#     {"tech": "python", "kind": "main" | "follow_up", "id": 3}
+#
+# plan() ranks the candidate's technologies by relevance to the position they
+# applied for and fills at most capacity() slots, cycling through the stack when
+# it is short so a one-technology candidate still gets several questions, and
+# leaving SCHEDULE_FOLLOW_UPS slots spare. After each answer, revise() inserts a
+# follow-up on the same technology when the answer was weak (the follow-up takes
+# the place of the least relevant main question still pending) and drops pending
+# slots from the end when the time already spent says the rest will not fit in
+# SCHEDULE_TIME_BUDGET. The number of questions, and with it the number of
+# generations per candidate, is bounded by capacity().
+
+MAIN = "main"
+FOLLOW_UP = "follow_up"
+
+# Position keywords and the technologies that matter for them
+ROLE_TECHS = {
+    ("backend", "back end", "back-end", "server", "api"): {
+        "python", "java", "go", "node.js", "c#", ".net", "ruby", "rails", "php", "laravel", "django", "flask",
+        "fastapi", "spring", "express", "rust", "scala", "sql", "postgresql", "mysql", "mongodb", "redis",
+        "elasticsearch", "kafka", "rest", "graphql", "docker", "kubernetes",
+    },
+    ("frontend", "front end", "front-end", "ui", "web"): {
+        "javascript", "typescript", "react", "angular", "vue", "next.js", "html", "css", "sass", "tailwind",
+        "graphql", "rest", "figma",
+    },
+    ("full stack", "fullstack", "full-stack"): {
+        "javascript", "typescript", "react", "angular", "vue", "next.js", "node.js", "express", "html", "css",
+        "python", "django", "flask", "java", "spring", "rails", "php", "laravel", "sql", "postgresql", "mysql",
+        "mongodb", "rest", "graphql", "docker",
+    },
+    ("data engineer", "data engineering", "etl", "big data"): {
+        "python", "sql", "scala", "java", "spark", "hadoop", "kafka", "pandas", "postgresql", "mysql", "mongodb",
+        "elasticsearch", "aws", "gcp", "azure", "docker",
+    },
+    ("data scientist", "data science", "machine learning", "ml", "ai", "nlp", "deep learning", "research"): {
+        "python", "r", "sql", "pandas", "numpy", "scikit-learn", "tensorflow", "keras", "pytorch",
+        "machine learning", "deep learning", "nlp", "langchain", "spark",
+    },
+    ("analyst", "analytics", "bi", "business intelligence"): {
+        "sql", "excel", "power bi", "tableau", "python", "pandas", "r",
+    },
+    ("devops", "sre", "site reliability", "platform", "infrastructure", "cloud"): {
+        "docker", "kubernetes", "terraform", "ansible", "jenkins", "ci/cd", "linux", "git", "aws", "gcp", "azure",
+        "python", "go",
+    },
+    ("mobile", "android", "ios", "app developer"): {
+        "kotlin", "swift", "java", "dart", "flutter", "react native", "android", "ios",
+    },
+    ("qa", "test", "tester", "testing", "quality"): {
+        "selenium", "python", "java", "javascript", "ci/cd", "jenkins",
+    },
+}
+
+# Answers that admit the candidate does not know, whatever their length
+_WEAK_PHRASES = re.compile(
+    r"\b(i don'?t know|i do not know|not sure|no idea|never used|haven'?t used|have not used|"
+    r"don'?t remember|can'?t remember|no experience|not familiar)\b"
+)
+
+
+def _matches(keyword, text):
+    return re.search(rf"(?<![a-z0-9]){re.escape(keyword)}(?![a-z0-9])", text) is not None
+
+
+class InterviewScheduler:
+    """Builds and revises the question plan for one technical interview."""
+
+    def __init__(self, max_questions=SCHEDULE_MAX_QUESTIONS, min_questions=SCHEDULE_MIN_QUESTIONS,
+                 follow_ups=SCHEDULE_FOLLOW_UPS, time_budget=SCHEDULE_TIME_BUDGET,
+                 question_seconds=SCHEDULE_QUESTION_SECONDS, weak_answer_words=SCHEDULE_WEAK_ANSWER_WORDS,
+                 pipeline_depth=SCHEDULE_PIPELINE_DEPTH):
+        self.max_questions = max(1, max_questions)
+        self.min_questions = min_questions
+        self.follow_ups = max(0, follow_ups)
+        self.time_budget = time_budget
+        self.question_seconds = question_seconds
+        self.weak_answer_words = weak_answer_words
+        self.pipeline_depth = max(0, pipeline_depth)
+
+    def capacity(self):
+        # Questions that fit the interview, counting follow-ups
+        if self.time_budget > 0 and self.question_seconds > 0:
+            return max(1, min(self.max_questions, int(self.time_budget // self.question_seconds)))
+        return self.max_questions
+
+    def max_generations(self):
+        # Upper bound on question generations per candidate: each slot is a bank draw or one
+        # generation plus DEDUP_MAX_RETRIES, and may be generated twice if its prefetch is discarded
+        return 2 * self.capacity() * (1 + DEDUP_MAX_RETRIES)
+
+    def relevance(self, tech, position):
+        position = normalize_name(position or "")
+        if not position:
+            return 0
+        score = 2 * any(_matches(name, position) for name in {tech, normalize_name(tech_display_name(tech))})
+        for keywords, techs in ROLE_TECHS.items():
+            if tech in techs and any(_matches(keyword, position) for keyword in keywords):
+                score += 1
+        return score
+
+    def rank(self, techs, position):
+        # Most relevant first; ties keep the order the candidate listed them in
+        return sorted(techs, key=lambda tech: -self.relevance(tech, position))
+
+    def plan(self, techs, position=""):
+        if not techs:
+            return []
+        ranked = self.rank(techs, position)
+        main_slots = max(1, self.capacity() - self.follow_ups)
+        count = min(main_slots, max(len(ranked), self.min_questions))
+        return [{"tech": ranked[i % len(ranked)], "kind": MAIN, "id": i} for i in range(count)]
+
+    def is_weak(self, answer):
+        answer = (answer or "").strip().lower()
+        return len(answer.split()) < self.weak_answer_words or _WEAK_PHRASES.search(answer) is not None
+
+    def revise(self, plan, index, answer, elapsed=0.0):
+        # plan[index] was just answered; returns the plan for the rest of the interview
+        plan = list(plan)
+        slot = plan[index]
+        follow_ups = sum(1 for item in plan if item["kind"] == FOLLOW_UP)
+        if slot["kind"] == MAIN and follow_ups < self.follow_ups and self.is_weak(answer):
+            plan.insert(index + 1, {"tech": slot["tech"], "kind": FOLLOW_UP, "id": max(item["id"] for item in plan) + 1})
+            if len(plan) > self.capacity():
+                pending_main = [i for i in range(index + 2, len(plan)) if plan[i]["kind"] == MAIN]
+                if pending_main:
+                    del plan[pending_main[-1]]
+        if self.time_budget > 0 and elapsed > 0:
+            # Questions still to come at the pace the candidate has kept so far
+            remaining = self.time_budget - elapsed
+            per_question = elapsed / (index + 1)
+            fits = int(remaining // per_question) if remaining > 0 else 0
+            del plan[index + 1 + fits:]
+        return plan
+
+    def ahead(self, plan, index):
+        # Pending main slots to generate while the candidate answers plan[index]. A technology is
+        # generated ahead at most once, and never while a question about it is on screen, because
+        # questions on the same technology have to see each other to avoid repeats. Follow-ups
+        # depend on the answer they follow, so they are never generated ahead.
+        busy = {plan[index]["tech"]} if index < len(plan) else set()
+        slots = []
+        for slot in plan[index + 1:index + 1 + self.pipeline_depth]:
+            if slot["kind"] != MAIN or slot["tech"] in busy:
+                break
+            busy.add(slot["tech"])
+            slots.append(slot)
+        return slots
@@ -0,0 +1,138 @@
+import threading
+
+from metrics import registry
+
+from config import (
+    LLM_BACKEND,
+    LLM_MODEL_ID,
+    LLM_TEMPERATURE,
+    LLM_MAX_LENGTH,
+    LOCAL_LLM_THREADS,
+    LOCAL_LLM_QUANTIZE,
+    LLM_BATCHING,
+    LLM_BATCH_SIZE,
+    LLM_BATCH_WAIT_MS,
+)
+
+
+def build_hub_llm():
+    # Same model and parameters as langchain's HuggingFaceHub (so cache keys are unchanged), but
+    # requests go through the shared pooled, rate-limited, retrying transport in hf_transport.py
+    from typing import Any, Mapping, Optional
+
+    from langchain.llms.base import LLM
+    from langchain.llms.utils import enforce_stop_tokens
+    from hf_transport import TransportError, get_transport
+
+    class HubTransportLLM(LLM):
+        client: Any
+        repo_id: str
+        task: str = "text2text-generation"
+        model_kwargs: Optional[dict] = None
+
+        @property
+        def _llm_type(self) -> str:
+            return "huggingface_hub"
+
+        @property
+        def _identifying_params(self) -> Mapping[str, Any]:
+            return {"repo_id": self.repo_id, "task": self.task, "model_kwargs": self.model_kwargs or {}}
+
+        def _call(self, prompt, stop=None, run_manager=None):
+            response = self.client(inputs=prompt, params=self.model_kwargs or {})
+            if isinstance(response, dict) and "error" in response:
+                raise TransportError(f"Error raised by inference API: {response['error']}")
+            text = (response[0] if isinstance(response, list) else response)["generated_text"]
+            return enforce_stop_tokens(text, stop) if stop else text
+
+    return HubTransportLLM(
+        client=get_transport(),
+        repo_id=LLM_MODEL_ID,
+        model_kwargs={"temperature": LLM_TEMPERATURE, "max_length": LLM_MAX_LENGTH},
+    )
+
+
+def build_local_llm():
+    # Runs flan-t5 in-process on CPU. Dynamic int8 quantization of the Linear
+    # layers roughly halves memory and speeds up generation with little
+    # quality loss on a model this size.
+    import torch
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+    from langchain.llms import HuggingFacePipeline
+
+    if LOCAL_LLM_THREADS:
+        torch.set_num_threads(LOCAL_LLM_THREADS)
+    tokenizer = AutoTokenizer.from_pretrained(LLM_MODEL_ID)
+    model = AutoModelForSeq2SeqLM.from_pretrained(LLM_MODEL_ID)
+    if LOCAL_LLM_QUANTIZE:
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    model.eval()
+
+    pipeline_kwargs = {"max_length": LLM_MAX_LENGTH}
+    if LLM_TEMPERATURE > 0:
+        pipeline_kwargs.update(do_sample=True, temperature=LLM_TEMPERATURE)
+    pipe = pipeline("text2text-generation", model=model, tokenizer=tokenizer, device=-1, **pipeline_kwargs)
+    return HuggingFacePipeline(
+        pipeline=pipe,
+        model_id=LLM_MODEL_ID,
+        model_kwargs={"quantized": LOCAL_LLM_QUANTIZE},
+        pipeline_kwargs=pipeline_kwargs,
+    )
+
+
+def build_stub_llm():
+    # Deterministic in-process model for headless and load runs; answers like stub_model_server
+    from langchain.llms.base import LLM
+    from stub_model_server import stub_completion
+
+    class StubLLM(LLM):
+        @property
+        def _llm_type(self):
+            return "stub"
+
+        def _call(self, prompt, stop=None, run_manager=None):
+            return stub_completion(prompt)
+
+    return StubLLM()
+
+
+BACKENDS = {
+    "hub": build_hub_llm,
+    "local": build_local_llm,
+    "stub": build_stub_llm,
+}
+
+_llms = {}
+_batched_llms = {}
+_llms_lock = threading.Lock()
+
+
+def _get_raw_llm(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown LLM_BACKEND {backend!r}, expected one of {sorted(BACKENDS)}")
+    if backend not in _llms:
+        _llms[backend] = BACKENDS[backend]()
+    return _llms[backend]
+
+
+def get_llm(backend=None, batched=None):
+    # One model per backend per process, shared by every Streamlit session and rerun.
+    # With LLM_BATCHING, concurrent calls from all sessions are merged into micro-batches.
+    backend = backend or LLM_BACKEND
+    batched = LLM_BATCHING if batched is None else batched
+    with _llms_lock:
+        llm = _get_raw_llm(backend)
+        if not batched:
+            return llm
+        if backend not in _batched_llms:
+            from batching import BatchedLLM, MicroBatcher, batch_generate_fn
+
+            batcher = MicroBatcher(batch_generate_fn(llm), max_batch_size=LLM_BATCH_SIZE, max_wait_ms=LLM_BATCH_WAIT_MS)
+            _batched_llms[backend] = BatchedLLM(llm=llm, batcher=batcher)
+            registry.add_collector(lambda: {f"llm_batcher_{backend}_{name}": value for name, value in batcher.metrics().items()})
+        return _batched_llms[backend]
+
+
+def get_batcher_metrics():
+    with _llms_lock:
+        return {backend: llm.batcher.metrics() for backend, llm in _batched_llms.items()}
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import langchain
+from langchain.cache import BaseCache
+from langchain.schema import Generation
+
+from metrics import annotate, registry
+from config import LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MEMORY_ENTRIES, LLM_CACHE_DISK_ENTRIES
+
+
+def cache_key(prompt, llm_string):
+    # llm_string is langchain's serialization of the model params (repo_id,
+    # model_kwargs, stop, ...), so identical prompts against a different model
+    # or temperature never collide.
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class TieredLLMCache(BaseCache):
+    """Content-addressed LLM response cache.
+
+    An in-process LRU sits in front of a SQLite table, both bounded in size
+    and expiring entries after ``ttl`` seconds. Installed as
+    ``langchain.llm_cache`` it covers every chain that runs on a langchain LLM.
+    """
+
+    def __init__(self, path, ttl=LLM_CACHE_TTL, max_memory_entries=LLM_CACHE_MEMORY_ENTRIES,
+                 max_disk_entries=LLM_CACHE_DISK_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "updates": 0, "evictions": 0}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, generations TEXT NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_access ON llm_cache (last_access)")
+        self._db.commit()
+
+    def _expired(self, created_at, now):
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def lookup(self, prompt, llm_string):
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, texts = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    annotate(cache="memory")
+                    return [Generation(text=text) for text in texts]
+                del self._memory[key]
+
+            row = self._db.execute(
+                "SELECT generations, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or self._expired(row[1], now):
+                self.stats["misses"] += 1
+                annotate(cache="miss")
+                return None
+            texts = json.loads(row[0])
+            self._db.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self._remember(key, row[1], texts)
+            self.stats["disk_hits"] += 1
+            annotate(cache="disk")
+            return [Generation(text=text) for text in texts]
+
+    def update(self, prompt, llm_string, return_val):
+        key = cache_key(prompt, llm_string)
+        texts = [generation.text for generation in return_val]
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, texts)
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, generations, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(texts), now, now),
+            )
+            self._db.commit()
+            self.stats["updates"] += 1
+            self._writes_since_evict += 1
+            # Counting rows on every write is wasteful; trim the table in batches.
+            if self._writes_since_evict >= 64:
+                self._evict_disk(now)
+
+    def clear(self, **kwargs):
+        with self._lock:
+            self._memory.clear()
+            self._db.execute("DELETE FROM llm_cache")
+            self._db.commit()
+
+    def _remember(self, key, created_at, texts):
+        self._memory[key] = (created_at, texts)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _evict_disk(self, now):
+        self._writes_since_evict = 0
+        if self.ttl is not None:
+            self._db.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_access LIMIT ?)",
+                (overflow,),
+            )
+            self.stats["evictions"] += overflow
+        self._db.commit()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def install_llm_cache():
+    # One cache per process: Streamlit reruns and all sessions share it.
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = TieredLLMCache(LLM_CACHE_PATH)
+            registry.add_collector(lambda: {f"llm_cache_{name}": value for name, value in _cache.stats.items()})
+        langchain.llm_cache = _cache
+        return _cache
+
+
+def _llm_string(llm, stop=None):
+    # Same serialization langchain uses for its cache keys
+    params = llm.dict()
+    params["stop"] = stop
+    return str(sorted(params.items()))
+
+
+def cached_text(llm, prompt, stop=None):
+    # What langchain would serve from the cache for this prompt and model, without calling the model
+    if langchain.llm_cache is None:
+        return None
+    generations = langchain.llm_cache.lookup(prompt, _llm_string(llm, stop))
+    return generations[0].text if generations else None
+
+
+def remember_text(llm, prompt, text, stop=None):
+    # Stores text as this model's answer to prompt, as if langchain had cached a call
+    if langchain.llm_cache is not None:
+        langchain.llm_cache.update(prompt, _llm_string(llm, stop), [Generation(text=text)])
@@ -0,0 +1,210 @@
+import bisect
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import METRICS_ENABLED, METRICS_SAMPLE_RATE, METRICS_PORT, METRICS_FILE, METRICS_FILE_INTERVAL
+
+# Spans around the hot paths (chain runs, vector store updates, saves, reruns)
+# aggregated into Prometheus-style histograms and counters. Code under a span
+# can attach attributes with annotate(): numbers become histograms
+# ("<span>_<attribute>"), strings become counters labelled with the value.
+# With METRICS_SAMPLE_RATE < 1 only that fraction of spans is recorded; an
+# unsampled span costs one random() call.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._histograms = {}
+        self._counters = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, labels=()):
+        key = (name, tuple(sorted(labels)))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(LATENCY_BUCKETS if name.endswith("_seconds") else SIZE_BUCKETS)
+            histogram.observe(value)
+
+    def increment(self, name, labels=(), amount=1):
+        key = (name, tuple(sorted(labels)))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def add_collector(self, collector):
+        # collector() returns {gauge_name: value}; it is called on every export
+        with self._lock:
+            self._collectors.append(collector)
+
+    def record_span(self, name, labels, duration, attributes):
+        labels = tuple(labels.items())
+        self.observe(f"{name}_seconds", duration, labels)
+        for key, value in attributes.items():
+            if isinstance(value, bool) or isinstance(value, str):
+                self.increment(f"{name}_{key}_total", labels + ((key, str(value).lower()),))
+            elif isinstance(value, (int, float)):
+                self.observe(f"{name}_{key}", value, labels)
+
+    def render(self):
+        with self._lock:
+            histograms = {key: (list(h.counts), h.sum, h.count, h.buckets) for key, h in self._histograms.items()}
+            counters = dict(self._counters)
+            collectors = list(self._collectors)
+
+        lines = []
+        typed = set()
+        for (name, labels), (counts, total, count, buckets) in sorted(histograms.items()):
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {total}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+        for (name, labels), value in sorted(counters.items()):
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for collector in collectors:
+            try:
+                gauges = collector()
+            except Exception:
+                continue
+            for name, value in sorted(gauges.items()):
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+registry = MetricsRegistry()
+_local = threading.local()
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+@contextmanager
+def span(name, **labels):
+    # Yields the span's attribute dict, or None when the span is not sampled
+    stack = _stack()
+    if not METRICS_ENABLED or (METRICS_SAMPLE_RATE < 1.0 and random.random() >= METRICS_SAMPLE_RATE):
+        stack.append(None)
+        try:
+            yield None
+        finally:
+            stack.pop()
+        return
+
+    attributes = {}
+    stack.append(attributes)
+    started = time.perf_counter()
+    try:
+        yield attributes
+    finally:
+        stack.pop()
+        registry.record_span(name, labels, time.perf_counter() - started, attributes)
+
+
+def annotate(**attributes):
+    # Adds to the innermost span on this thread; a no-op outside spans or in unsampled ones
+    stack = getattr(_local, "stack", None)
+    if stack and stack[-1] is not None:
+        stack[-1].update(attributes)
+
+
+def observe(name, value, **labels):
+    if METRICS_ENABLED:
+        registry.observe(name, value, tuple(labels.items()))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        data = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def write_metrics_file(path=METRICS_FILE):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(registry.render())
+    os.replace(tmp_path, path)
+
+
+def _write_periodically(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_metrics_file(path)
+        except OSError:
+            pass
+
+
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def start_exporter(port=METRICS_PORT, path=METRICS_FILE, interval=METRICS_FILE_INTERVAL):
+    # Once per process: GET http://127.0.0.1:<METRICS_PORT>/metrics and/or a file rewritten every interval seconds
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started or not METRICS_ENABLED:
+            return
+        _exporter_started = True
+    if port:
+        server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    if path:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        threading.Thread(target=_write_periodically, args=(path, interval), name="metrics-file", daemon=True).start()
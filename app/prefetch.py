@@ -0,0 +1,79 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import PREFETCH_WORKERS
+from question_dedup import SessionQuestions
+from tech_questions import generate_tech_question
+
+
+def _words(text):
+    return set(re.findall(r"[a-z0-9+#]+", text.lower()))
+
+
+def answer_changes_context(answer, next_tech_stack):
+    # The next question is about a different technology, so an answer to the
+    # current one only matters if it already talks about the next technology.
+    tech_words = _words(next_tech_stack)
+    return bool(tech_words) and tech_words <= _words(answer)
+
+
+class QuestionPrefetcher:
+    """Generates upcoming planned questions while the candidate answers the current one.
+
+    index identifies the planned slot. The speculative prompt is built without the pending answer. When the
+    answer arrives, reconcile() keeps the prefetched question unless the
+    answer changes the context materially, in which case the caller
+    regenerates.
+    """
+
+    def __init__(self, max_workers=PREFETCH_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self.stats = {"scheduled": 0, "used": 0, "regenerated": 0, "failed": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def prefetch(self, question_chain, index, tech_stack, context, asked=()):
+        # Runs off the Streamlit script thread, so it only gets plain values, never st.session_state,
+        # and a snapshot of the questions asked so far.
+        future = self._executor.submit(
+            generate_tech_question,
+            question_chain,
+            tech_stack,
+            "",
+            context,
+            SessionQuestions(asked),
+        )
+        self._count("scheduled")
+        return {"index": index, "tech_stack": tech_stack, "future": future}
+
+    def reconcile(self, prefetched, index, answer):
+        if prefetched is None or prefetched["index"] != index:
+            return None
+        future = prefetched["future"]
+        if answer_changes_context(answer, prefetched["tech_stack"]):
+            future.cancel()
+            self._count("regenerated")
+            return None
+        try:
+            question = future.result()
+        except Exception:
+            self._count("failed")
+            return None
+        self._count("used")
+        return question
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_prefetcher():
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = QuestionPrefetcher()
+        return _prefetcher
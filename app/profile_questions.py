@@ -0,0 +1,97 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import span
+
+# Bump this whenever PROFILE_STEPS changes so rephrasings cached against an
+# older table are never served.
+PROFILE_TEMPLATE_VERSION = 1
+
+# The same steps and wording the profile_prompt asks flan-t5 to reproduce.
+PROFILE_STEPS = [
+    {"key": "full_name", "label": "Full Name", "question": "What is your full name?"},
+    {"key": "email", "label": "Email Address", "question": "Could you please provide your email address?"},
+    {"key": "phone", "label": "Phone Number", "question": "May I have your phone number?"},
+    {"key": "experience", "label": "Years of Experience", "question": "How many years of experience do you have?"},
+    {"key": "position", "label": "Desired Position(s)", "question": "What position(s) are you aiming for?"},
+    {"key": "location", "label": "Current Location", "question": "Where are you currently located?"},
+    {
+        "key": "tech_stack",
+        "label": "Tech Stack",
+        "question": "What is your tech stack? Please list the technologies you are proficient in, separated by commas.",
+    },
+]
+
+
+class ProfileQuestionEngine:
+    """Serves the profile questions straight from PROFILE_STEPS.
+
+    If a rephrase chain is given, each step is reworded by the LLM on a
+    background thread and cached per (template version, step); until that
+    finishes the template question is returned, so callers never wait.
+    """
+
+    def __init__(self, rephrase_chain=None, steps=PROFILE_STEPS, version=PROFILE_TEMPLATE_VERSION, max_workers=2):
+        self.steps = steps
+        self.version = version
+        self.rephrase_chain = rephrase_chain
+        self._rephrased = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers) if rephrase_chain else None
+
+    def __len__(self):
+        return len(self.steps)
+
+    def template_question(self, index):
+        # index is 1-based, matching the "Step N" numbering of profile_prompt
+        return self.steps[index - 1]["question"]
+
+    def get_question(self, index):
+        key = (self.version, index)
+        with self._lock:
+            if key in self._rephrased:
+                return self._rephrased[key]
+        self._schedule_rephrase(index)
+        return self.template_question(index)
+
+    def warm_up(self):
+        for index in range(1, len(self.steps) + 1):
+            self._schedule_rephrase(index)
+
+    def _schedule_rephrase(self, index):
+        if self._executor is None:
+            return
+        key = (self.version, index)
+        with self._lock:
+            if key in self._rephrased or key in self._pending:
+                return
+            self._pending.add(key)
+        self._executor.submit(self._rephrase, key, index)
+
+    def _rephrase(self, key, index):
+        previous_question = self.template_question(index - 1) if index > 1 else ""
+        try:
+            with span("llm_chain", chain="profile"):
+                question = self.rephrase_chain.run(previous_question=previous_question, index=index).strip()
+        except Exception:
+            question = ""
+        with self._lock:
+            self._pending.discard(key)
+            # flan-t5 occasionally drifts; keep the template unless we got a real question back
+            self._rephrased[key] = question if question.endswith("?") else self.template_question(index)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_profile_engine(rephrase_chain=None):
+    # Streamlit re-executes the page script on every rerun but keeps imported
+    # modules, so the engine (and its rephrase cache) lives here for the process.
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ProfileQuestionEngine(rephrase_chain=rephrase_chain)
+            _engine.warm_up()
+        return _engine
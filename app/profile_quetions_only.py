@@ -2,7 +2,7 @@ from langchain.prompts import PromptTemplate
 from langchain.memory import ConversationBufferMemory
 from langchain.chains import LLMChain
 import streamlit as st
-from langchain.llms import HuggingFaceHub
+from llm_backends import get_llm
 import os
 from dotenv import load_dotenv
 
@@ -14,11 +14,7 @@ hf_token = os.getenv("HUGGINGFACEHUB_API_TOKEN")
 st.title("Candidate Profile Question Generator")
 
 # Set up LangChain components
-llm = HuggingFaceHub(
-    repo_id="google/flan-t5-large",
-    model_kwargs={"temperature": 0.2, "max_length": 512},
-    huggingfacehub_api_token=hf_token,
-)
+llm = get_llm()
 
 # Updated question prompt without context
 question_prompt = PromptTemplate(
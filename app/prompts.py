@@ -0,0 +1,84 @@
+from langchain.prompts import PromptTemplate
+
+profile_prompt = PromptTemplate(
+    input_variables=["previous_question", "index"],
+    template=(
+        "You are an expert interview question generator tasked with gathering a candidate's profile. "
+        "Generate one question at a time in the exact order from the following sequence of steps:\n\n"
+        "Step 1. Full Name\n"
+        "Step 2. Email Address\n"
+        "Step 3. Phone Number\n"
+        "Step 4. Years of Experience\n"
+        "Step 5. Desired Position(s)\n"
+        "Step 6. Current Location\n"
+        "Step 7. Tech Stack (comma-separated).\n\n"
+        "Strictly follow this sequence and do not deviate. Each question must ask only about the current step, "
+        "using clear, concise, and professional language. Ensure that previously asked steps are not repeated.\n\n"
+        "Here are examples of questions for each step:\n"
+        "Step 1: 'What is your full name?'\n"
+        "Step 2: 'Could you please provide your email address?'\n"
+        "Step 3: 'May I have your phone number?'\n"
+        "Step 4: 'How many years of experience do you have?'\n"
+        "Step 5: 'What position(s) are you aiming for?'\n"
+        "Step 6: 'Where are you currently located?'\n"
+        "Step 7: 'What is your tech stack? Please list the technologies you are proficient in, separated by commas.'\n\n"
+        "This is the previous question you generated: '{previous_question}'.\n"
+        "Now generate the question for step {index}."
+    ),
+)
+
+# question_prompt = PromptTemplate(
+#     input_variables=["tech_stack", "previous_answer", "context"],
+#     template=(
+#         "You are a professional interview question generator. The user is proficient in "
+#         "{tech_stack}. Based on the user's past responses: {previous_answer} and context: {context}, "
+#         "generate a specific, relevant, and challenging interview question related to {tech_stack}."
+#     )
+# )
+question_prompt = PromptTemplate(
+    input_variables=["tech_stack", "previous_answer", "context"],
+    template=(
+        "You are a highly skilled interview question generator and conversational agent. "
+        "The user is proficient in the following technical skills: {tech_stack}. "
+        "Using their past responses: '{previous_answer}' and context: '{context}', "
+        "generate a specific, relevant, and challenging interview question related to {tech_stack}.\n\n"
+        "Guidelines:\n"
+        "1. Ensure the question is highly specific, non-generic, and tailored to the mentioned tech stack.\n"
+        "2. Take into account any patterns or gaps in the user's previous answers to refine the question.\n"
+        "3. Avoid repeating questions or topics already addressed in the context.\n"
+        "4. If a conversation-ending keyword is detected (e.g., 'stop', 'exit', 'end', 'quit', or similar), "
+        "immediately respond with a fix polite message - 'Thank you for the conversation!' and terminate the interaction."
+    )
+)
+
+# Shorter prompt used by Form_tech_stack_questions.py and tech_stack_input_to_generate_questions_from_it.py
+form_question_prompt = PromptTemplate(
+    input_variables=["tech_stack", "previous_answer", "context"],
+    template=(
+        "You are a professional interview question generator. The user is proficient in "
+        "{tech_stack}. Based on the user's past responses: {previous_answer} and context: {context}, "
+        "generate a specific, relevant, and challenging interview question related to {tech_stack}."
+    )
+)
+
+# Used by scoring.py: model answers for the question bank, and grading a candidate's answer against one
+reference_answer_prompt = PromptTemplate(
+    input_variables=["tech_stack", "question"],
+    template=(
+        "You are a senior {tech_stack} engineer. Give a concise, correct model answer to the following "
+        "interview question, covering the points a strong candidate would mention.\n\n"
+        "Question: {question}"
+    )
+)
+
+answer_score_prompt = PromptTemplate(
+    input_variables=["question", "reference", "answer"],
+    template=(
+        "You are grading a technical interview answer.\n"
+        "Question: {question}\n"
+        "Reference answer: {reference}\n"
+        "Candidate answer: {answer}\n\n"
+        "Rate how correct and complete the candidate answer is on a scale from 0 to 10. "
+        "Reply with the number only."
+    )
+)
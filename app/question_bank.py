@@ -0,0 +1,227 @@
+import argparse
+import json
+import os
+import random
+import re
+import threading
+
+from config import QUESTION_BANK_PATH
+from question_dedup import QuestionDeduplicator
+from tech_catalog import canonical_tech
+
+BANK_FORMAT = "talentscout-question-bank"
+BANK_VERSION = 1
+
+
+def normalize_tech(name):
+    # "Python", "python3" and " py " share one bank entry
+    return canonical_tech(name)
+
+
+def question_key(question):
+    # Two generations that only differ in case, spacing or punctuation are the same question
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", question.lower()).split())
+
+
+class QuestionBank:
+    """Read side of the question bank file.
+
+    The file is JSON lines: a header line carrying an index of
+    ``technology -> [offset, length, count]`` followed by one JSON array of
+    questions per technology. Only the header is read up front; each
+    technology's questions are loaded on first use and kept in memory, so a
+    draw is a dict lookup plus a random index.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._questions = {}
+        self._lock = threading.Lock()
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            self._body_start = f.tell()
+        if header.get("format") != BANK_FORMAT:
+            raise ValueError(f"{path} is not a question bank file")
+        self.version = header["version"]
+        self.index = header["index"]
+
+    def __contains__(self, tech):
+        return normalize_tech(tech) in self.index
+
+    def technologies(self):
+        return sorted(self.index)
+
+    def questions(self, tech):
+        tech = normalize_tech(tech)
+        if tech not in self.index:
+            return []
+        with self._lock:
+            if tech not in self._questions:
+                offset, length, _ = self.index[tech]
+                with open(self.path, "rb") as f:
+                    f.seek(self._body_start + offset)
+                    self._questions[tech] = json.loads(f.read(length))
+            return self._questions[tech]
+
+    def draw(self, tech, exclude=()):
+        questions = self.questions(tech)
+        if not questions:
+            return None
+        exclude = {question_key(q) for q in exclude}
+        # A few random probes are enough unless the session already used most of the bank
+        for _ in range(8):
+            question = random.choice(questions)
+            if question_key(question) not in exclude:
+                return question
+        remaining = [q for q in questions if question_key(q) not in exclude]
+        return random.choice(remaining) if remaining else None
+
+
+def write_bank(path, bank):
+    index = {}
+    lines = []
+    offset = 0
+    for tech in sorted(bank):
+        line = json.dumps(bank[tech], ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        index[tech] = [offset, len(line), len(bank[tech])]
+        lines.append(line)
+        offset += len(line)
+    header = json.dumps({"format": BANK_FORMAT, "version": BANK_VERSION, "index": index}, separators=(",", ":"))
+
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header.encode("utf-8") + b"\n")
+        f.writelines(lines)
+    os.replace(tmp_path, path)
+
+
+def load_bank_dict(path):
+    if not os.path.exists(path):
+        return {}
+    bank = QuestionBank(path)
+    return {tech: list(bank.questions(tech)) for tech in bank.technologies()}
+
+
+def _build_context(accepted, rejected, attempt):
+    lines = [f"Q: {q}" for q in accepted]
+    if rejected:
+        # Rejected repeats, and the attempt number, keep a round that only produced a repeat from
+        # sending the same prompt again: the LLM cache, or a greedy model, would return the same repeat.
+        lines.extend(f"Already asked, do not repeat: {q}" for q in rejected)
+        lines.append(f"Attempt {attempt}")
+    return "\n".join(lines)
+
+
+def build_bank(question_chain, technologies, per_tech=10, max_rounds=None, bank=None):
+    # Every round sends one prompt per unfinished technology through a single
+    # chain.apply call. The questions gathered so far go in as context, so the
+    # prompt's "avoid repeating questions" guideline steers each new round.
+    # Rewordings of an accepted question are dropped through a per-tech vector store.
+    bank = {tech: list(questions) for tech, questions in (bank or {}).items()}
+    seen = {tech: {question_key(q) for q in questions} for tech, questions in bank.items()}
+    similar = {}
+    for tech, questions in bank.items():
+        similar[tech] = QuestionDeduplicator()
+        similar[tech].add_global(questions)
+    rejected = {}
+    attempts = {}
+    technologies = sorted({normalize_tech(t) for t in technologies if t.strip()})
+    max_rounds = max_rounds or per_tech * 3
+
+    for _ in range(max_rounds):
+        pending = [tech for tech in technologies if len(bank.get(tech, [])) < per_tech]
+        if not pending:
+            break
+        inputs = []
+        for tech in pending:
+            attempts[tech] = attempts.get(tech, 0) + 1
+            inputs.append({
+                "tech_stack": tech,
+                "previous_answer": "",
+                "context": _build_context(bank.get(tech, []), rejected.get(tech, []), attempts[tech]),
+            })
+        for tech, result in zip(pending, question_chain.apply(inputs)):
+            question = result[question_chain.output_key].strip()
+            key = question_key(question)
+            deduplicator = similar.setdefault(tech, QuestionDeduplicator())
+            if not key or key in seen.setdefault(tech, set()) or deduplicator.is_duplicate(question):
+                if key and question not in rejected.setdefault(tech, []):
+                    rejected[tech].append(question)
+                continue
+            deduplicator.add_global([question])
+            seen[tech].add(key)
+            bank.setdefault(tech, []).append(question)
+    return bank
+
+
+_bank = None
+_bank_mtime = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank(path=QUESTION_BANK_PATH):
+    # Shared by every session in the process; reloaded when the builder rewrites the file.
+    global _bank, _bank_mtime
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _bank_lock:
+        if _bank is None or _bank_mtime != mtime or _bank.path != path:
+            _bank = QuestionBank(path)
+            _bank_mtime = mtime
+        return _bank
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and inspect the pregenerated technical question bank.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="generate questions for each technology through question_prompt")
+    build.add_argument("technologies", nargs="*", help="technologies to generate questions for")
+    build.add_argument("--from-file", help="file with one technology per line")
+    build.add_argument("--per-tech", type=int, default=10, help="questions to keep per technology")
+    build.add_argument("--out", default=QUESTION_BANK_PATH, help="bank file to write")
+    build.add_argument("--replace", action="store_true", help="start from scratch instead of extending the existing bank")
+
+    show = subparsers.add_parser("show", help="print the technologies and question counts in a bank")
+    show.add_argument("--path", default=QUESTION_BANK_PATH)
+    show.add_argument("--tech", help="print every question for this technology")
+
+    args = parser.parse_args()
+
+    if args.command == "show":
+        bank = QuestionBank(args.path)
+        if args.tech:
+            for question in bank.questions(args.tech):
+                print(question)
+        else:
+            for tech in bank.technologies():
+                print(f"{tech}\t{bank.index[tech][2]}")
+        return
+
+    technologies = list(args.technologies)
+    if args.from_file:
+        with open(args.from_file) as f:
+            technologies.extend(line for line in f if line.strip())
+    if not technologies:
+        parser.error("no technologies given")
+
+    from langchain.chains import LLMChain
+    from llm_backends import get_llm
+    from llm_cache import install_llm_cache
+    from prompts import question_prompt
+
+    install_llm_cache()
+    llm = get_llm()
+    existing = {} if args.replace else load_bank_dict(args.out)
+    bank = build_bank(LLMChain(llm=llm, prompt=question_prompt), technologies, per_tech=args.per_tech, bank=existing)
+    write_bank(args.out, bank)
+    for tech in sorted(bank):
+        print(f"{tech}\t{len(bank[tech])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from config import DEDUP_THRESHOLD, DEDUP_EMBEDDING_DIM
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can could do does for from how i in is it its me of on or please "
+    "some that the this to was what when where which who why will with would you your".split()
+)
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-n-grams embedding, no model required.
+
+    Content words (stopwords dropped, plural 's' stripped) and their bigrams
+    are hashed into ``dim`` buckets and L2-normalized. This is enough to
+    catch reworded repeats ("best way to learn python" / "best ways to learn
+    SQL") at a few microseconds per question. Any object with
+    ``embed_documents`` (e.g. embeddings.EmbeddingService) can be used instead.
+    """
+
+    def __init__(self, dim=DEDUP_EMBEDDING_DIM, cache_size=4096):
+        self.dim = dim
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _features(self, text):
+        words = [w[:-1] if len(w) > 3 and w.endswith("s") else w for w in _WORD_RE.findall(text.lower())]
+        words = [w for w in words if w not in _STOPWORDS]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, text):
+        with self._lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+                return vector
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            vector[zlib.crc32(feature.encode("utf-8")) % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        with self._lock:
+            self._cache[text] = vector
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return vector
+
+    def embed_documents(self, texts):
+        return [self.embed(text) for text in texts]
+
+
+class QuestionVectorStore:
+    # Unit vectors in a preallocated float32 matrix that doubles when full;
+    # a similarity check is one matrix-vector product over the filled rows.
+    def __init__(self, dim, capacity=1024):
+        self.matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def add(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.matrix.shape[1])
+        with self._lock:
+            needed = self.count + len(vectors)
+            if needed > len(self.matrix):
+                grown = np.zeros((max(needed, 2 * len(self.matrix)), self.matrix.shape[1]), dtype=np.float32)
+                grown[:self.count] = self.matrix[:self.count]
+                self.matrix = grown
+            self.matrix[self.count:needed] = vectors
+            self.count = needed
+
+    def similarities(self, vector):
+        return self.matrix[:self.count] @ vector
+
+    def max_similarity(self, vector):
+        if not self.count:
+            return 0.0
+        return float(np.max(self.similarities(vector)))
+
+
+class SessionQuestions:
+    """The questions one session has been asked, with their vectors.
+
+    A check against a plain list embeds every earlier question again. This
+    keeps their unit vectors in a QuestionVectorStore as they are added, so a
+    check only embeds the new question. ``SessionQuestions(other)`` is a
+    snapshot of ``other`` that copies its vectors rather than re-embedding.
+    """
+
+    def __init__(self, questions=()):
+        self.questions = list(questions)
+        self._store = None
+        self._embedder = None
+        if isinstance(questions, SessionQuestions) and questions._store is not None:
+            count = questions._store.count
+            self._embedder = questions._embedder
+            self._store = QuestionVectorStore(questions._store.matrix.shape[1], capacity=max(count, 16))
+            self._store.add(questions._store.matrix[:count])
+
+    def append(self, question):
+        self.questions.append(question)
+
+    def __iter__(self):
+        return iter(self.questions)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __contains__(self, question):
+        return question in self.questions
+
+    def vectors(self, deduplicator):
+        # The store, after embedding the questions added since the last call with deduplicator's embedder
+        if self._embedder is not deduplicator.embedder:
+            self._store, self._embedder = None, deduplicator.embedder
+        pending = self.questions[self._store.count if self._store is not None else 0:]
+        if pending:
+            vectors = deduplicator._embed(pending)
+            if self._store is None:
+                self._store = QuestionVectorStore(len(vectors[0]), capacity=16)
+            self._store.add(vectors)
+        return self._store
+
+
+def as_unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class QuestionDeduplicator:
+    def __init__(self, embedder=None, threshold=DEDUP_THRESHOLD):
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.global_store = None
+        self.stats = {"checks": 0, "duplicates": 0}
+
+    def _embed(self, texts):
+        return [as_unit(vector) for vector in self.embedder.embed_documents(list(texts))]
+
+    def add_global(self, questions):
+        vectors = self._embed(questions)
+        if not vectors:
+            return
+        if self.global_store is None:
+            self.global_store = QuestionVectorStore(len(vectors[0]))
+        self.global_store.add(vectors)
+
+    def max_similarity(self, question, session_questions=(), use_global=True):
+        vector = self._embed([question])[0]
+        best = 0.0
+        if isinstance(session_questions, SessionQuestions):
+            if session_questions:
+                best = session_questions.vectors(self).max_similarity(vector)
+        elif session_questions:
+            best = float(np.max(np.stack(self._embed(session_questions)) @ vector))
+        if use_global and self.global_store is not None:
+            best = max(best, self.global_store.max_similarity(vector))
+        return best
+
+    def is_duplicate(self, question, session_questions=(), use_global=True):
+        self.stats["checks"] += 1
+        duplicate = self.max_similarity(question, session_questions, use_global) >= self.threshold
+        if duplicate:
+            self.stats["duplicates"] += 1
+        return duplicate
+
+
+_deduplicator = None
+_deduplicator_bank = None
+_deduplicator_lock = threading.Lock()
+
+
+def get_question_deduplicator():
+    # Process-wide; the global store is reseeded whenever a new question bank is loaded
+    global _deduplicator, _deduplicator_bank
+    from question_bank import get_question_bank  # question_bank imports this module
+
+    bank = get_question_bank()
+    with _deduplicator_lock:
+        if _deduplicator is None or bank is not _deduplicator_bank:
+            _deduplicator = QuestionDeduplicator()
+            if bank is not None:
+                for tech in bank.technologies():
+                    _deduplicator.add_global(bank.questions(tech))
+            _deduplicator_bank = bank
+        return _deduplicator
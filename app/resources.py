@@ -0,0 +1,111 @@
+import functools
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Everything here is built at most once per process. Streamlit re-executes the
+# page script on every rerun but keeps imported modules, so these factories
+# turn per-rerun construction into a dict lookup. Heavy packages (langchain,
+# torch, faiss, sentence-transformers) are only imported by the factory that
+# first needs them, so the profile stage never pays for them.
+
+_resources = {}
+_timings = {}
+_build_locks = {}
+_lock = threading.Lock()
+_process_started = time.perf_counter()
+
+
+@contextmanager
+def timed(phase):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _timings[phase] = _timings.get(phase, 0.0) + time.perf_counter() - started
+
+
+def lazy_import(name):
+    module = sys.modules.get(name)
+    if module is None:
+        with timed(f"import {name}"):
+            module = importlib.import_module(name)
+    return module
+
+
+def cached_resource(factory):
+    # The process-wide lock only guards the dicts. Each key is built under its own lock, so a
+    # slow first build (a model load) never holds up other resources or startup_report().
+    @functools.wraps(factory)
+    def wrapper(*args):
+        key = (factory.__name__,) + args
+        with _lock:
+            if key in _resources:
+                return _resources[key]
+            build_lock = _build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            with _lock:
+                if key in _resources:
+                    return _resources[key]
+            with timed(f"build {':'.join(map(str, key))}"):
+                resource = factory(*args)
+            with _lock:
+                _resources[key] = resource
+                _build_locks.pop(key, None)
+            return resource
+    return wrapper
+
+
+@cached_resource
+def get_shared_llm(backend=None):
+    # Identical prompts (across candidates and reruns) are answered from the shared cache
+    lazy_import("langchain")
+    from llm_cache import install_llm_cache
+    from llm_backends import get_llm
+
+    install_llm_cache()
+    return get_llm(backend)
+
+
+@cached_resource
+def get_chain(prompt_name, backend=None):
+    # prompt_name is an attribute of prompts.py, e.g. "question_prompt";
+    # backend defaults to LLM_BACKEND
+    LLMChain = lazy_import("langchain.chains").LLMChain
+    prompts = lazy_import("prompts")
+    return LLMChain(llm=get_shared_llm(backend), prompt=getattr(prompts, prompt_name))
+
+
+@cached_resource
+def get_profile_engine_resource(rephrase):
+    from profile_questions import get_profile_engine
+
+    return get_profile_engine(rephrase_chain=get_chain("profile_prompt") if rephrase else None)
+
+
+def startup_report():
+    with _lock:
+        phases = dict(sorted(_timings.items(), key=lambda item: -item[1]))
+        resources = sorted(":".join(map(str, key)) for key in _resources)
+    return {
+        "process_uptime": time.perf_counter() - _process_started,
+        "resources": resources,
+        "phases": phases,
+    }
+
+
+if __name__ == "__main__":
+    # Cold-start breakdown: python app/resources.py
+    import json
+
+    with timed("cold start"):
+        lazy_import("streamlit")
+        get_profile_engine_resource(False)
+        get_chain("question_prompt")
+        from question_bank import get_question_bank
+
+        with timed("load question bank"):
+            get_question_bank()
+    print(json.dumps(startup_report(), indent=4))
@@ -0,0 +1,101 @@
+import numpy as np
+
+from config import CONTEXT_MODE, CONTEXT_TOKEN_BUDGET, RETRIEVAL_TOP_K, RETRIEVAL_EMBEDDER, ANSWER_TOKEN_BUDGET
+from interview_context import InterviewContext, count_tokens, truncate_tokens
+from question_dedup import HashingEmbedder, QuestionVectorStore, as_unit
+
+# Profile fields that identify the candidate but say nothing about what to ask
+SKIPPED_PROFILE_LABELS = frozenset({"Full Name", "Email Address", "Phone Number"})
+
+
+class RetrievalContext:
+    """Prompt context made of the snippets most relevant to the next question.
+
+    The candidate's profile lines and answered turns are embedded once, as they
+    appear, into a small per-candidate vector store. render() embeds the query
+    (the technology the next question is about) and returns the most recent
+    turn, any unanswered question and then the top_k closest snippets, best
+    first, while they fit in token_budget, in interview order. The prompt stays
+    the same size however long the interview runs, but still draws on things
+    the candidate said many turns ago. Until the first answer, profile lines
+    are left out, so the opening question's prompt depends only on the
+    technology and is shared through the LLM cache across candidates.
+    """
+
+    def __init__(self, top_k=RETRIEVAL_TOP_K, token_budget=CONTEXT_TOKEN_BUDGET, embedder=None, recent_turns=1):
+        self.top_k = top_k
+        self.token_budget = token_budget
+        self.embedder = embedder or HashingEmbedder()
+        self.recent_turns = recent_turns
+        self.store = None
+        self.snippets = []
+        self.snippet_tokens = []
+        self.turn_snippets = []
+        self.profile_labels = set()
+        self.absorbed = 0
+
+    def _index(self, texts):
+        vectors = [as_unit(vector) for vector in self.embedder.embed_documents(texts)]
+        if self.store is None:
+            self.store = QuestionVectorStore(len(vectors[0]), capacity=64)
+        self.store.add(vectors)
+        self.snippets.extend(texts)
+        self.snippet_tokens.extend(count_tokens(text) for text in texts)
+
+    def update(self, history, profile=None):
+        # Only profile fields and answered turns not indexed yet are embedded
+        new = []
+        for label, value in (profile or {}).items():
+            if label in SKIPPED_PROFILE_LABELS or label in self.profile_labels or not str(value).strip():
+                continue
+            self.profile_labels.add(label)
+            new.append(f"{label}: {value}")
+        while self.absorbed < len(history) and history[self.absorbed]["answer"]:
+            turn = history[self.absorbed]
+            self.turn_snippets.append(len(self.snippets) + len(new))
+            new.append(f"Q: {turn['question']} A: {truncate_tokens(turn['answer'], ANSWER_TOKEN_BUDGET)}")
+            self.absorbed += 1
+        if new:
+            self._index(new)
+
+    def retrieve(self, query, exclude=()):
+        # Snippet indices, most similar first
+        if self.store is None or not self.store.count or not query:
+            return []
+        scores = self.store.similarities(as_unit(self.embedder.embed_documents([query])[0]))
+        if exclude:
+            scores = scores.copy()
+            scores[list(exclude)] = -np.inf
+        k = min(self.top_k, self.store.count - len(exclude))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        return [int(i) for i in top[np.argsort(-scores[top])]]
+
+    def render(self, history, query=None, profile=None):
+        self.update(history, profile)
+        pending = [f"Q: {turn['question']} A:" for turn in history[self.absorbed:]]
+        if not self.turn_snippets:
+            return truncate_tokens("\n".join(pending), self.token_budget)
+        recent = self.turn_snippets[-self.recent_turns:] if self.recent_turns else []
+        budget = self.token_budget - sum(count_tokens(line) for line in pending)
+        chosen = []
+        for i in recent + self.retrieve(query, exclude=recent):
+            if self.snippet_tokens[i] <= budget:
+                chosen.append(i)
+                budget -= self.snippet_tokens[i]
+        lines = [self.snippets[i] for i in sorted(chosen)] + pending
+        return truncate_tokens("\n".join(lines), self.token_budget)
+
+
+def make_interview_context(mode=CONTEXT_MODE):
+    # One per interview; both kinds take render(history, query=..., profile=...)
+    if mode == "window":
+        return InterviewContext()
+    if mode != "retrieval":
+        raise ValueError(f"Unknown CONTEXT_MODE {mode!r}, expected 'retrieval' or 'window'")
+    if RETRIEVAL_EMBEDDER == "instructor":
+        from embeddings import get_embedding_service
+
+        return RetrievalContext(embedder=get_embedding_service())
+    return RetrievalContext()
@@ -0,0 +1,313 @@
+import argparse
+import json
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from candidate_records import profile_fields, tech_answers
+from config import (CONVERSATION_STORE_DIR, SCORES_DIR, SCORING_METHOD, SCORING_WORKERS, SCORING_BATCH_RECORDS,
+                    SCORING_POLL_INTERVAL, REFERENCE_ANSWERS_PATH)
+from conversation_store import ConversationStore, iter_records, scan_records
+from question_bank import question_key
+
+# Scores saved interviews off the request path. The conversation store is the
+# queue: the pipeline tails it from a saved cursor, deals the new records out in
+# chunks of SCORING_BATCH_RECORDS to a pool of SCORING_WORKERS processes, and
+# appends one score record per interview (same id as the interview) to a store
+# of its own under SCORES_DIR. Each chunk's Q/A pairs, across all its candidates,
+# are scored in one grouped call against the question bank's reference answers:
+#
+#   similarity  cosine similarity of answer and reference embeddings, one matrix pass per chunk
+#   llm         answer_score_prompt through one chain.apply per chunk (micro-batched like live traffic)
+#
+# With the similarity method, answers to questions without a reference answer
+# (generated live, not drawn from the bank) are left unscored (None), since
+# against the question itself an answer that repeats the question would score
+# best; unscored answers do not count towards the candidate's average. At most
+# two chunks per worker are in flight, and the cursor only moves past a chunk
+# once its scores are committed, so a restarted pipeline rescores at most the
+# chunks that were in flight.
+
+CURSOR_FILE = "cursor.json"
+_SCORE_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def load_references(path=REFERENCE_ANSWERS_PATH):
+    # {question_key: reference answer}, written by `python app/scoring.py references`
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_references(path, references):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(references, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def build_references(answer_chain, bank, references=None, chunk_size=32):
+    # One model answer per bank question that does not have one yet, chunk_size prompts per chain.apply
+    references = dict(references or {})
+    pending = [
+        (tech, question) for tech in bank.technologies() for question in bank.questions(tech)
+        if question_key(question) not in references
+    ]
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        results = answer_chain.apply([{"tech_stack": tech, "question": question} for tech, question in chunk])
+        for (_, question), result in zip(chunk, results):
+            answer = result[answer_chain.output_key].strip()
+            if answer:
+                references[question_key(question)] = answer
+    return references
+
+
+class SimilarityScorer:
+    """Scores answers by embedding similarity to the reference answer."""
+
+    name = "similarity"
+
+    def __init__(self, references, embedder=None):
+        from question_dedup import HashingEmbedder
+
+        self.references = references
+        self.embedder = embedder or HashingEmbedder()
+
+    def score_pairs(self, pairs):
+        # pairs: [(question, answer)] -> [(score in [0, 1] or None without a reference, reference kind)]
+        results = [(None, "none")] * len(pairs)
+        scored = [(i, answer, self.references[question_key(question)]) for i, (question, answer) in enumerate(pairs)
+                  if self.references.get(question_key(question))]
+        if not scored:
+            return results
+        answers = np.asarray(self.embedder.embed_documents([answer for _, answer, _ in scored]), dtype=np.float32)
+        targets = np.asarray(self.embedder.embed_documents([reference for _, _, reference in scored]), dtype=np.float32)
+        similarities = np.clip(np.einsum("ij,ij->i", answers, targets), 0.0, 1.0)
+        for (i, _, _), score in zip(scored, similarities):
+            results[i] = (round(float(score), 4), "bank")
+        return results
+
+
+class LLMScorer:
+    """Scores answers by asking the LLM to grade them against the reference answer."""
+
+    name = "llm"
+
+    def __init__(self, references, chain):
+        self.references = references
+        self.chain = chain
+
+    def score_pairs(self, pairs):
+        inputs, kinds = [], []
+        for question, answer in pairs:
+            reference = self.references.get(question_key(question))
+            inputs.append({"question": question, "reference": reference or "(none given)", "answer": answer})
+            kinds.append("bank" if reference else "none")
+        scores = []
+        for result, kind in zip(self.chain.apply(inputs), kinds):
+            match = _SCORE_RE.search(result[self.chain.output_key])
+            scores.append((round(min(float(match.group()), 10.0) / 10.0, 4) if match else None, kind))
+        return scores
+
+
+def make_scorer(method=SCORING_METHOD, references_path=REFERENCE_ANSWERS_PATH):
+    references = load_references(references_path)
+    if method == "similarity":
+        return SimilarityScorer(references)
+    if method == "llm":
+        from resources import get_chain
+
+        return LLMScorer(references, get_chain("answer_score_prompt"))
+    raise ValueError(f"Unknown SCORING_METHOD {method!r}, expected 'similarity' or 'llm'")
+
+
+def score_records(scorer, records):
+    # Every non-empty answer of every record goes into one score_pairs call; empty answers score 0
+    pairs, owners = [], []
+    for i, record in enumerate(records):
+        for j, qa in enumerate(tech_answers(record)):
+            if str(qa.get("answer", "")).strip():
+                pairs.append((qa.get("question", ""), qa["answer"]))
+                owners.append((i, j))
+    results = dict(zip(owners, scorer.score_pairs(pairs) if pairs else []))
+
+    scored_at = datetime.now().isoformat(timespec="seconds")
+    scores = []
+    for i, record in enumerate(records):
+        answers = []
+        for j, qa in enumerate(tech_answers(record)):
+            score, reference = results.get((i, j), (0.0, "empty"))
+            answers.append({"question": qa.get("question", ""), "score": score, "reference": reference})
+        graded = [answer["score"] for answer in answers if answer["score"] is not None]
+        scores.append({
+            "id": record["id"],
+            "candidate_name": profile_fields(record).get("full_name") or record.get("candidate_name", ""),
+            "method": scorer.name,
+            "score": round(sum(graded) / len(graded), 4) if graded else None,
+            "answered": sum(1 for answer in answers if answer["reference"] != "empty"),
+            "answers": answers,
+            "scored_at": scored_at,
+        })
+    return scores
+
+
+# Worker processes build their scorer (and with the llm method, their model) once
+_worker_scorer = None
+
+
+def _init_worker(method, references_path):
+    global _worker_scorer
+    _worker_scorer = make_scorer(method, references_path)
+
+
+def _score_chunk(records):
+    return score_records(_worker_scorer, records)
+
+
+def load_cursor(scores_dir=SCORES_DIR):
+    path = os.path.join(scores_dir, CURSOR_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        position = json.load(f).get("position")
+    return tuple(position) if position else None
+
+
+def save_cursor(position, scores_dir=SCORES_DIR):
+    path = os.path.join(scores_dir, CURSOR_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"position": position}, f)
+    os.replace(tmp_path, path)
+
+
+def load_scores(scores_dir=SCORES_DIR):
+    # {interview id: score record}; a rescored interview keeps its latest scores
+    return {record["id"]: record for record in iter_records(scores_dir)}
+
+
+class ScoringPipeline:
+    """Tails the conversation store and scores new interviews in a process pool."""
+
+    def __init__(self, store_dir=CONVERSATION_STORE_DIR, scores_dir=SCORES_DIR, method=SCORING_METHOD,
+                 workers=SCORING_WORKERS, batch_records=SCORING_BATCH_RECORDS, references_path=REFERENCE_ANSWERS_PATH):
+        self.store_dir = store_dir
+        self.scores_dir = scores_dir
+        self.method = method
+        self.workers = max(1, workers)
+        self.batch_records = max(1, batch_records)
+        self.references_path = references_path
+        self.stats = {"records": 0, "chunks": 0, "answers": 0, "seconds": 0.0}
+
+    def _chunks(self, after):
+        chunk, last_position = [], None
+        for position, record in scan_records(self.store_dir, after=after):
+            last_position = position
+            if "id" in record:
+                chunk.append(record)
+            if len(chunk) >= self.batch_records:
+                yield chunk, last_position
+                chunk, last_position = [], None
+        if last_position is not None:
+            yield chunk, last_position
+
+    def run_once(self, pool, scores):
+        # Scores everything committed after the cursor; returns the number of interviews scored
+        started = time.perf_counter()
+        cursor = load_cursor(self.scores_dir)
+        in_flight = deque()
+        scored = 0
+
+        def complete_oldest():
+            nonlocal scored
+            future, position, size = in_flight.popleft()
+            for record in future.result():
+                scores.append(record)
+                self.stats["answers"] += len(record["answers"])
+            scores.flush()
+            save_cursor(position, self.scores_dir)
+            scored += size
+            self.stats["chunks"] += 1
+
+        for chunk, position in self._chunks(cursor):
+            if len(in_flight) >= 2 * self.workers:
+                complete_oldest()
+            in_flight.append((pool.submit(_score_chunk, chunk), position, len(chunk)))
+        while in_flight:
+            complete_oldest()
+        self.stats["records"] += scored
+        self.stats["seconds"] += time.perf_counter() - started
+        return scored
+
+    def run(self, follow=False, poll_interval=SCORING_POLL_INTERVAL):
+        scores = ConversationStore(self.scores_dir)
+        try:
+            with ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                     initargs=(self.method, self.references_path)) as pool:
+                while True:
+                    scored = self.run_once(pool, scores)
+                    if not follow:
+                        return self.stats
+                    if not scored:
+                        time.sleep(poll_interval)
+        finally:
+            scores.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score saved interviews against the question bank's reference answers.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="score interviews saved since the last run")
+    run.add_argument("--store", default=CONVERSATION_STORE_DIR)
+    run.add_argument("--scores", default=SCORES_DIR)
+    run.add_argument("--method", choices=["similarity", "llm"], default=SCORING_METHOD)
+    run.add_argument("--workers", type=int, default=SCORING_WORKERS)
+    run.add_argument("--batch-records", type=int, default=SCORING_BATCH_RECORDS)
+    run.add_argument("--references", default=REFERENCE_ANSWERS_PATH)
+    run.add_argument("--follow", action="store_true", help="keep polling the store for new interviews")
+
+    references = subparsers.add_parser("references", help="generate reference answers for the question bank")
+    references.add_argument("--bank", help="question bank file (default QUESTION_BANK_PATH)")
+    references.add_argument("--out", default=REFERENCE_ANSWERS_PATH)
+
+    show = subparsers.add_parser("show", help="print per-candidate scores")
+    show.add_argument("--scores", default=SCORES_DIR)
+    show.add_argument("--answers", action="store_true", help="include per-answer scores")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        pipeline = ScoringPipeline(args.store, args.scores, args.method, args.workers, args.batch_records, args.references)
+        stats = pipeline.run(follow=args.follow)
+        rate = stats["records"] / stats["seconds"] if stats["seconds"] else 0.0
+        print(f"Scored {stats['records']} interviews ({stats['answers']} answers) in {stats['seconds']:.2f}s, {rate:.1f}/s")
+    elif args.command == "references":
+        from question_bank import QuestionBank, get_question_bank
+        from resources import get_chain
+
+        bank = QuestionBank(args.bank) if args.bank else get_question_bank()
+        if bank is None:
+            parser.error("no question bank; build one with `python app/question_bank.py build ...`")
+        existing = load_references(args.out)
+        built = build_references(get_chain("reference_answer_prompt"), bank, existing)
+        write_references(args.out, built)
+        print(f"{len(built) - len(existing)} new reference answers, {len(built)} total in {args.out}")
+    elif args.command == "show":
+        for record in sorted(load_scores(args.scores).values(), key=lambda r: r["score"] or 0.0, reverse=True):
+            if not args.answers:
+                record = {key: value for key, value in record.items() if key != "answers"}
+            print(json.dumps(record, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from config import SESSION_STORE_BACKEND, SESSION_STORE_PATH, SESSION_TTL
+from resources import cached_resource
+
+# Interview state kept outside Streamlit's process memory, so any app worker can
+# pick up a candidate's session (main.py passes the id in the ?session= query
+# parameter) and a restart does not lose interviews in progress. main.py
+# checkpoints the session after every submitted answer and generated question.
+#
+# Sessions are stored as zlib-compressed compact JSON of InterviewSession.to_state().
+
+_PURGE_EVERY = 256
+
+
+def encode_state(state):
+    return zlib.compress(json.dumps(state, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), 1)
+
+
+def decode_state(data):
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+class MemorySessionStore:
+    """Per-process store; sessions survive reruns and reconnects, not restarts."""
+
+    def __init__(self, ttl=SESSION_TTL):
+        self.ttl = ttl
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._puts = 0
+
+    def get(self, session_id):
+        with self._lock:
+            entry = self._sessions.get(session_id)
+        if entry is None or time.time() - entry[1] > self.ttl:
+            return None
+        return entry[0]
+
+    def put(self, session_id, data):
+        with self._lock:
+            self._sessions[session_id] = (data, time.time())
+            self._puts += 1
+            if self._puts % _PURGE_EVERY == 0:
+                cutoff = time.time() - self.ttl
+                for key in [key for key, (_, updated_at) in self._sessions.items() if updated_at < cutoff]:
+                    del self._sessions[key]
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+class SQLiteSessionStore:
+    """Sessions in one SQLite file shared by every worker process on the host.
+
+    WAL mode lets workers read while another writes; each checkpoint is a
+    single-row upsert.
+    """
+
+    def __init__(self, path=SESSION_STORE_PATH, ttl=SESSION_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._puts = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, data BLOB NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)")
+        self._db.commit()
+
+    def get(self, session_id):
+        with self._lock:
+            row = self._db.execute("SELECT data, updated_at FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return row[0]
+
+    def put(self, session_id, data):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions (id, data, updated_at) VALUES (?, ?, ?)", (session_id, data, now)
+            )
+            self._puts += 1
+            if self._puts % _PURGE_EVERY == 0:
+                self._db.execute("DELETE FROM sessions WHERE updated_at < ?", (now - self.ttl,))
+            self._db.commit()
+
+    def delete(self, session_id):
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self._db.commit()
+
+
+SESSION_STORES = {
+    "memory": MemorySessionStore,
+    "sqlite": SQLiteSessionStore,
+}
+
+
+@cached_resource
+def get_session_store(backend=SESSION_STORE_BACKEND):
+    if backend not in SESSION_STORES:
+        raise ValueError(f"Unknown SESSION_STORE_BACKEND {backend!r}, expected one of {sorted(SESSION_STORES)}")
+    return SESSION_STORES[backend]()
+
+
+def save_session(session_id, session, store=None):
+    (store or get_session_store()).put(session_id, encode_state(session.to_state()))
+
+
+def load_session(session_id, factory, store=None):
+    # factory(state) rebuilds the session, e.g. lambda state: InterviewSession.from_state(state, profile_engine)
+    data = (store or get_session_store()).get(session_id)
+    if data is None:
+        return None
+    try:
+        return factory(decode_state(data))
+    except (ValueError, KeyError, zlib.error):
+        return None
@@ -0,0 +1,78 @@
+import json
+import time
+
+from config import HF_API_URL, LLM_TEMPERATURE, LLM_MAX_LENGTH, STREAMING_BACKEND, STREAMING_URL
+from hf_transport import TransportError, get_transport
+
+# Same generation settings as the non-streaming backends in llm_backends.py. The model is
+# seq2seq, so its max_length is the number of generated tokens; TGI rejects temperature 0,
+# which means greedy decoding there as in the local pipeline.
+MODEL_PARAMETERS = {"max_new_tokens": LLM_MAX_LENGTH}
+if LLM_TEMPERATURE > 0:
+    MODEL_PARAMETERS.update(do_sample=True, temperature=LLM_TEMPERATURE)
+
+
+class HTTPStreamingBackend:
+    """Streams tokens from a text-generation-inference style endpoint.
+
+    The endpoint answers a POST of ``{"inputs", "parameters", "stream": true}``
+    with server-sent events, one ``data:{"token": {"text": ...}}`` line per
+    token. The hosted HF Inference API, a self-hosted TGI server and
+    stub_model_server.py all speak this protocol, so only the URL changes.
+    Connections, rate limit, retries and circuit breaker are shared with
+    every other caller of the endpoint through hf_transport.get_transport.
+    """
+
+    def __init__(self, url, authenticated=False, parameters=MODEL_PARAMETERS):
+        self.url = url
+        self.parameters = dict(parameters)
+        self.transport = get_transport(url, authenticated)
+
+    def stream(self, prompt):
+        payload = {"inputs": prompt, "parameters": self.parameters, "stream": True}
+        with self.transport.request(payload, stream=True) as response:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                event = json.loads(line[len("data:"):])
+                if "error" in event:
+                    raise TransportError(f"Error raised by streaming endpoint: {event['error']}")
+                token = event.get("token") or {}
+                if token.get("text") and not token.get("special"):
+                    yield token["text"]
+
+
+class LLMStreamingBackend:
+    # Fallback for models without a streaming endpoint: the whole answer arrives as one chunk.
+    def __init__(self, llm):
+        self.llm = llm
+
+    def stream(self, prompt):
+        yield self.llm(prompt)
+
+
+def stream_generate(backend, prompt, on_token=None):
+    started = time.perf_counter()
+    first_token_at = None
+    chunks = []
+    for chunk in backend.stream(prompt):
+        if first_token_at is None:
+            first_token_at = time.perf_counter()
+        chunks.append(chunk)
+        if on_token is not None:
+            on_token("".join(chunks))
+    finished = time.perf_counter()
+    timing = {
+        "time_to_first_token": (first_token_at or finished) - started,
+        "total_time": finished - started,
+        "chunks": len(chunks),
+    }
+    return "".join(chunks).strip(), timing
+
+
+def get_streaming_backend():
+    if STREAMING_BACKEND == "hf":
+        return HTTPStreamingBackend(STREAMING_URL or HF_API_URL, authenticated=True)
+    if STREAMING_BACKEND == "local":
+        return HTTPStreamingBackend(STREAMING_URL or "http://127.0.0.1:8080/generate_stream")
+    return None
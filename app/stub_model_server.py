@@ -0,0 +1,107 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def stub_completion(prompt):
+    # Deterministic stand-in for flan-t5: ask about the technology named in the prompt
+    match = re.search(r"related to (.+?)\.\s", prompt)
+    topic = match.group(1).strip() if match else "this topic"
+    return f"Can you walk me through a project where you used {topic} and the trade-offs you made?"
+
+
+class StubModelHandler(BaseHTTPRequestHandler):
+    token_delay = 0.02
+    # Fault injection for exercising hf_transport: a share of requests gets 429 (with
+    # Retry-After) or 503 (model loading, with estimated_time), or answers after slow_delay
+    rate_limit_rate = 0.0
+    unavailable_rate = 0.0
+    slow_rate = 0.0
+    slow_delay = 1.0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        request = json.loads(body or b"{}")
+        roll = random.random()
+        if roll < self.rate_limit_rate:
+            self._send_json({"error": "Rate limit reached"}, status=429, headers={"Retry-After": "0.1"})
+            return
+        if roll < self.rate_limit_rate + self.unavailable_rate:
+            self._send_json({"error": "Model is currently loading", "estimated_time": 0.2}, status=503)
+            return
+        if random.random() < self.slow_rate:
+            time.sleep(self.slow_delay)
+        inputs = request.get("inputs", "")
+        if isinstance(inputs, list):
+            self._send_json([{"generated_text": stub_completion(prompt)} for prompt in inputs])
+            return
+        text = stub_completion(inputs)
+        if not request.get("stream"):
+            self._send_json([{"generated_text": text}])
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            time.sleep(self.token_delay)
+            event = {
+                "token": {"id": i, "text": word if i == 0 else f" {word}", "special": False},
+                "generated_text": text if i == len(words) - 1 else None,
+            }
+            self.wfile.write(f"data:{json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+    def _send_json(self, payload, status=200, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops connections under concurrent load tests
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def start_stub_server(host="127.0.0.1", port=0, token_delay=0.02, **faults):
+    # port=0 picks a free port; returns the server and its base URL.
+    # faults: rate_limit_rate, unavailable_rate, slow_rate, slow_delay (see StubModelHandler)
+    handler = type("Handler", (StubModelHandler,), dict(faults, token_delay=token_delay))
+    server = StubServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for a streaming text-generation endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between streamed tokens")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--unavailable-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="share of requests delayed by --slow-delay")
+    parser.add_argument("--slow-delay", type=float, default=1.0)
+    args = parser.parse_args()
+    server, url = start_stub_server(
+        args.host, args.port, args.token_delay, rate_limit_rate=args.rate_limit_rate,
+        unavailable_rate=args.unavailable_rate, slow_rate=args.slow_rate, slow_delay=args.slow_delay,
+    )
+    print(f"Stub model server listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,256 @@
+import json
+import re
+import threading
+from functools import lru_cache
+
+from config import TECH_CATALOG_PATH, TECH_STACK_LIMIT, TECH_FUZZY_MAX_DISTANCE
+
+# Maps free-text technology names to canonical ids, so "Python", "python3" and
+# " py " are one stack everywhere (question bank, LLM cache keys, candidate
+# search, exports). Every alias goes into one trie. A lookup tries the exact
+# alias, then the alias without a trailing version ("python 3.11"), then a
+# bounded edit-distance walk over the trie ("pyhton") for names of 6 or more
+# characters. A changed letter costs two edits, since it more often makes a
+# different name (Jest and REST, NestJS and Next.js) than a typo does, and a
+# typo that is as close to two technologies as to one matches neither. Names
+# that match nothing are kept, just normalized. Each trie node also keeps its best
+# completions, so autocomplete is a walk down the typed prefix.
+
+DEFAULT_CATALOG = {
+    "python": {"name": "Python", "aliases": ["py", "python3", "python 3", "cpython"]},
+    "javascript": {"name": "JavaScript", "aliases": ["js", "ecmascript", "es6", "vanilla js"]},
+    "typescript": {"name": "TypeScript", "aliases": ["ts"]},
+    "java": {"name": "Java", "aliases": ["core java", "j2ee", "java ee"]},
+    "c": {"name": "C", "aliases": []},
+    "c++": {"name": "C++", "aliases": ["cpp", "c plus plus", "cplusplus"]},
+    "c#": {"name": "C#", "aliases": ["csharp", "c sharp"]},
+    "go": {"name": "Go", "aliases": ["golang"]},
+    "rust": {"name": "Rust", "aliases": []},
+    "ruby": {"name": "Ruby", "aliases": []},
+    "php": {"name": "PHP", "aliases": []},
+    "kotlin": {"name": "Kotlin", "aliases": []},
+    "swift": {"name": "Swift", "aliases": []},
+    "scala": {"name": "Scala", "aliases": []},
+    "r": {"name": "R", "aliases": ["r language", "rlang"]},
+    "sql": {"name": "SQL", "aliases": ["structured query language"]},
+    "html": {"name": "HTML", "aliases": ["html5"]},
+    "css": {"name": "CSS", "aliases": ["css3"]},
+    "sass": {"name": "Sass", "aliases": ["scss"]},
+    "tailwind": {"name": "Tailwind CSS", "aliases": ["tailwindcss", "tailwind css"]},
+    "react": {"name": "React", "aliases": ["reactjs", "react.js", "react js"]},
+    "react native": {"name": "React Native", "aliases": ["react-native"]},
+    "angular": {"name": "Angular", "aliases": ["angularjs", "angular.js"]},
+    "vue": {"name": "Vue.js", "aliases": ["vuejs", "vue.js", "vue js"]},
+    "next.js": {"name": "Next.js", "aliases": ["nextjs", "next js"]},
+    "node.js": {"name": "Node.js", "aliases": ["node", "nodejs", "node js"]},
+    "express": {"name": "Express", "aliases": ["expressjs", "express.js"]},
+    "django": {"name": "Django", "aliases": []},
+    "flask": {"name": "Flask", "aliases": []},
+    "fastapi": {"name": "FastAPI", "aliases": ["fast api"]},
+    "spring": {"name": "Spring", "aliases": ["spring boot", "springboot", "spring framework"]},
+    "rails": {"name": "Ruby on Rails", "aliases": ["ruby on rails", "ror"]},
+    "laravel": {"name": "Laravel", "aliases": []},
+    ".net": {"name": ".NET", "aliases": ["dotnet", "dot net", "asp.net", "asp.net core", ".net core"]},
+    "postgresql": {"name": "PostgreSQL", "aliases": ["postgres", "psql", "pgsql"]},
+    "mysql": {"name": "MySQL", "aliases": ["my sql", "mariadb"]},
+    "sqlite": {"name": "SQLite", "aliases": ["sqlite3"]},
+    "mongodb": {"name": "MongoDB", "aliases": ["mongo", "mongo db"]},
+    "redis": {"name": "Redis", "aliases": []},
+    "elasticsearch": {"name": "Elasticsearch", "aliases": ["elastic search", "elastic", "opensearch"]},
+    "kafka": {"name": "Kafka", "aliases": ["apache kafka"]},
+    "spark": {"name": "Spark", "aliases": ["apache spark", "pyspark"]},
+    "hadoop": {"name": "Hadoop", "aliases": []},
+    "graphql": {"name": "GraphQL", "aliases": ["graph ql"]},
+    "rest": {"name": "REST APIs", "aliases": ["rest api", "rest apis", "restful", "restful api"]},
+    "docker": {"name": "Docker", "aliases": ["docker compose", "docker-compose"]},
+    "kubernetes": {"name": "Kubernetes", "aliases": ["k8s", "kube"]},
+    "terraform": {"name": "Terraform", "aliases": []},
+    "ansible": {"name": "Ansible", "aliases": []},
+    "jenkins": {"name": "Jenkins", "aliases": []},
+    "ci/cd": {"name": "CI/CD", "aliases": ["cicd", "ci cd", "continuous integration"]},
+    "git": {"name": "Git", "aliases": ["github", "gitlab"]},
+    "linux": {"name": "Linux", "aliases": ["unix", "ubuntu"]},
+    "aws": {"name": "AWS", "aliases": ["amazon web services"]},
+    "gcp": {"name": "Google Cloud", "aliases": ["google cloud", "google cloud platform"]},
+    "azure": {"name": "Azure", "aliases": ["microsoft azure"]},
+    "pandas": {"name": "pandas", "aliases": []},
+    "numpy": {"name": "NumPy", "aliases": []},
+    "scikit-learn": {"name": "scikit-learn", "aliases": ["sklearn", "scikit learn", "scikit"]},
+    "tensorflow": {"name": "TensorFlow", "aliases": ["tf"]},
+    "keras": {"name": "Keras", "aliases": []},
+    "pytorch": {"name": "PyTorch", "aliases": ["torch"]},
+    "machine learning": {"name": "Machine Learning", "aliases": ["ml"]},
+    "deep learning": {"name": "Deep Learning", "aliases": ["dl"]},
+    "nlp": {"name": "NLP", "aliases": ["natural language processing"]},
+    "langchain": {"name": "LangChain", "aliases": ["lang chain"]},
+    "streamlit": {"name": "Streamlit", "aliases": []},
+    "power bi": {"name": "Power BI", "aliases": ["powerbi"]},
+    "tableau": {"name": "Tableau", "aliases": []},
+    "excel": {"name": "Excel", "aliases": ["ms excel", "microsoft excel"]},
+    "figma": {"name": "Figma", "aliases": []},
+    "flutter": {"name": "Flutter", "aliases": []},
+    "dart": {"name": "Dart", "aliases": []},
+    "android": {"name": "Android", "aliases": []},
+    "ios": {"name": "iOS", "aliases": []},
+    "selenium": {"name": "Selenium", "aliases": []},
+}
+
+_SEPARATORS = re.compile(r"[,;\n|]+")
+_VERSION_SUFFIX = re.compile(r"[\s\-_]*v?\d+(?:\.\d+)*(?:\.x)?$")
+
+
+def normalize_name(text):
+    # Lowercase, unify whitespace, and drop surrounding punctuation other than the + # . that names use
+    text = " ".join(str(text or "").lower().split())
+    return text.strip(" '\"`()[]{}:!?*-").rstrip(".")
+
+
+def _max_distance(length, limit):
+    # Short names are too easy to confuse ("rusty" vs "rust"), so fuzzy matching only kicks in from 6 characters
+    if length < 6:
+        return 0
+    if length < 10:
+        return min(1, limit)
+    return limit
+
+
+class _Node:
+    __slots__ = ("children", "tech", "completions")
+
+    def __init__(self):
+        self.children = {}
+        self.tech = None
+        self.completions = []
+
+
+class TechCatalog:
+    def __init__(self, catalog=DEFAULT_CATALOG, max_distance=TECH_FUZZY_MAX_DISTANCE, completions_per_node=8):
+        self.names = {}
+        self.root = _Node()
+        self.max_distance = max_distance
+        for tech, entry in catalog.items():
+            self.names[tech] = entry.get("name", tech)
+            for alias in [tech, entry.get("name", tech)] + list(entry.get("aliases", [])):
+                self._insert(normalize_name(alias), tech, completions_per_node)
+
+    def _insert(self, alias, tech, limit):
+        if not alias:
+            return
+        node = self.root
+        for ch in alias:
+            node = node.children.setdefault(ch, _Node())
+            if tech not in node.completions and len(node.completions) < limit:
+                node.completions.append(tech)
+        if node.tech is None:
+            node.tech = tech
+
+    def _exact(self, key):
+        node = self.root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node.tech
+
+    def _fuzzy(self, key, max_distance):
+        # Edit-distance walk over the trie (insert, delete and swap adjacent cost 1, substitute 2),
+        # one DP row per node. Only the diagonal band |i - depth| <= max_distance is computed, and a
+        # branch is dropped once its whole row exceeds the best distance found so far. Returns None
+        # when two technologies tie for the best distance.
+        n = len(key)
+        limit = max_distance + 1
+        best = [limit, None, False]
+
+        def walk(node, ch, depth, previous_row, before_previous_row, previous_ch):
+            row = [limit] * (n + 1)
+            row[0] = depth if depth < limit else limit
+            for i in range(max(1, depth - max_distance), min(n, depth + max_distance) + 1):
+                cost = 2 if key[i - 1] != ch else 0
+                value = min(row[i - 1] + 1, previous_row[i] + 1, previous_row[i - 1] + cost)
+                if i > 1 and before_previous_row is not None and key[i - 1] == previous_ch and key[i - 2] == ch:
+                    value = min(value, before_previous_row[i - 2] + 1)
+                row[i] = value if value < limit else limit
+            if node.tech is not None and row[n] < limit:
+                if row[n] < best[0]:
+                    best[0], best[1], best[2] = row[n], node.tech, False
+                elif row[n] == best[0] and node.tech != best[1]:
+                    best[2] = True
+            if min(row) <= best[0] and min(row) < limit:
+                for next_ch, child in node.children.items():
+                    walk(child, next_ch, depth + 1, row, previous_row, ch)
+
+        first_row = [i if i < limit else limit for i in range(n + 1)]
+        for ch, child in self.root.children.items():
+            walk(child, ch, 1, first_row, None, None)
+        return None if best[2] else best[1]
+
+    def lookup(self, text):
+        # Canonical id, or None when nothing in the catalog is close enough
+        key = normalize_name(text)
+        if not key:
+            return None
+        tech = self._exact(key)
+        if tech is None:
+            unversioned = _VERSION_SUFFIX.sub("", key)
+            if unversioned and unversioned != key:
+                tech = self._exact(unversioned)
+        if tech is None:
+            distance = _max_distance(len(key), self.max_distance)
+            if distance:
+                tech = self._fuzzy(key, distance)
+        return tech
+
+    def autocomplete(self, prefix, limit=5):
+        node = self.root
+        for ch in normalize_name(prefix):
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return [(tech, self.names[tech]) for tech in node.completions[:limit]]
+
+
+def load_catalog(path=TECH_CATALOG_PATH):
+    # A JSON file of {id: {"name": ..., "aliases": [...]}} extends (or overrides entries of) the defaults
+    catalog = dict(DEFAULT_CATALOG)
+    if path:
+        with open(path, "r", encoding="utf-8") as file:
+            catalog.update(json.load(file))
+    return catalog
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_tech_catalog():
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = TechCatalog(load_catalog())
+        return _catalog
+
+
+@lru_cache(maxsize=4096)
+def canonical_tech(text):
+    # Canonical id for known technologies, normalized text for everything else
+    return get_tech_catalog().lookup(text) or normalize_name(text)
+
+
+def tech_display_name(tech):
+    return get_tech_catalog().names.get(tech, tech)
+
+
+def split_tech_stack(text, limit=TECH_STACK_LIMIT):
+    # "Python, python3 ; React.js" -> ["python", "react"]: canonical, deduplicated, at most limit entries
+    techs = []
+    for item in _SEPARATORS.split(str(text or "")):
+        tech = canonical_tech(item)
+        if tech and tech not in techs:
+            techs.append(tech)
+            if len(techs) >= limit:
+                break
+    return techs
+
+
+def autocomplete(prefix, limit=5):
+    return get_tech_catalog().autocomplete(prefix, limit)
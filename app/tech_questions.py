@@ -0,0 +1,162 @@
+from config import DEDUP_ENABLED, DEDUP_MAX_RETRIES
+from hf_transport import TransportError
+from question_bank import get_question_bank
+from question_dedup import get_question_deduplicator
+from interview_context import count_tokens
+from metrics import annotate, span
+from streaming import get_streaming_backend, stream_generate
+from tech_catalog import tech_display_name
+
+# Served in order when the model is unreachable or keeps repeating itself; each asks about a
+# different part of the job, so a session can take several without them counting as duplicates
+FALLBACK_QUESTIONS = (
+    "Can you describe a recent project where you used {tech} and the hardest problem you solved with it?",
+    "How do you track down a bug in {tech} code that only shows up in production?",
+    "What would you check first to make a slow {tech} component faster, and how would you measure the gain?",
+    "How do you test code written with {tech}, and what do your tests deliberately leave out?",
+    "Which {tech} feature do people most often misuse, and what do you do instead?",
+    "How would you lay out a new {tech} codebase so that a growing team can keep changing it safely?",
+)
+FOLLOW_UP_QUESTION = "Could you go into more detail on that, with a concrete example of how you have used {tech}?"
+
+
+def _draw_from_bank(question_bank, tech_stack, asked, deduplicator):
+    # Skip bank questions that reword something already asked this session
+    exclude = list(asked)
+    while True:
+        question = question_bank.draw(tech_stack, exclude=exclude)
+        if question is None or deduplicator is None:
+            return question
+        if not deduplicator.is_duplicate(question, asked, use_global=False):
+            return question
+        exclude.append(question)
+
+
+def _fallback_key(tech_stack):
+    # Not a prompt: a stable per-technology cache entry, rewritten with every question generated
+    # for the technology, so an outage can still serve one whatever context the prompts carried
+    return f"latest generated question\x00{tech_stack}"
+
+
+def _generate(question_chain, tech_stack, previous_answer, context, on_token, timings):
+    from llm_cache import remember_text
+
+    question = _run_chain(question_chain, tech_stack, previous_answer, context, on_token, timings)
+    if question:
+        remember_text(question_chain.llm, _fallback_key(tech_stack), question)
+    return question
+
+
+def _run_chain(question_chain, tech_stack, previous_answer, context, on_token, timings):
+    # With a streaming backend configured, push partial text to on_token as it arrives
+    backend = get_streaming_backend() if on_token is not None else None
+    with span("llm_chain", chain="question") as attributes:
+        if backend is not None or attributes is not None:
+            prompt = question_chain.prompt.format(
+                tech_stack=tech_stack,
+                previous_answer=previous_answer,
+                context=context,
+            )
+        if attributes is not None:
+            attributes["prompt_tokens"] = count_tokens(prompt)
+
+        if backend is not None:
+            question, timing = stream_generate(backend, prompt, on_token=on_token)
+            if timings is not None:
+                timings.append(dict(timing, tech_stack=tech_stack))
+            if attributes is not None:
+                attributes["first_token_seconds"] = timing["time_to_first_token"]
+            return question
+
+        return question_chain.run(
+            tech_stack=tech_stack,
+            previous_answer=previous_answer,
+            context=context,
+        )
+
+
+def is_repeat(question, asked, deduplicator=None):
+    # Same check as _draw_from_bank: against this session's questions only, since bank and
+    # template questions are legitimately close to the global (bank) store
+    if not question or question in asked:
+        return True
+    return deduplicator is not None and deduplicator.is_duplicate(question, asked, use_global=False)
+
+
+def _fallback_question(question_chain, tech_stack, asked, deduplicator=None, previous_answer="", context=""):
+    # The model is unreachable, or only produced duplicates. Serve the cached answer to the exact
+    # prompt that failed, then the latest question generated for this technology (for any
+    # candidate), then a bank question, then a fixed template, skipping anything this session
+    # already asked. None if every one of them would be a repeat.
+    from llm_cache import cached_text
+
+    with span("question_fallback"):
+        prompt = question_chain.prompt.format(tech_stack=tech_stack, previous_answer=previous_answer, context=context)
+        for source, key in (("cache", prompt), ("latest", _fallback_key(tech_stack))):
+            question = cached_text(question_chain.llm, key)
+            if not is_repeat(question, asked, deduplicator):
+                annotate(source=source)
+                return question
+        question_bank = get_question_bank()
+        question = _draw_from_bank(question_bank, tech_stack, asked, deduplicator) if question_bank is not None else None
+        if question is not None:
+            annotate(source="bank")
+            return question
+        for template in FALLBACK_QUESTIONS:
+            question = template.format(tech=tech_display_name(tech_stack))
+            if not is_repeat(question, asked, deduplicator):
+                annotate(source="template")
+                return question
+        annotate(source="none")
+        return None
+
+
+def generate_tech_question(question_chain, tech_stack, previous_answer, context, asked=(), on_token=None, timings=None):
+    # None when there is nothing left to ask about tech_stack that this session has not had
+    deduplicator = get_question_deduplicator() if DEDUP_ENABLED else None
+
+    # Known technologies are served from the pregenerated bank; only unknown ones hit the LLM
+    question_bank = get_question_bank()
+    if question_bank is not None:
+        question = _draw_from_bank(question_bank, tech_stack, asked, deduplicator)
+        if question is not None:
+            return question
+
+    try:
+        question = _generate(question_chain, tech_stack, previous_answer, context, on_token, timings)
+    except TransportError:
+        return _fallback_question(question_chain, tech_stack, asked, deduplicator, previous_answer, context)
+
+    # A near-duplicate of an earlier or bank question is regenerated with the rejected
+    # question added to the context. A duplicate is never returned: once DEDUP_MAX_RETRIES
+    # regenerations are used up, the fallbacks supply a question the session has not had.
+    if deduplicator is None:
+        return question
+    for _ in range(DEDUP_MAX_RETRIES):
+        if not deduplicator.is_duplicate(question, asked):
+            return question
+        context = f"{context}\nQ: {question}".strip()
+        try:
+            question = _generate(question_chain, tech_stack, previous_answer, context, on_token, timings)
+        except TransportError:
+            return _fallback_question(question_chain, tech_stack, asked, deduplicator, previous_answer, context)
+    if deduplicator.is_duplicate(question, asked):
+        return _fallback_question(question_chain, tech_stack, asked, deduplicator, previous_answer, context)
+    return question
+
+
+def generate_follow_up(question_chain, tech_stack, question, answer, context, asked=(), on_token=None, timings=None):
+    # A follow-up depends on the answer it follows, so it is never drawn from the bank, never
+    # kept as the technology's fallback question, and is generated exactly once. The template
+    # stands in when the model is unreachable or repeats itself; None means the template would
+    # be a repeat too.
+    context = f"{context}\nThe candidate's answer to this question was brief or unsure; ask a follow-up that probes it. Q: {question} A: {answer}".strip()
+    try:
+        follow_up = _run_chain(question_chain, tech_stack, answer, context, on_token, timings)
+    except TransportError:
+        follow_up = None
+    deduplicator = get_question_deduplicator() if DEDUP_ENABLED else None
+    if not is_repeat(follow_up, asked, deduplicator):
+        return follow_up
+    follow_up = FOLLOW_UP_QUESTION.format(tech=tech_display_name(tech_stack))
+    return None if is_repeat(follow_up, asked, deduplicator) else follow_up
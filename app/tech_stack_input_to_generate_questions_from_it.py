@@ -1,10 +1,8 @@
-from langchain.prompts import PromptTemplate
-from langchain.memory import ConversationBufferMemory
-from langchain.chains import LLMChain
 import streamlit as st
-from langchain.llms import HuggingFaceHub
 import os
 from dotenv import load_dotenv
+from resources import get_chain
+from retrieval_context import make_interview_context
 
 load_dotenv()
 
@@ -13,26 +11,8 @@ hf_token = os.getenv("HUGGINGFACEHUB_API_TOKEN")
 # Initialize the Streamlit app
 st.title("Professional Interview Question Generator")
 
-# Set up LangChain components
-llm = HuggingFaceHub(
-    repo_id="google/flan-t5-large",
-    model_kwargs={"temperature": 0.2, "max_length": 512},
-    huggingfacehub_api_token=hf_token,
-)
-memory = ConversationBufferMemory(input_key="tech_stack", memory_key="context", return_messages=True)
-
-# Define PromptTemplate for generating questions
-question_prompt = PromptTemplate(
-    input_variables=["tech_stack", "previous_answer", "context"],
-    template=(
-        "You are a professional interview question generator. The user is proficient in "
-        "{tech_stack}. Based on the user's past responses: {previous_answer} and context: {context}, "
-        "generate a specific, relevant, and challenging interview question related to {tech_stack}."
-    )
-)
-
-# Set up LangChain's chain for handling the prompt
-question_chain = LLMChain(llm=llm, prompt=question_prompt, memory=memory)
+# Set up LangChain's chain for handling the prompt (built once per process)
+question_chain = get_chain("form_question_prompt")
 
 # Main application logic
 def main():
@@ -46,6 +26,8 @@ def main():
     # Maintain conversation history
     if "conversation_history" not in st.session_state:
         st.session_state.conversation_history = []
+    if "interview_context" not in st.session_state:
+        st.session_state.interview_context = make_interview_context()
 
     if len(tech_stacks) == 0:
         st.write("Please enter your tech stacks to proceed.")
@@ -63,9 +45,7 @@ def main():
             # st.write(f"st.session_state.conversation_history[-1]['answer']-->{st.session_state.conversation_history[-1]['answer']}")
             previous_answer = st.session_state.conversation_history[-1]["answer"]
 
-        context = "\n".join(
-            f"Q: {item['question']} A: {item['answer']}" for item in st.session_state.conversation_history
-        )
+        context = st.session_state.interview_context.render(st.session_state.conversation_history, query=current_tech_stack)
         # Check if the last question was answered and generate a new question
         if not st.session_state.conversation_history or st.session_state.conversation_history[-1]["answer"]:
             # st.write(f"context:{context}")
@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+import sys
+
+# Bytes Streamlit sends per rerun for the chat transcripts, per-bubble elements
+# (how main.py drew them before chat_render.py) against cached transcript pages.
+# Each rerun's elements are serialized as Streamlit ForwardMsgs when streamlit is
+# importable (approximated otherwise), and an element the browser received in one
+# of the last --max-age reruns and at least --min-cached-size bytes counts as a
+# hash reference, as Streamlit's forward message cache sends it.
+#
+#     python benchmarks/bench_chat_render.py --turns 10 25 50 --out benchmarks/results/chat_render.json
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from chat_render import CSS, ChatTranscript  # noqa: E402
+from htmlTemplates import css, bot_template, user_template  # noqa: E402
+
+try:
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+except ImportError:
+    ForwardMsg = None
+
+PROFILE_TURNS = 7
+QUESTION = "Can you walk me through a project where you used {tech} and the trade-offs you made along the way?"
+ANSWER = ("In my last role I used {tech} for a service that handled about two thousand requests a second. "
+          "We profiled the hot paths, moved the slow parts behind a cache and wrote integration tests for the "
+          "edge cases the first version missed. ")
+
+
+def element_bytes(index, body, reference=False):
+    if ForwardMsg is None:
+        return 60 if reference else len(body.encode("utf-8")) + 24
+    msg = ForwardMsg()
+    msg.metadata.delta_path[:] = [0, index]
+    if reference:
+        msg.ref_hash = "0" * 32
+    else:
+        msg.delta.new_element.markdown.body = body
+        msg.delta.new_element.markdown.allow_html = True
+    return msg.ByteSize()
+
+
+def legacy_elements(profile, tech):
+    elements = [css]
+    for i, qa in enumerate(profile):
+        elements.append(bot_template.replace("{{MSG}}", f"Question: {i + 1}: {qa['question']}"))
+        if qa["answer"]:
+            elements.append(user_template.replace("{{MSG}}", qa["answer"]))
+    for qa in tech:
+        elements.append(bot_template.replace("{{MSG}}", qa["question"]))
+        if qa["answer"]:
+            elements.append(user_template.replace("{{MSG}}", qa["answer"]))
+    return elements
+
+
+def reruns(tech_turns):
+    # One rerun with each new question unanswered, one after it is answered
+    profile, tech = [], []
+    for i in range(PROFILE_TURNS + tech_turns):
+        history = profile if i < PROFILE_TURNS else tech
+        tech_name = f"tech{i}"
+        history.append({"question": QUESTION.format(tech=tech_name), "answer": ""})
+        yield profile, tech
+        history[-1] = {"question": history[-1]["question"], "answer": ANSWER.format(tech=tech_name)}
+        yield profile, tech
+
+
+class Wire:
+    """Counts bytes for a sequence of reruns under the forward message cache rules."""
+
+    def __init__(self, min_cached_size, max_age):
+        self.min_cached_size = min_cached_size
+        self.max_age = max_age
+        self.last_sent = {}
+        self.run = 0
+
+    def send(self, elements):
+        self.run += 1
+        total = 0
+        for index, body in enumerate(elements):
+            full = element_bytes(index, body)
+            cached = full >= self.min_cached_size and self.run - self.last_sent.get(body, -self.max_age - 1) <= self.max_age
+            total += element_bytes(index, body, reference=True) if cached else full
+            self.last_sent[body] = self.run
+        return total
+
+
+def measure(tech_turns, min_cached_size, max_age, page_turns):
+    before, after = Wire(min_cached_size, max_age), Wire(min_cached_size, max_age)
+    profile_chat = ChatTranscript("Question: {number}: {question}", page_turns)
+    tech_chat = ChatTranscript(page_turns=page_turns)
+    before_bytes, after_bytes = [], []
+    for profile, tech in reruns(tech_turns):
+        before_bytes.append(before.send(legacy_elements(profile, tech)))
+        after_bytes.append(after.send([CSS] + profile_chat.blocks(profile) + tech_chat.blocks(tech)))
+    return {
+        "reruns": len(before_bytes),
+        "before": {"last_rerun_bytes": before_bytes[-1], "total_bytes": sum(before_bytes)},
+        "after": {"last_rerun_bytes": after_bytes[-1], "total_bytes": sum(after_bytes)},
+        "last_rerun_ratio": after_bytes[-1] / before_bytes[-1],
+        "total_ratio": sum(after_bytes) / sum(before_bytes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes per rerun for the chat transcripts, before and after chat_render")
+    parser.add_argument("--turns", nargs="+", type=int, default=[5, 10, 25, 50], help="technical question turns")
+    parser.add_argument("--min-cached-size", type=int, default=1024, help="global.minCachedMessageSize")
+    parser.add_argument("--max-age", type=int, default=2, help="global.maxCachedMessageAge")
+    parser.add_argument("--page-turns", type=int, default=4)
+    parser.add_argument("--out", help="write the JSON report here")
+    args = parser.parse_args()
+
+    report = {
+        "config": {**vars(args), "serializer": "streamlit" if ForwardMsg is not None else "approximate"},
+        "results": {str(turns): measure(turns, args.min_cached_size, args.max_age, args.page_turns) for turns in args.turns},
+    }
+    for turns, row in report["results"].items():
+        print(f"{turns:>4} turns  last rerun {row['before']['last_rerun_bytes']:>7} -> {row['after']['last_rerun_bytes']:>6} B"
+              f"  whole interview {row['before']['total_bytes']:>9} -> {row['after']['total_bytes']:>8} B")
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# Shows that end_intent.detect_end_intent costs the same per character on
+# short and very long answers, including inputs built to stress the matcher
+# (many overlapping partial phrases, many blocked matches). Exits non-zero if
+# ns/char at the longest length is more than --max-ratio times the shortest.
+#
+#     python benchmarks/bench_end_intent.py --out benchmarks/results/end_intent.json
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from end_intent import detect_end_intent  # noqa: E402
+
+INPUTS = {
+    "prose": "The service talks to Postgres through a connection pool and we cache the hot queries in Redis. ",
+    "blocked_matches": "the back end and the front end share end to end tests and stop words lists. ",
+    "partial_phrases": "i want to sto i want to en end th the interv i'd like to st ",
+    "no_word_breaks": "e",
+}
+
+
+def time_per_char(text, min_time):
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        detect_end_intent(text)
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return 1e9 * elapsed / calls / len(text)
+
+
+def run(lengths, min_time):
+    report = {}
+    for name, unit in INPUTS.items():
+        rows = {}
+        for length in lengths:
+            text = (unit * (length // len(unit) + 1))[:length]
+            rows[str(length)] = time_per_char(text, min_time)
+        report[name] = {"ns_per_char": rows, "ratio_longest_to_shortest": rows[str(lengths[-1])] / rows[str(lengths[0])]}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-character cost of the conversation-end detector.")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[100, 1000, 10000, 100000, 1000000])
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds to spend per measurement")
+    parser.add_argument("--max-ratio", type=float, default=3.0)
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = run(sorted(args.lengths), args.min_time)
+    output = json.dumps(report, indent=4)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    if any(row["ratio_longest_to_shortest"] > args.max_ratio for row in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# Exercises hf_transport.HFTransport against stub_model_server.py with injected
+# faults, one scenario per server configuration:
+#
+#   clean      no faults; pooled transport vs a fresh requests.post per call
+#   faults     10% 429 and 10% 503 responses; retries should hide them
+#   slow_tail  5% of responses delayed; hedged requests vs none
+#   outage     every response is 503; the circuit breaker should fail calls fast
+#
+#     python benchmarks/bench_hf_transport.py --requests 400 --out benchmarks/results/hf_transport.json
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from hf_transport import HFTransport, TransportError  # noqa: E402
+from stub_model_server import start_stub_server  # noqa: E402
+
+PROMPT = "generate a specific, relevant, and challenging interview question related to python. "
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else None
+
+
+def run(call, requests_count, concurrency):
+    latencies, errors = [], 0
+
+    def one(_):
+        started = time.perf_counter()
+        try:
+            call()
+            return time.perf_counter() - started, None
+        except (TransportError, requests.RequestException) as error:
+            return time.perf_counter() - started, error
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        for latency, error in pool.map(one, range(requests_count)):
+            latencies.append(latency)
+            errors += error is not None
+    wall = time.perf_counter() - started
+    return {
+        "requests": requests_count,
+        "errors": errors,
+        "success_rate": 1 - errors / requests_count,
+        "p50_ms": 1000 * percentile(latencies, 0.5),
+        "p99_ms": 1000 * percentile(latencies, 0.99),
+        "max_ms": 1000 * max(latencies),
+        "requests_per_second": requests_count / wall,
+    }
+
+
+def scenario(faults, variants, requests_count, concurrency):
+    server, url = start_stub_server(token_delay=0, **faults)
+    try:
+        results = {}
+        for name, make_call in variants.items():
+            call, transport = make_call(url)
+            results[name] = run(call, requests_count, concurrency)
+            if transport is not None:
+                results[name]["transport"] = transport.metrics()
+        return {"faults": faults, "results": results}
+    finally:
+        server.shutdown()
+
+
+def transport_variant(**kwargs):
+    def make(url):
+        options = dict(rate=0, hedge_after_ms=0, retry_base=0.05, retry_max=1.0, breaker_failures=0)
+        options.update(kwargs)
+        transport = HFTransport(url, token=None, **options)
+        return (lambda: transport(inputs=PROMPT)), transport
+    return make
+
+
+def fresh_connection_variant(url):
+    def call():
+        response = requests.post(url, json={"inputs": PROMPT}, timeout=30)
+        response.raise_for_status()
+        return response.json()
+    return call, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HF transport behaviour against the local stub model server")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--out", help="write the JSON report here")
+    args = parser.parse_args()
+    n, c = args.requests, args.concurrency
+
+    report = {
+        "clean": scenario({}, {
+            "fresh_connection": fresh_connection_variant,
+            "pooled": transport_variant(),
+        }, n, c),
+        "faults": scenario({"rate_limit_rate": 0.1, "unavailable_rate": 0.1}, {
+            "no_retry": transport_variant(max_retries=0),
+            "retry": transport_variant(max_retries=4),
+        }, n, c),
+        "slow_tail": scenario({"slow_rate": 0.05, "slow_delay": 0.5}, {
+            "no_hedge": transport_variant(),
+            "hedge_50ms": transport_variant(hedge_after_ms=50),
+        }, n, c),
+        "outage": scenario({"unavailable_rate": 1.0}, {
+            "no_breaker": transport_variant(max_retries=2),
+            "breaker": transport_variant(max_retries=2, breaker_failures=5, breaker_reset=30),
+        }, n // 4, c),
+    }
+    for name, result in report.items():
+        for variant, row in result["results"].items():
+            print(f"{name:>10} {variant:>17}  ok {row['success_rate']:6.1%}  p50 {row['p50_ms']:7.1f} ms"
+                  f"  p99 {row['p99_ms']:7.1f} ms  {row['requests_per_second']:7.1f} req/s")
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Prompt size and latency of the technical question prompt for three ways of
+# building its context, over interviews of growing length:
+#
+#   full       every earlier Q/A joined (how the context was built originally)
+#   window     interview_context.InterviewContext: recent turns verbatim, older ones summarized
+#   retrieval  retrieval_context.RetrievalContext: top-k relevant profile lines and answers
+#
+# Each interview asks one question per turn and renders the context before it,
+# as InterviewSession does. "relevant" is the share of context lines that mention
+# the technology being asked about. Generation runs on benchmarks/fakes.FakeLLM
+# with a per-prompt-word delay (--token-latency-ms), since encoder time grows
+# with input length.
+#
+#     python benchmarks/bench_retrieval_context.py --turns 10 30 100 --out benchmarks/results/retrieval.json
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fakes import FakeLLM  # noqa: E402
+from interview_context import InterviewContext, count_tokens  # noqa: E402
+from prompts import question_prompt  # noqa: E402
+from retrieval_context import RetrievalContext  # noqa: E402
+
+TECHS = ["python", "sql", "docker", "react", "kubernetes", "redis", "kafka", "aws"]
+PROFILE = {
+    "Full Name": "Ada Example",
+    "Email Address": "ada@example.com",
+    "Phone Number": "555 0100",
+    "Years of Experience": "6",
+    "Desired Position(s)": "Backend engineer",
+    "Current Location": "Pune",
+    "Tech Stack": ", ".join(TECHS),
+}
+ANSWER = ("I used {tech} at my last company for the billing service. We had to tune {tech} for throughput, "
+          "added monitoring around it and wrote runbooks for the on-call team when {tech} misbehaved.")
+
+
+def interview(turns):
+    return [
+        {"question": f"How did you operate {TECHS[i % len(TECHS)]} in production?",
+         "answer": ANSWER.format(tech=TECHS[i % len(TECHS)])}
+        for i in range(turns)
+    ]
+
+
+def full_context(history, query=None, profile=None):
+    return "\n".join(f"Q: {qa['question']}\nA: {qa['answer']}" for qa in history)
+
+
+def run(name, turns, llm, generate_every):
+    history = interview(turns)
+    context_builder = {"window": InterviewContext(), "retrieval": RetrievalContext()}.get(name)
+    render = context_builder.render if context_builder is not None else full_context
+    render_times, tokens, relevant, generation_times = [], [], [], []
+    for turn in range(turns):
+        tech = TECHS[turn % len(TECHS)]
+        started = time.perf_counter()
+        context = render(history[:turn], query=tech, profile=PROFILE)
+        render_times.append(time.perf_counter() - started)
+        prompt = question_prompt.format(tech_stack=tech, previous_answer=history[turn - 1]["answer"] if turn else "",
+                                        context=context)
+        tokens.append(count_tokens(prompt))
+        lines = [line for line in context.splitlines() if line.strip()]
+        if lines:
+            relevant.append(sum(tech in line.lower() for line in lines) / len(lines))
+        if turn % generate_every == 0:
+            started = time.perf_counter()
+            llm(prompt)
+            generation_times.append(time.perf_counter() - started)
+    return {
+        "render_mean_ms": 1000 * statistics.fmean(render_times),
+        "prompt_tokens_last": tokens[-1],
+        "prompt_tokens_max": max(tokens),
+        "relevant_lines": statistics.fmean(relevant) if relevant else 0.0,
+        "generation_mean_ms": 1000 * statistics.fmean(generation_times),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-history vs windowed vs retrieved prompt context")
+    parser.add_argument("--turns", nargs="+", type=int, default=[10, 30, 100])
+    parser.add_argument("--token-latency-ms", type=float, default=0.5, help="fake model delay per prompt word")
+    parser.add_argument("--generate-every", type=int, default=5, help="run the fake model on every Nth turn")
+    parser.add_argument("--out", help="write the JSON report here")
+    args = parser.parse_args()
+
+    llm = FakeLLM(token_latency=args.token_latency_ms / 1000.0)
+    report = {"config": vars(args), "results": {}}
+    for turns in args.turns:
+        rows = {name: run(name, turns, llm, args.generate_every) for name in ("full", "window", "retrieval")}
+        report["results"][str(turns)] = rows
+        for name, row in rows.items():
+            print(f"{turns:>4} turns {name:>9}  prompt {row['prompt_tokens_last']:>6} tokens  render {row['render_mean_ms']:6.3f} ms"
+                  f"  generate {row['generation_mean_ms']:8.1f} ms  relevant {row['relevant_lines']:5.1%}")
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
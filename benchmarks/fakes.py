@@ -0,0 +1,75 @@
+import hashlib
+import random
+import time
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+from langchain.llms.base import LLM
+
+# Deterministic stand-ins for the model and the embedder, so benchmark runs
+# measure the pipeline around them and are comparable between commits.
+
+_VOCABULARY = (
+    "how would you design test debug deploy scale cache index query thread process memory "
+    "latency service api schema migration container pipeline component state event queue"
+).split()
+
+
+def _seed(text):
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+
+
+def fake_completion(prompt, output_words=20):
+    rng = random.Random(_seed(prompt))
+    words = [rng.choice(_VOCABULARY) for _ in range(max(1, output_words))]
+    return " ".join(words).capitalize() + "?"
+
+
+class FakeLLM(LLM):
+    """Same prompt, same answer, after a fixed delay plus token_latency per prompt word."""
+
+    latency: float = 0.0
+    token_latency: float = 0.0
+    output_words: int = 20
+
+    @property
+    def _llm_type(self):
+        return "fake"
+
+    @property
+    def _identifying_params(self):
+        return {"latency": self.latency, "token_latency": self.token_latency, "output_words": self.output_words}
+
+    def _call(self, prompt, stop=None, run_manager=None):
+        delay = self.latency + self.token_latency * len(prompt.split())
+        if delay:
+            time.sleep(delay)
+        return fake_completion(prompt, self.output_words)
+
+
+class FakeEmbeddings(Embeddings):
+    """Unit vectors derived from the text hash; latency is charged per text."""
+
+    def __init__(self, dim=768, latency=0.0):
+        self.dim = dim
+        self.latency = latency
+
+    def _vector(self, text):
+        vector = np.random.default_rng(_seed(text)).standard_normal(self.dim).astype(np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts):
+        if self.latency:
+            time.sleep(self.latency * len(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def register_fake_backend(latency=0.0, output_words=20, name="fake"):
+    # Makes get_llm(name) / get_chain(prompt, name) build a FakeLLM
+    import llm_backends
+
+    llm_backends.BACKENDS[name] = lambda: FakeLLM(latency=latency, output_words=output_words)
+    return name
@@ -0,0 +1,292 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Per-stage and end-to-end benchmarks of the interview pipeline against a fake
+# model. Run from the repository root:
+#
+#     python benchmarks/run_benchmarks.py --out benchmarks/results/base.json
+#     python benchmarks/run_benchmarks.py --compare benchmarks/results/base.json new.json
+#
+# Every run points every state path the app writes (conversation store, candidate
+# index, sessions, scores, LLM cache) at a fresh temporary directory, turns the
+# metrics exporter off, and has the LLM cache and question bank switched off, so
+# reports from different commits line up and the real state files are never touched.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAGES = ["prompts", "context", "end_detection", "save", "embeddings", "throughput"]
+
+_ANSWER = (
+    "In my last project I used it to build an internal reporting service, mostly around "
+    "query tuning, caching and a few background jobs that fed the dashboards. "
+)
+
+
+def _isolate(workdir):
+    # Must run before anything from app/ is imported, since config.py reads the environment once
+    os.environ.update({
+        "LLM_BACKEND": "fake",
+        "LLM_CACHE_ENABLED": "false",
+        "PROFILE_REPHRASE": "false",
+        "STREAMING_BACKEND": "none",
+        "LLM_CACHE_PATH": os.path.join(workdir, "llm_cache.sqlite"),
+        "QUESTION_BANK_PATH": os.path.join(workdir, "no_question_bank.jsonl"),
+        "CONVERSATION_STORE_DIR": os.path.join(workdir, "segments"),
+        "CANDIDATE_INDEX_PATH": os.path.join(workdir, "candidate_index.json"),
+        "SESSION_STORE_BACKEND": "memory",
+        "SESSION_STORE_PATH": os.path.join(workdir, "sessions.sqlite"),
+        "SCORES_DIR": os.path.join(workdir, "scores"),
+        "REFERENCE_ANSWERS_PATH": os.path.join(workdir, "reference_answers.json"),
+        "METRICS_PORT": "0",
+        "METRICS_FILE": "",
+    })
+    sys.path.insert(0, os.path.join(ROOT, "app"))
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def _stats(samples):
+    samples = sorted(samples)
+    n = len(samples)
+    return {
+        "n": n,
+        "mean_ms": 1000 * statistics.fmean(samples),
+        "p50_ms": 1000 * samples[n // 2],
+        "p95_ms": 1000 * samples[min(n - 1, int(0.95 * n))],
+        "max_ms": 1000 * samples[-1],
+    }
+
+
+def measure(fn, repeat, warmup=3):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return _stats(samples)
+
+
+def _history(turns):
+    return [{"question": f"Question {i} about databases and caching?", "answer": _ANSWER * 2} for i in range(turns)]
+
+
+def bench_prompts(args):
+    from prompts import profile_prompt, question_prompt
+
+    context = "\n".join(f"Q: {qa['question']}\nA: {qa['answer']}" for qa in _history(3))
+    return {
+        "profile_prompt": measure(lambda: profile_prompt.format(previous_question="What is your full name?", index=2), args.repeat),
+        "question_prompt": measure(
+            lambda: question_prompt.format(tech_stack="python", previous_answer=_ANSWER, context=context), args.repeat
+        ),
+    }
+
+
+def bench_context(args):
+    # Each session renders the context for every question from one session-long context object:
+    # InterviewContext with CONTEXT_MODE=window, RetrievalContext (the default) with retrieval
+    from interview_context import InterviewContext
+    from retrieval_context import RetrievalContext
+
+    profile = {"Years of Experience": "5", "Desired Position(s)": "Backend Developer", "Tech Stack": "python, sql"}
+    results = {}
+    for turns in (3, 10, 30):
+        history = _history(turns)
+        results[f"render_{turns}_turns_cold"] = measure(lambda: InterviewContext().render(history), args.repeat)
+        context = InterviewContext()
+        results[f"render_{turns}_turns_warm"] = measure(lambda: context.render(history), args.repeat)
+        results[f"retrieval_render_{turns}_turns_cold"] = measure(
+            lambda: RetrievalContext().render(history, query="python", profile=profile), args.repeat
+        )
+        retrieval = RetrievalContext()
+        results[f"retrieval_render_{turns}_turns_warm"] = measure(
+            lambda: retrieval.render(history, query="python", profile=profile), args.repeat
+        )
+    return results
+
+
+def bench_end_detection(args):
+    from interview_flow import detect_conversation_end
+
+    results = {}
+    for words in (10, 100, 1000):
+        text = " ".join((_ANSWER * (words // 20 + 1)).split()[:words])
+        stats = measure(lambda: detect_conversation_end(text), args.repeat)
+        stats["ns_per_char"] = 1e6 * stats["mean_ms"] / len(text)
+        results[f"answer_{words}_words"] = stats
+    return results
+
+
+def bench_save(args):
+    from conversation_store import ConversationStore
+
+    record = {
+        "candidate_name": "Benchmark Candidate",
+        "candidate_profile": _history(7),
+        "technical_questions_conersation": _history(5),
+    }
+    store = ConversationStore(os.path.join(os.environ["CONVERSATION_STORE_DIR"], "save-bench"))
+    try:
+        results = {"append_wait": measure(lambda: store.append(record, wait=True), args.repeat)}
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            store.append(record)
+        store.flush()
+        elapsed = time.perf_counter() - started
+        results["append_async"] = {"n": args.repeat, "total_ms": 1000 * elapsed, "records_per_second": args.repeat / elapsed}
+        results["record_bytes"] = len(json.dumps(record, separators=(",", ":")).encode("utf-8"))
+    finally:
+        store.close()
+    return results
+
+
+def bench_embeddings(args):
+    # Profile lines embedded by the shared service, as RETRIEVAL_EMBEDDER=instructor does on each submit
+    from fakes import FakeEmbeddings
+    from embeddings import get_embedding_service
+
+    service = get_embedding_service()
+    service._model = FakeEmbeddings(latency=args.embedding_latency_ms / 1000.0)
+    counter = iter(range(10 ** 9))
+
+    def embed_profile():
+        i = next(counter)
+        service.embed_documents([
+            f"Years of Experience: {i % 15}",
+            "Desired Position(s): Backend Developer",
+            "Current Location: Berlin",
+            "Tech Stack: python, sql, docker",
+        ])
+
+    started = time.perf_counter()
+    embed_profile()
+    results = {"first_call_ms": 1000 * (time.perf_counter() - started)}
+    results["embed_profile"] = measure(embed_profile, args.repeat, warmup=0)
+    results["embedding_stats"] = dict(service.stats)
+    return results
+
+
+def bench_throughput(args):
+    from headless_runner import run_scripts, synthetic_scripts
+
+    results = {}
+    for concurrency in args.concurrency:
+        sessions = max(args.sessions, concurrency)
+        report = run_scripts(
+            synthetic_scripts(sessions, ["python", "sql", "javascript", "docker", "react", "css"]),
+            workers=concurrency,
+            backend="fake",
+            save=True,
+        )
+        report.pop("results")
+        results[str(concurrency)] = report
+    return results
+
+
+BENCHMARKS = {
+    "prompts": bench_prompts,
+    "context": bench_context,
+    "end_detection": bench_end_detection,
+    "save": bench_save,
+    "embeddings": bench_embeddings,
+    "throughput": bench_throughput,
+}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def run(args):
+    with tempfile.TemporaryDirectory(prefix="hiring-bench-") as workdir:
+        _isolate(workdir)
+        from fakes import register_fake_backend
+
+        register_fake_backend(latency=args.llm_latency_ms / 1000.0, output_words=args.output_words)
+        report = {
+            "meta": {
+                "commit": _git_commit(),
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+            "config": {
+                "llm_latency_ms": args.llm_latency_ms,
+                "output_words": args.output_words,
+                "embedding_latency_ms": args.embedding_latency_ms,
+                "repeat": args.repeat,
+                "sessions": args.sessions,
+                "concurrency": args.concurrency,
+            },
+            "stages": {},
+        }
+        for stage in args.stages:
+            print(f"running {stage}...", file=sys.stderr)
+            report["stages"][stage] = BENCHMARKS[stage](args)
+    return report
+
+
+def _flatten(node, prefix=""):
+    # {"save": {"append_wait": {"mean_ms": 1.2}}} -> {"save.append_wait.mean_ms": 1.2}
+    flat = {}
+    for key, value in node.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(base_path, new_path):
+    with open(base_path, "r", encoding="utf-8") as file:
+        base = _flatten(json.load(file)["stages"])
+    with open(new_path, "r", encoding="utf-8") as file:
+        new = _flatten(json.load(file)["stages"])
+    for name in sorted(set(base) & set(new)):
+        if not name.endswith(("mean_ms", "p95_ms", "sessions_per_second", "records_per_second", "question_latency_p95")):
+            continue
+        change = (new[name] - base[name]) / base[name] * 100 if base[name] else 0.0
+        print(f"{name:<60} {base[name]:>12.3f} {new[name]:>12.3f} {change:>+8.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the interview pipeline against a deterministic fake LLM.")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--llm-latency-ms", type=float, default=20.0, help="fake LLM delay per call")
+    parser.add_argument("--output-words", type=int, default=20, help="fake LLM answer length")
+    parser.add_argument("--embedding-latency-ms", type=float, default=1.0, help="fake embedder delay per text")
+    parser.add_argument("--repeat", type=int, default=200, help="samples per micro-benchmark")
+    parser.add_argument("--sessions", type=int, default=100, help="interviews per throughput level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="print the change between two reports")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    output = json.dumps(run(args), indent=4)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
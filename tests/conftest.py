@@ -0,0 +1,25 @@
+import os
+import sys
+import tempfile
+
+# The app modules import each other as top-level scripts (see app/main.py), and
+# config.py reads the environment once, on first import. Point every state
+# path at a scratch directory and use the stub model before anything imports it.
+_STATE_DIR = tempfile.mkdtemp(prefix="hiring-tests-")
+
+os.environ.update({
+    "LLM_BACKEND": "stub",
+    "STREAMING_BACKEND": "none",
+    "PROFILE_REPHRASE": "false",
+    "PREFETCH_ENABLED": "false",
+    "METRICS_ENABLED": "false",
+    "LLM_CACHE_PATH": os.path.join(_STATE_DIR, "llm_cache.sqlite"),
+    "QUESTION_BANK_PATH": os.path.join(_STATE_DIR, "no_question_bank.jsonl"),
+    "CONVERSATION_STORE_DIR": os.path.join(_STATE_DIR, "segments"),
+    "CANDIDATE_INDEX_PATH": os.path.join(_STATE_DIR, "candidate_index.json"),
+    "SESSION_STORE_PATH": os.path.join(_STATE_DIR, "sessions.sqlite"),
+    "SCORES_DIR": os.path.join(_STATE_DIR, "scores"),
+    "REFERENCE_ANSWERS_PATH": os.path.join(_STATE_DIR, "reference_answers.json"),
+})
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
@@ -0,0 +1,59 @@
+import pytest
+
+from conversation_store import ConversationStore, iter_records
+
+
+class _FailingFile:
+    """Wraps the segment file and fails the next ``failures`` writes."""
+
+    def __init__(self, file, failures=1):
+        self._file = file
+        self.failures = failures
+
+    def write(self, data):
+        if self.failures:
+            self.failures -= 1
+            self._file.write(data[: len(data) // 2])
+            raise OSError(28, "No space left on device")
+        return self._file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+def test_failed_write_is_raised_and_the_writer_keeps_going(tmp_path):
+    store = ConversationStore(str(tmp_path), group_commit_ms=0, fsync=False)
+    try:
+        store.append({"candidate_name": "first"}, wait=True)
+        store._file = _FailingFile(store._file)
+
+        with pytest.raises(OSError):
+            store.append({"candidate_name": "lost"}, wait=True)
+        assert store.stats["failed_commits"] == 1
+
+        # The writer thread survived: later appends and flushes complete
+        store.append({"candidate_name": "second"}, wait=True)
+        store.append({"candidate_name": "third"})
+        store.flush()
+    finally:
+        store.close()
+
+    # The half-written record was rolled back, so the segment still reads cleanly past it
+    assert [record["candidate_name"] for record in iter_records(str(tmp_path))] == ["first", "second", "third"]
+
+
+def test_failing_commit_listener_is_recorded(tmp_path):
+    store = ConversationStore(str(tmp_path), group_commit_ms=0, fsync=False)
+
+    def listener(records, position):
+        raise KeyError("index out of sync")
+
+    store.add_commit_listener(listener)
+    try:
+        store.append({"candidate_name": "first"}, wait=True)
+    finally:
+        store.close()
+
+    assert store.stats["failed_listeners"] == 1
+    assert isinstance(store.last_error, KeyError)
+    assert [record["candidate_name"] for record in iter_records(str(tmp_path))] == ["first"]
@@ -0,0 +1,50 @@
+import pytest
+
+from end_intent import detect_end_intent
+
+
+@pytest.mark.parametrize("message", [
+    "I am done",
+    "I'm done, thanks!",
+    "Ok. I am done now, thank you",
+    "That is all from me, bye.",
+    "I want to end.",
+    "Please end the interview",
+])
+def test_end_intent(message):
+    assert detect_end_intent(message)
+
+
+@pytest.mark.parametrize("message", [
+    "I am done with the migration and then wrote tests for it",
+    "I want to end the retry loop early when the budget runs out",
+    "We wrote an end-to-end test and then I am done",
+    "I am not done yet",
+    "The backend exposes one endpoint per resource",
+])
+def test_answers_that_are_not_end_intent(message):
+    assert not detect_end_intent(message)
+
+
+@pytest.mark.parametrize("message", [
+    "Thanks, bye!",
+    "That was fun. See you later",
+    "No more questions",
+    "Thanks, no more questions.",
+    "Not sure, stop",
+    "exit",
+])
+def test_farewells_and_commands_that_end_the_message(message):
+    assert detect_end_intent(message)
+
+
+@pytest.mark.parametrize("message", [
+    "I said goodbye to monoliths when we split the billing service",
+    "See you later is a pattern in Rx",
+    "The crawler stops when the queue has no more questions to fetch from the API",
+    "exit(1)",
+    "sys.exit",
+    "Not going to stop",
+])
+def test_farewells_and_commands_inside_an_answer(message):
+    assert not detect_end_intent(message)
@@ -0,0 +1,11 @@
+import hf_transport
+from resources import startup_report
+
+
+def test_the_api_token_stays_out_of_the_startup_report(monkeypatch):
+    monkeypatch.setattr(hf_transport, "hf_token", "hf_SECRET123")
+
+    transport = hf_transport.get_transport("http://127.0.0.1:9/token-test")
+
+    assert transport.session.headers["Authorization"] == "Bearer hf_SECRET123"
+    assert not any("hf_SECRET123" in key for key in startup_report()["resources"])
@@ -0,0 +1,41 @@
+import re
+
+from langchain.chains import LLMChain
+from langchain.llms.base import LLM
+
+from llm_cache import install_llm_cache
+from prompts import question_prompt
+from question_bank import build_bank
+
+QUESTIONS = [
+    "How does the GIL affect CPU-bound threads in Python?",
+    "When would you pick a generator over building a list?",
+    "Explain how decorators wrap a function and keep its metadata.",
+    "What problem do context managers solve, and how do you write one?",
+    "How does asyncio schedule coroutines on its event loop?",
+    "Compare dataclasses with namedtuples for plain records.",
+    "How do you profile memory growth in a long-running service?",
+    "What does the descriptor protocol let a class attribute do?",
+]
+
+
+class RepeatingLLM(LLM):
+    """Greedy and stubborn: repeats its first question until the prompt reports an attempt number."""
+
+    @property
+    def _llm_type(self):
+        return "repeating"
+
+    def _call(self, prompt, stop=None, run_manager=None):
+        attempt = re.search(r"Attempt (\d+)", prompt)
+        return QUESTIONS[int(attempt.group(1)) % len(QUESTIONS)] if attempt else QUESTIONS[0]
+
+
+def test_a_repeat_from_the_model_does_not_stall_the_bank():
+    install_llm_cache()
+    chain = LLMChain(llm=RepeatingLLM(), prompt=question_prompt)
+
+    bank = build_bank(chain, ["python"], per_tech=5)
+
+    assert len(bank["python"]) == 5
+    assert len(set(bank["python"])) == 5
@@ -0,0 +1,48 @@
+from question_dedup import HashingEmbedder, QuestionDeduplicator, SessionQuestions
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__(cache_size=0)
+        self.embedded = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+def test_session_checks_only_embed_the_new_question():
+    embedder = CountingEmbedder()
+    deduplicator = QuestionDeduplicator(embedder)
+    asked = SessionQuestions()
+    for question in [
+        "How does Python manage memory for small objects?",
+        "When would you use a Django signal instead of overriding save?",
+        "How do you keep a Kafka consumer group from rebalancing too often?",
+    ]:
+        embedder.embedded = 0
+        assert not deduplicator.is_duplicate(question, asked)
+        # The new question, plus the session question appended after the previous check
+        assert embedder.embedded == (2 if len(asked) else 1)
+        asked.append(question)
+
+    embedder.embedded = 0
+    assert deduplicator.is_duplicate("How does python manage the memory of small objects?", asked)
+    assert embedder.embedded == 2
+
+    embedder.embedded = 0
+    assert deduplicator.is_duplicate("How can you keep a Kafka consumer group from rebalancing so often?", asked)
+    assert embedder.embedded == 1
+
+
+def test_a_snapshot_keeps_the_vectors_and_ignores_later_questions():
+    deduplicator = QuestionDeduplicator(CountingEmbedder())
+    asked = SessionQuestions(["How does Python manage memory for small objects?"])
+    assert not deduplicator.is_duplicate("What is a Rust lifetime?", asked)
+
+    snapshot = SessionQuestions(asked)
+    asked.append("What is a Rust lifetime?")
+
+    deduplicator.embedder.embedded = 0
+    assert not deduplicator.is_duplicate("What is a Rust lifetime?", snapshot)
+    assert deduplicator.embedder.embedded == 1
@@ -0,0 +1,49 @@
+from langchain.chains import LLMChain
+from langchain.llms.base import LLM
+
+from hf_transport import TransportError
+from llm_cache import install_llm_cache
+from prompts import question_prompt
+from retrieval_context import RetrievalContext
+from tech_questions import FALLBACK_QUESTIONS, generate_tech_question
+
+
+class FlakyLLM(LLM):
+    """Answers until ``down`` is set, then fails like an unreachable Inference API."""
+
+    down: bool = False
+
+    @property
+    def _llm_type(self):
+        return "flaky"
+
+    def _call(self, prompt, stop=None, run_manager=None):
+        if self.down:
+            raise TransportError("HTTP 503 from test endpoint")
+        return f"How would you shard a {len(prompt)}-character workload across Kafka partitions?"
+
+
+def _context(name, answer):
+    context = RetrievalContext()
+    profile = {"Full Name": name, "Desired Position(s)": "Data Engineer", "Tech Stack": "kafka, sql"}
+    history = [{"question": "How do you model slowly changing dimensions in SQL?", "answer": answer}]
+    return context.render(history, query="kafka", profile=profile)
+
+
+def test_outage_serves_the_question_cached_under_retrieval_context():
+    install_llm_cache()
+    chain = LLMChain(llm=FlakyLLM(), prompt=question_prompt)
+
+    first_context = _context("Ada", "Type 2 tables with valid_from and valid_to columns.")
+    assert first_context
+    generated = generate_tech_question(chain, "kafka", "", first_context)
+
+    # Another candidate, another context: the exact prompt was never cached
+    chain.llm.down = True
+    second_context = _context("Grace", "Snapshots per day, compacted weekly.")
+    assert second_context != first_context
+    assert generate_tech_question(chain, "kafka", "", second_context) == generated
+
+    # A session that already had it gets a template instead of a repeat
+    fallback = generate_tech_question(chain, "kafka", "", second_context, asked=[generated])
+    assert fallback == FALLBACK_QUESTIONS[0].format(tech="Kafka")
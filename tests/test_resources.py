@@ -0,0 +1,41 @@
+import threading
+
+from resources import cached_resource, startup_report
+
+_release = threading.Event()
+_building = threading.Event()
+_builds = []
+
+
+@cached_resource
+def _slow_resource():
+    _building.set()
+    _release.wait(10)
+    _builds.append("slow")
+    return "slow"
+
+
+@cached_resource
+def _fast_resource():
+    return "fast"
+
+
+def test_a_slow_build_does_not_block_other_resources():
+    threads = [threading.Thread(target=_slow_resource) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    assert _building.wait(5)
+
+    # Both would wait behind the slow build if it held the process-wide lock
+    results = []
+    reader = threading.Thread(target=lambda: results.extend([_fast_resource(), startup_report()]))
+    reader.start()
+    reader.join(1)
+    assert results and results[0] == "fast"
+    assert "_fast_resource" in results[1]["resources"]
+
+    _release.set()
+    for thread in threads:
+        thread.join(5)
+    assert _builds == ["slow"]
+    assert _slow_resource() == "slow"
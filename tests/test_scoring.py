@@ -0,0 +1,25 @@
+from question_bank import question_key
+from scoring import SimilarityScorer
+
+QUESTION = "How would you make a slow PostgreSQL query faster?"
+REFERENCE = (
+    "Run EXPLAIN ANALYZE to find sequential scans and bad row estimates, add or fix indexes on the filtered "
+    "and joined columns, refresh statistics with ANALYZE, and rewrite the query to avoid functions on indexed columns."
+)
+GOOD_ANSWER = (
+    "I would look at EXPLAIN ANALYZE for sequential scans, add an index on the joined and filtered columns, "
+    "run ANALYZE so the planner has fresh statistics and avoid wrapping indexed columns in functions."
+)
+
+
+def test_repeating_the_question_does_not_score_well():
+    scorer = SimilarityScorer({question_key(QUESTION): REFERENCE})
+    (repeat, kind), (good, _) = scorer.score_pairs([(QUESTION, QUESTION), (QUESTION, GOOD_ANSWER)])
+    assert kind == "bank"
+    assert repeat < 0.5
+    assert repeat < good
+
+
+def test_answers_without_a_reference_are_unscored():
+    scorer = SimilarityScorer({})
+    assert scorer.score_pairs([(QUESTION, QUESTION)]) == [(None, "none")]
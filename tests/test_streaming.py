@@ -0,0 +1,32 @@
+from contextlib import contextmanager
+
+from langchain.chains import LLMChain
+
+import tech_questions
+from llm_backends import get_llm
+from prompts import question_prompt
+from streaming import HTTPStreamingBackend
+from tech_questions import FALLBACK_QUESTIONS, generate_tech_question
+
+
+class _Response:
+    def iter_lines(self, decode_unicode=False):
+        yield 'data:{"token": {"text": "How"}}'
+        yield 'data:{"error": "Model is overloaded"}'
+
+
+class _Transport:
+    @contextmanager
+    def request(self, payload, stream=False):
+        yield _Response()
+
+
+def test_a_streamed_error_event_falls_back_instead_of_failing(monkeypatch):
+    backend = HTTPStreamingBackend("http://127.0.0.1:9/generate_stream")
+    backend.transport = _Transport()
+    monkeypatch.setattr(tech_questions, "get_streaming_backend", lambda: backend)
+    chain = LLMChain(llm=get_llm(), prompt=question_prompt)
+
+    question = generate_tech_question(chain, "elixir", "", "", on_token=lambda text: None)
+
+    assert question == FALLBACK_QUESTIONS[0].format(tech="elixir")
@@ -0,0 +1,28 @@
+from tech_catalog import DEFAULT_CATALOG, TechCatalog, split_tech_stack
+
+
+def test_typos_of_catalog_names_still_match():
+    catalog = TechCatalog(DEFAULT_CATALOG)
+    assert catalog.lookup("pyhton") == "python"
+    assert catalog.lookup("javscript") == "javascript"
+    assert catalog.lookup("kubernets") == "kubernetes"
+    assert catalog.lookup("Python 3.11") == "python"
+
+
+def test_other_technologies_are_not_snapped_to_catalog_entries():
+    catalog = TechCatalog(DEFAULT_CATALOG)
+    for name in ["Jest", "Nest", "NestJS", "Rusty"]:
+        assert catalog.lookup(name) is None
+
+
+def test_a_typo_as_close_to_two_entries_matches_neither():
+    catalog = TechCatalog({
+        "postgres": {"name": "Postgres", "aliases": []},
+        "postgrex": {"name": "Postgrex", "aliases": []},
+    })
+    assert catalog.lookup("postgre") is None
+    assert catalog.lookup("postgress") == "postgres"
+
+
+def test_unknown_names_are_kept_in_the_stack():
+    assert split_tech_stack("Jest, NestJS, Rust") == ["jest", "nestjs", "rust"]
@@ -0,0 +1,16 @@
+from question_dedup import get_question_deduplicator
+from resources import get_chain
+from tech_questions import generate_tech_question, is_repeat
+
+
+def test_exhausted_dedup_retries_never_return_a_duplicate():
+    # The stub model asks the same question for a technology every time, so every
+    # regeneration is a duplicate and the fallbacks have to supply the rest
+    chain = get_chain("question_prompt")
+    deduplicator = get_question_deduplicator()
+    asked = []
+    for _ in range(4):
+        question = generate_tech_question(chain, "docker", "", "", asked=list(asked))
+        assert question is not None
+        assert not is_repeat(question, asked, deduplicator)
+        asked.append(question)